@@ -0,0 +1,97 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+from scipy import ndimage
+from tab_spectro.audio.onsets import spectral_flux
+
+# Tempo and beats from the displayed spectrogram (Ellis-style): onset strength = spectral flux
+# minus its local mean, tempo = autocorrelation peak (one FFT) weighted towards ~120 bpm,
+# beats = dynamic programming that trades onset strength against regular spacing.
+
+BEAT_LEAD = 0.2
+DOWNBEAT_FMAX = 250.0
+
+@dataclass
+class BeatGrid:
+    bpm: float = 0.0
+    beats: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    beats_per_bar: int = 4
+    downbeat: int = 0  # index of the first bar line in beats
+
+    @property
+    def bars(self) -> np.ndarray:
+        return self.beats[self.downbeat::self.beats_per_bar]
+
+def onset_envelope(f: np.ndarray, S_db: np.ndarray, dt: float, fmax: float = 5000.0) -> np.ndarray:
+    env = spectral_flux(f, S_db, fmax)
+    w = max(3, int(round(1.0 / dt)))
+    env = np.maximum(env - ndimage.uniform_filter1d(env, size=w, mode="nearest"), 0.0)
+    sd = float(env.std())
+    return env / sd if sd > 0 else env
+
+def estimate_tempo(env: np.ndarray, dt: float, bpm_min: float = 50.0, bpm_max: float = 220.0,
+                   prior_bpm: float = 120.0, prior_octaves: float = 1.0) -> float:
+    # autocorrelation through the FFT (zero padded: no wrap-around)
+    n = len(env)
+    x = env - env.mean()
+    X = np.fft.rfft(x, 2 * n)
+    ac = np.fft.irfft(X * np.conj(X))[:n]
+    lag0 = max(1, int(np.floor(60.0 / (bpm_max * dt))))
+    lag1 = min(n - 2, int(np.ceil(60.0 / (bpm_min * dt))))
+    if lag1 <= lag0:
+        return 0.0
+    lags = np.arange(lag0, lag1 + 1)
+    prior = np.exp(-0.5 * (np.log2(lags * dt * prior_bpm / 60.0) / prior_octaves) ** 2)
+    score = ac[lags] * prior
+    k = int(np.argmax(score))
+    lag = float(lags[k])
+    if 0 < k < len(score) - 1:
+        a, b, c = score[k - 1], score[k], score[k + 1]
+        den = a - 2.0 * b + c
+        if den < 0:
+            lag += 0.5 * (a - c) / den
+    return 60.0 / (lag * dt)
+
+def dp_beats(env: np.ndarray, period: float, tightness: float = 100.0) -> np.ndarray:
+    # best previous beat between period/2 and 2 periods back; returns frame indices
+    n = len(env)
+    d = np.arange(max(1, int(round(period / 2))), int(round(2 * period)) + 1)
+    penalty = -tightness * np.log(d / period) ** 2
+    score = env.astype(np.float64)
+    back = np.full(n, -1)
+    for i in range(int(d[0]), n):
+        k = d[d <= i]
+        cand = score[i - k] + penalty[:len(k)]
+        j = int(np.argmax(cand))
+        if cand[j] > 0:
+            score[i] += cand[j]
+            back[i] = i - k[j]
+
+    # last beat: best score within the final period
+    tail = max(0, n - int(round(period)))
+    i = tail + int(np.argmax(score[tail:]))
+    out = []
+    while i >= 0:
+        out.append(i)
+        i = int(back[i])
+    return np.array(out[::-1], dtype=int)
+
+def track_beats(f: np.ndarray, t: np.ndarray, S_db: np.ndarray, beats_per_bar: int = 4) -> BeatGrid:
+    if S_db is None or len(t) < 8:
+        return BeatGrid(beats_per_bar=beats_per_bar)
+    dt = float(t[1] - t[0])
+    env = onset_envelope(f, S_db, dt)
+    bpm = estimate_tempo(env, dt)
+    if bpm <= 0:
+        return BeatGrid(beats_per_bar=beats_per_bar)
+    idx = dp_beats(env, 60.0 / (bpm * dt))
+    # env[k] is the change into column k + 1; dB flux peaks while an attack is still entering
+    # the window, about a fifth of a window before it reaches the centre
+    win_s = (len(f) - 1) / float(f[-1])  # nperseg / sr
+    beats = t[1:][idx].astype(np.float64) + BEAT_LEAD * win_s
+
+    # bar lines on the beat phase with the strongest low-frequency onsets (bass/kick on the one)
+    low = spectral_flux(f, S_db, DOWNBEAT_FMAX)
+    strength = [low[idx[p::beats_per_bar]].mean() if len(idx[p::beats_per_bar]) else 0.0
+                for p in range(beats_per_bar)]
+    return BeatGrid(float(bpm), beats, int(beats_per_bar), int(np.argmax(strength)))
@@ -0,0 +1,70 @@
+import numpy as np
+from scipy import sparse
+from scipy.optimize import nnls
+from tab_spectro.guitar.theory import midi_to_freq
+
+# Which notes sound in a mic frame: the spectrum is projected onto one harmonic template per
+# fretboard note (one sparse mat-vec), and only the best candidates go through a small
+# non-negative least squares fit, which explains shared harmonics (octaves, fifths) once.
+
+def harmonic_templates(midis, freqs: np.ndarray, n_harmonics: int = 10, rolloff: float = 1.0,
+                       width: float = 1.0, skip_every: int = 0) -> sparse.csr_matrix:
+    # one unit-norm row per midi (may be fractional), nonzero only around its harmonics;
+    # skip_every=d leaves out the harmonics that are multiples of d
+    freqs = np.asarray(freqs, dtype=np.float64)
+    df = float(freqs[1] - freqs[0])
+    n_bins = len(freqs)
+    rows, cols, vals = [], [], []
+    for r, m in enumerate(midis):
+        f0 = midi_to_freq(m)
+        h = np.arange(1, n_harmonics + 1, dtype=np.float64)
+        if skip_every:
+            h = h[h % skip_every != 0]
+        b = (h * f0 - freqs[0]) / df  # fractional bin of each harmonic
+        keep = b < n_bins - 2
+        h, b = h[keep], b[keep]
+        k = np.floor(b)[:, None] + np.arange(-1, 3)[None, :]  # 4 bins around each harmonic
+        w = np.exp(-((k - b[:, None]) / width) ** 2) * (h ** -rolloff)[:, None]
+        ok = (k >= 0) & (k < n_bins)
+        rows.append(np.full(int(ok.sum()), r))
+        cols.append(k[ok].astype(np.int64))
+        vals.append(w[ok])
+    T = sparse.csr_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                          shape=(len(midis), n_bins))
+    T.sum_duplicates()
+    norms = np.sqrt(np.asarray(T.multiply(T).sum(axis=1)).ravel())
+    return sparse.diags(1.0 / np.maximum(norms, 1e-12)) @ T
+
+class ChordDetector:
+    def __init__(self, midis, freqs: np.ndarray, max_notes: int = 6, candidates: int = 24,
+                 min_score: float = 0.12, rel_activation: float = 0.4):
+        self.midis = np.array(sorted(set(int(m) for m in midis)), dtype=np.int64)
+        self.freqs = np.asarray(freqs, dtype=np.float64)
+        self.max_notes = int(max_notes)
+        self.candidates = int(candidates)
+        self.min_score = float(min_score)
+        self.rel_activation = float(rel_activation)
+
+        self.T = harmonic_templates(self.midis, self.freqs)
+        self._A = self.T.T.toarray()  # bins x notes, columns sliced for the NNLS fit
+
+    def detect(self, mag: np.ndarray):
+        # mag: linear magnitudes on self.freqs
+        y = np.sqrt(np.asarray(mag, dtype=np.float64))
+        y = np.maximum(y - np.median(y), 0.0)
+        norm = float(np.linalg.norm(y))
+        if norm <= 1e-12:
+            return []
+        y /= norm
+
+        s = self.T @ y
+        if float(np.max(s)) < self.min_score:
+            return []
+        cand = np.argsort(-s)[:self.candidates]
+        act, _ = nnls(self._A[:, cand], y)
+        top = float(np.max(act))
+        if top <= 0.0:
+            return []
+        order = np.argsort(-act)[:self.max_notes]
+        order = order[act[order] >= self.rel_activation * top]
+        return sorted(int(m) for m in self.midis[cand[order]])
@@ -0,0 +1,48 @@
+from functools import lru_cache
+
+import numpy as np
+from scipy import sparse
+
+# Pitch-class energy per spectrogram column: one sparse (12 x bins) product. Each bin between
+# fmin and fmax goes to its two nearest pitch classes, linearly by distance in semitones.
+# Only the bins that are spectral peaks are summed, so a partial counts once instead of with
+# its whole window main lobe (which spans several semitones at low notes / short windows).
+
+@lru_cache(maxsize=8)
+def _chroma_matrix(n_bins: int, df: float, fmin: float, fmax: float, a4: float):
+    f = np.arange(n_bins) * df
+    k = np.flatnonzero((f >= fmin) & (f <= fmax))
+    m = 69.0 + 12.0 * np.log2(f[k] / a4)
+    lo = np.floor(m)
+    frac = m - lo
+    # ~1/f above the point where a semitone spans a bin: upper partials count less than fundamentals
+    w = 1.0 / np.maximum(1.0, f[k] * (2.0 ** (1.0 / 12.0) - 1.0) / df)
+    rows = np.concatenate((lo.astype(int) % 12, (lo.astype(int) + 1) % 12))
+    cols = np.concatenate((k, k))
+    vals = np.concatenate((w * (1.0 - frac), w * frac))
+    return sparse.csr_matrix((vals.astype(np.float32), (rows, cols)), shape=(12, n_bins))
+
+def chroma_matrix(f: np.ndarray, fmin: float = 55.0, fmax: float = 5000.0, a4: float = 440.0):
+    # cached per f vector (length and bin spacing)
+    return _chroma_matrix(len(f), float(f[1] - f[0]), float(fmin), float(fmax), float(a4))
+
+def chromagram(f: np.ndarray, S_db: np.ndarray, fmin: float = 55.0, fmax: float = 5000.0,
+               floor: float = 1e-3, chunk: int = 1024) -> np.ndarray:
+    # (12, columns) in 0..1: each column scaled by its max, quiet columns stay dark
+    C = chroma_matrix(f, fmin, fmax)
+    rows = int(np.searchsorted(f, fmax, side="right"))
+    C = C[:, :rows]
+    n = S_db.shape[1]
+    out = np.empty((12, n), dtype=np.float32)
+    for i0 in range(0, n, chunk):
+        S = S_db[:rows, i0:i0 + chunk]
+        mag = np.power(10.0, S / np.float32(20.0), dtype=np.float32)
+        # spectral peaks only: a partial counts once, not with its window's main lobe
+        mag[1:-1] *= (S[1:-1] > S[:-2]) & (S[1:-1] >= S[2:])
+        mag[[0, -1]] = 0.0
+        out[:, i0:i0 + chunk] = C @ mag
+    if n == 0:
+        return out
+    top = out.max(axis=0, keepdims=True)
+    out /= np.maximum(top, floor * float(top.max()) + 1e-12)
+    return out
@@ -0,0 +1,116 @@
+import numpy as np
+
+# The crosses placed on the spectrogram: (t, f, nearest midi) in growable arrays, in insertion
+# order (the order the scatter items hold them in), plus a time-sorted index for hit testing.
+# Each cross keeps the number it was logged with in the Notes dock.
+
+class CrossStore:
+    def __init__(self, capacity: int = 256):
+        cap = max(1, int(capacity))
+        self._t = np.empty(cap, dtype=np.float64)
+        self._f = np.empty(cap, dtype=np.float64)
+        self._midi = np.empty(cap, dtype=np.int32)
+        self._id = np.empty(cap, dtype=np.int64)
+        self.n = 0
+        self.next_id = 1
+        self._order = np.zeros(0, dtype=np.int64)  # indices sorted by time
+        self._t_sorted = np.zeros(0, dtype=np.float64)
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def t(self) -> np.ndarray:
+        return self._t[:self.n]
+
+    @property
+    def f(self) -> np.ndarray:
+        return self._f[:self.n]
+
+    @property
+    def midi(self) -> np.ndarray:
+        return self._midi[:self.n]
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._id[:self.n]
+
+    def _reserve(self, k: int):
+        need = self.n + int(k)
+        cap = len(self._t)
+        if need <= cap:
+            return
+        while cap < need:
+            cap *= 2
+        for name in ("_t", "_f", "_midi", "_id"):
+            old = getattr(self, name)
+            new = np.empty(cap, dtype=old.dtype)
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+
+    def add(self, t: float, f: float, midi: int) -> int:
+        self._reserve(1)
+        i = self.n
+        self._t[i], self._f[i], self._midi[i], self._id[i] = t, f, midi, self.next_id
+        self.n += 1
+        self.next_id += 1
+        pos = int(np.searchsorted(self._t_sorted, t, side="right"))
+        self._t_sorted = np.insert(self._t_sorted, pos, t)
+        self._order = np.insert(self._order, pos, i)
+        return int(self._id[i])
+
+    def extend(self, ts, fs, midis, ids=None) -> np.ndarray:
+        # ids: keep existing numbers (session reload), new ones otherwise
+        ts = np.asarray(ts, dtype=np.float64)
+        k = len(ts)
+        self._reserve(k)
+        i0, i1 = self.n, self.n + k
+        self._t[i0:i1] = ts
+        self._f[i0:i1] = np.asarray(fs, dtype=np.float64)
+        self._midi[i0:i1] = np.asarray(midis, dtype=np.int32)
+        if ids is None:
+            self._id[i0:i1] = np.arange(self.next_id, self.next_id + k)
+            self.next_id += k
+        else:
+            self._id[i0:i1] = np.asarray(ids, dtype=np.int64)
+            if k:
+                self.next_id = max(self.next_id, int(self._id[i0:i1].max()) + 1)
+        self.n = i1
+        self._order = np.argsort(self.t, kind="stable")
+        self._t_sorted = self.t[self._order]
+        return self._id[i0:i1].copy()
+
+    def remove(self, i: int):
+        # i: index in insertion order
+        n = self.n
+        for a in (self._t, self._f, self._midi, self._id):
+            a[i:n - 1] = a[i + 1:n]
+        self.n -= 1
+        k = int(np.flatnonzero(self._order == i)[0])
+        self._order = np.delete(self._order, k)
+        self._t_sorted = np.delete(self._t_sorted, k)
+        self._order[self._order > i] -= 1
+
+    def clear(self):
+        self.n = 0
+        self.next_id = 1
+        self._order = np.zeros(0, dtype=np.int64)
+        self._t_sorted = np.zeros(0, dtype=np.float64)
+
+    def index_of(self, cross_id: int):
+        hit = np.flatnonzero(self.ids == int(cross_id))
+        return int(hit[0]) if len(hit) else None
+
+    def nearest(self, t: float, f: float, tol_t: float, tol_f: float):
+        # index of the closest cross inside the (tol_t, tol_f) box around (t, f), or None
+        i0, i1 = np.searchsorted(self._t_sorted, [t - tol_t, t + tol_t])
+        if i1 <= i0:
+            return None
+        cand = self._order[i0:i1]
+        d = np.maximum(np.abs(self._t[cand] - t) / max(tol_t, 1e-12), np.abs(self._f[cand] - f) / max(tol_f, 1e-12))
+        k = int(np.argmin(d))
+        return int(cand[k]) if d[k] <= 1.0 else None
+
+    def events(self):
+        # (t, midi) in time order
+        return list(zip(self._t_sorted.tolist(), self._midi[self._order].tolist()))
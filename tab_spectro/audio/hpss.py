@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import ndimage
+
+# Harmonic/percussive separation (median filtering) for the display. Medians commute with the
+# dB log, so everything stays in dB: H = median along time, P = median along frequency, and
+# the harmonic part is S * H^2 / (H^2 + P^2) on magnitudes (S_db is 20*log10 |X|). Columns
+# are cut in chunks with a halo of half the time kernel on each side, so the chunked result
+# is the same as the whole-array one.
+
+def harmonic_db(S_db: np.ndarray, kt: int, kf: int) -> np.ndarray:
+    H = ndimage.median_filter(S_db, size=(1, kt), mode="nearest")
+    P = ndimage.median_filter(S_db, size=(kf, 1), mode="nearest")
+    # 20*log10(H^2 / (H^2 + P^2)) = -20*log10(1 + (P/H)^2), with (P/H)^2 = 10^((P_db - H_db) / 10)
+    return (S_db - 20.0 * np.log10(1.0 + np.power(10.0, (P - H) / np.float32(10.0), dtype=np.float32))).astype(np.float32)
+
+def _chunk_job(job):
+    block, kt, kf, left, n_keep, floor = job
+    return np.maximum(harmonic_db(block, kt, kf)[:, left:left + n_keep], floor)
+
+def _odd(n: float) -> int:
+    return max(3, int(round(n)) | 1)
+
+class HpssJob:
+    # harmonic S_db rows up to fmax, computed in a process pool; the UI polls from a timer
+    def __init__(self, f: np.ndarray, t: np.ndarray, S_db: np.ndarray, floor: float, fmax: float = 5000.0,
+                 time_s: float = 0.2, freq_hz: float = 150.0, max_kf: int = 31, chunk: int = 256, workers: int | None = None):
+        self.rows = min(len(f), int(np.searchsorted(f, fmax)) + 1)
+        n = S_db.shape[1]
+        kt = _odd(time_s / float(t[1] - t[0])) if n > 1 else 3
+        # a drum hit is broadband: at fine resolutions a few dozen bins are enough (and cost less)
+        kf = min(_odd(freq_hz / float(f[1] - f[0])), max_kf)
+        halo = kt // 2
+
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self._out = np.empty((self.rows, n), dtype=np.float32)
+        workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        # spawn: forking a process that runs Qt and audio threads can deadlock the child
+        self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self._pending = {}
+        for i0 in range(0, n, chunk):
+            i1 = min(n, i0 + chunk)
+            a, b = max(0, i0 - halo), min(n, i1 + halo)
+            job = (np.ascontiguousarray(S_db[:self.rows, a:b]), kt, kf, i0 - a, i1 - i0, float(floor))
+            self._pending[self._pool.submit(_chunk_job, job)] = (i0, i1)
+        self._total = max(1, len(self._pending))
+
+    @property
+    def done(self) -> bool:
+        return self.result is not None or self.error is not None
+
+    def poll(self) -> bool:
+        # True once finished (result or error set)
+        for fut in [fu for fu in self._pending if fu.done()]:
+            i0, i1 = self._pending.pop(fut)
+            try:
+                self._out[:, i0:i1] = fut.result()
+            except Exception as e:
+                self.error = str(e) or type(e).__name__
+                self.cancel()
+                return True
+        self.progress = 1.0 - len(self._pending) / self._total
+        if not self._pending and not self.done:
+            self.result = self._out
+            self._pool.shutdown(wait=False)
+        return self.done
+
+    def cancel(self):
+        self._pending.clear()
+        self._pool.shutdown(wait=False, cancel_futures=True)
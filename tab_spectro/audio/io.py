@@ -8,16 +8,15 @@ class AudioData:
     y: np.ndarray
     sr: int
     duration: float
+    # (samples, channels) as read, multichannel files only; y is their mean
+    channels: np.ndarray | None = None
 
 def load_audio_file(path: str) -> AudioData:
     ext = os.path.splitext(path)[1].lower()
 
     if ext in [".wav", ".flac", ".ogg", ".aiff", ".aif"]:
-        y, sr = sf.read(path, always_2d=False)
-        if y.ndim == 2:
-            y = y.mean(axis=1)
-        y = y.astype(np.float32)
-        return AudioData(y=y, sr=int(sr), duration=float(len(y) / sr))
+        data, sr = sf.read(path, dtype="float32", always_2d=True)
+        return _from_frames(data, int(sr))
 
     if ext == ".mp3":
         try:
@@ -30,7 +29,6 @@ def load_audio_file(path: str) -> AudioData:
         except Exception as e:
             raise RuntimeError("MP3: ffmpeg missing in PATH.") from e
 
-        seg = seg.set_channels(1)
         sr = seg.frame_rate
         samples = np.array(seg.get_array_of_samples()).astype(np.float32)
 
@@ -41,6 +39,20 @@ def load_audio_file(path: str) -> AudioData:
         else:
             samples /= float(2 ** (8 * seg.sample_width - 1))
 
-        return AudioData(y=samples, sr=int(sr), duration=float(len(samples) / sr))
+        return _from_frames(samples.reshape(-1, seg.channels), int(sr))
 
     raise RuntimeError(f"Unsupported format: {ext}")
+
+def _from_frames(data: np.ndarray, sr: int) -> AudioData:
+    # data: (samples, channels) float32; channels kept as they are, y is the mono mix
+    if data.shape[1] == 1:
+        y = data[:, 0]
+        return AudioData(y=y, sr=sr, duration=float(len(y) / sr))
+    y = data.mean(axis=1, dtype=np.float32)
+    return AudioData(y=y, sr=sr, duration=float(len(y) / sr), channels=data)
+
+def save_audio_file(path: str, y: np.ndarray, sr: int):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in [".wav", ".flac", ".ogg", ".aiff", ".aif"]:
+        raise RuntimeError(f"Unsupported format: {ext}")
+    sf.write(path, np.asarray(y, dtype=np.float32), int(sr))
@@ -1,19 +1,33 @@
+import threading
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+
 import numpy as np
 from scipy.signal import find_peaks
+from tab_spectro.audio.pitch import yin
+from tab_spectro.audio.spectrogram import render_region_to_u8
+from tab_spectro.utils.settings import (
+    MIC_DB_MIN, MIC_DB_MAX, MIC_PITCH_WINDOW, MIC_PITCH_HOP, MIC_PITCH_FMAX, MIC_PITCH_THRESHOLD
+)
 
-def extract_mic_peaks(x: np.ndarray, fs: int, fmin: float, fmax: float, max_lines: int):
-    x = x.astype(np.float32)
-    x = x - np.mean(x)
-    rms = float(np.sqrt(np.mean(x * x) + 1e-12))
-    if rms < 0.004:
-        return [], []
+@lru_cache(maxsize=8)
+def _hann(N: int) -> np.ndarray:
+    return np.hanning(N).astype(np.float32)
+
+@lru_cache(maxsize=8)
+def _rfft_freqs(N: int, fs: int) -> np.ndarray:
+    return np.array(np.fft.rfftfreq(N, d=1.0 / fs), dtype=np.float32)
 
+_RMS_GATE = 0.004
+
+def _spectrum(x: np.ndarray, fs: int):
     N = len(x)
-    w = np.hanning(N).astype(np.float32)
+    w = _hann(N)
     X = np.fft.rfft(x * w)
-    mag = np.abs(X)
-    freqs = np.array(np.fft.rfftfreq(N, d=1.0 / fs), dtype=np.float32)
+    return _rfft_freqs(N, int(fs)), np.abs(X)
 
+def _pick_peaks(freqs: np.ndarray, mag: np.ndarray, fmin: float, fmax: float, max_lines: int):
     mask = (freqs >= float(fmin)) & (freqs <= float(fmax))
     freqs_b = freqs[mask]
     mag_b = mag[mask]
@@ -37,3 +51,169 @@ def extract_mic_peaks(x: np.ndarray, fs: int, fmin: float, fmax: float, max_line
     pf = pf[order][: int(max_lines)]
     pa = pa[order][: int(max_lines)]
     return pf.astype(float).tolist(), pa.astype(float).tolist()
+
+def extract_mic_peaks(x: np.ndarray, fs: int, fmin: float, fmax: float, max_lines: int):
+    x = x.astype(np.float32)
+    x = x - np.mean(x)
+    rms = float(np.sqrt(np.mean(x * x) + 1e-12))
+    if rms < _RMS_GATE:
+        return [], []
+
+    freqs, mag = _spectrum(x, fs)
+    return _pick_peaks(freqs, mag, fmin, fmax, max_lines)
+
+class RingBuffer:
+    # Single writer (audio callback) / single reader, positions count all samples ever written.
+    def __init__(self, capacity: int):
+        self.capacity = int(capacity)
+        self._buf = np.zeros(self.capacity, dtype=np.float32)
+        self.written = 0
+
+    def write(self, x: np.ndarray):
+        n = len(x)
+        if n >= self.capacity:
+            x = x[-self.capacity:]
+            self.written += n - self.capacity
+            n = self.capacity
+        i = self.written % self.capacity
+        k = min(n, self.capacity - i)
+        self._buf[i:i + k] = x[:k]
+        self._buf[:n - k] = x[k:]
+        self.written += n
+
+    def read(self, end: int, n: int) -> np.ndarray:
+        # the n samples before absolute position end (must still be in the buffer)
+        i = (end - n) % self.capacity
+        if i + n <= self.capacity:
+            return self._buf[i:i + n].copy()
+        k = self.capacity - i
+        return np.concatenate((self._buf[i:], self._buf[:n - k]))
+
+@dataclass
+class MicFrame:
+    pos: int  # absolute sample position of the end of the analysed window
+    freqs: list
+    amps: list
+    column: np.ndarray | None = None  # uint8 spectrum over band_freqs, for the waterfall
+    f0: float | None = None  # YIN estimate on the short window
+    confidence: float = 0.0
+    midis: list | None = None  # notes found by the chord detector, None if it is off
+
+    @property
+    def has_spectrum(self) -> bool:
+        # pitch-only frames come between two FFT hops
+        return self.column is not None
+
+class MicAnalyzer:
+    # Runs extract_mic_peaks off the GUI thread on overlapping windows (every hop samples),
+    # and a YIN pitch estimate on a shorter window every pitch_hop samples (lower latency).
+    def __init__(self, fs: int, window: int, hop: int, fmin: float, fmax: float, max_lines: int,
+                 buffer_seconds: float = 4.0, pitch_window: int = MIC_PITCH_WINDOW, pitch_hop: int = MIC_PITCH_HOP):
+        self.fs = int(fs)
+        self.window = int(window)
+        self.hop = max(1, int(hop))
+        self.fmin = float(fmin)
+        self.fmax = float(fmax)
+        self.max_lines = int(max_lines)
+
+        self.pitch_window = min(int(pitch_window), self.window)
+        self.pitch_fmax = min(MIC_PITCH_FMAX, self.fmax)
+        self.pitch_threshold = MIC_PITCH_THRESHOLD
+        pitch_hop = max(1, int(pitch_hop))
+        self.step = pitch_hop if self.hop % pitch_hop == 0 else self.hop
+
+        # spectrum rows kept for the waterfall, and their dB display range
+        f = _rfft_freqs(self.window, self.fs)
+        self._band = np.flatnonzero((f >= self.fmin) & (f <= self.fmax))
+        self.band_freqs = f[self._band]
+        self._mag_scale = 2.0 / float(np.sum(_hann(self.window)))
+        self.db_min = MIC_DB_MIN
+        self.db_max = MIC_DB_MAX
+
+        self.ring = RingBuffer(max(self.window + self.hop, int(buffer_seconds * self.fs)))
+        self.frames = deque(maxlen=1024)  # MicFrame results, consumed by the UI
+        self.chord_detector = None  # optional ChordDetector over band_freqs, swapped from the UI thread
+        self.overruns = 0
+
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def push(self, x: np.ndarray):
+        # called from the audio callback
+        with self._cond:
+            self.ring.write(x)
+            self._cond.notify()
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="mic-analyzer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def drain(self):
+        # all results since the last call, oldest first
+        out = []
+        while self.frames:
+            out.append(self.frames.popleft())
+        return out
+
+    def latest(self):
+        # drain the results, keep the newest one (None if nothing new)
+        frames = self.drain()
+        return frames[-1] if frames else None
+
+    def _run(self):
+        # first pitch frame as soon as pitch_window samples are in, on the same grid as the FFT hops
+        next_end = self.window - ((self.window - self.pitch_window) // self.step) * self.step
+        while True:
+            with self._cond:
+                while self._running and self.ring.written < next_end:
+                    self._cond.wait(timeout=0.5)
+                if not self._running:
+                    return
+                written = self.ring.written
+                oldest = written - self.ring.capacity
+                if next_end - self.window < oldest:
+                    # fell behind by more than the ring holds: jump to the newest window
+                    self.overruns += 1
+                    next_end = written - (written - self.window) % self.hop
+                full = next_end >= self.window and (next_end - self.window) % self.hop == 0
+                x = self.ring.read(next_end, self.window if full else self.pitch_window)
+            self.frames.append(self._analyse(next_end, x) if full else self._analyse_pitch(next_end, x))
+            next_end += self.step
+
+    def _pitch(self, x: np.ndarray):
+        return yin(x[-self.pitch_window:], self.fs, self.fmin, self.pitch_fmax, self.pitch_threshold)
+
+    def _analyse_pitch(self, pos: int, x: np.ndarray) -> MicFrame:
+        x = x - np.mean(x)
+        if float(np.sqrt(np.mean(x * x) + 1e-12)) < _RMS_GATE:
+            return MicFrame(pos=pos, freqs=[], amps=[])
+        f0, conf = self._pitch(x)
+        return MicFrame(pos=pos, freqs=[], amps=[], f0=f0, confidence=conf)
+
+    def _analyse(self, pos: int, x: np.ndarray) -> MicFrame:
+        x = x - np.mean(x)
+        rms = float(np.sqrt(np.mean(x * x) + 1e-12))
+        freqs, mag = _spectrum(x, self.fs)
+
+        band_db = 20.0 * np.log10(mag[self._band] * self._mag_scale + 1e-10)
+        column = render_region_to_u8(band_db, self.db_min, self.db_max)
+
+        if rms < _RMS_GATE:
+            return MicFrame(pos=pos, freqs=[], amps=[], column=column)
+        pf, pa = _pick_peaks(freqs, mag, self.fmin, self.fmax, self.max_lines)
+        f0, conf = self._pitch(x)
+        detector = self.chord_detector
+        midis = detector.detect(mag[self._band]) if detector is not None else None
+        return MicFrame(pos=pos, freqs=pf, amps=pa, column=column, f0=f0, confidence=conf, midis=midis)
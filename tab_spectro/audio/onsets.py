@@ -0,0 +1,50 @@
+import numpy as np
+from scipy import ndimage
+
+# Onsets from the spectrogram already on screen: half-wave rectified spectral flux between
+# columns, peaks above a moving-median threshold. Lookups go through a sorted array.
+
+def spectral_flux(f: np.ndarray, S_db: np.ndarray, fmax: float = 5000.0) -> np.ndarray:
+    # mean dB increase from column k to k + 1, rows up to fmax
+    rows = int(np.searchsorted(f, fmax))
+    return np.maximum(np.diff(S_db[:rows], axis=1), 0.0).mean(axis=0)
+
+def spectral_flux_onsets(f: np.ndarray, t: np.ndarray, S_db: np.ndarray, fmax: float = 5000.0,
+                         delta: float = 0.3, median_s: float = 0.5, min_gap_s: float = 0.05) -> np.ndarray:
+    if S_db is None or S_db.shape[1] < 3:
+        return np.zeros(0, dtype=np.float64)
+    flux = spectral_flux(f, S_db, fmax)  # column k -> k + 1
+
+    dt = float(t[1] - t[0]) if len(t) > 1 else 1.0
+    w = max(3, int(round(median_s / dt)) | 1)
+    base = ndimage.median_filter(flux, size=w, mode="nearest")
+    spread = ndimage.median_filter(np.abs(flux - base), size=w, mode="nearest") + 1e-6
+    g = max(1, int(round(min_gap_s / dt)))
+    is_peak = (flux == ndimage.maximum_filter1d(flux, size=2 * g + 1, mode="nearest"))
+    is_peak &= flux > base + delta * 4.0 * spread
+    return np.asarray(t[1:][is_peak], dtype=np.float64)
+
+class OnsetIndex:
+    def __init__(self, times=None):
+        self.times = np.sort(np.asarray(times if times is not None else [], dtype=np.float64))
+
+    def __len__(self):
+        return len(self.times)
+
+    def nearest(self, t: float, max_dist: float | None = None):
+        # O(log n); None if empty or farther than max_dist
+        n = len(self.times)
+        if n == 0:
+            return None
+        i = int(np.searchsorted(self.times, t))
+        best = None
+        for j in (i - 1, i):
+            if 0 <= j < n and (best is None or abs(self.times[j] - t) < abs(best - t)):
+                best = float(self.times[j])
+        if max_dist is not None and abs(best - t) > max_dist:
+            return None
+        return best
+
+    def between(self, t0: float, t1: float) -> np.ndarray:
+        i0, i1 = np.searchsorted(self.times, [t0, t1])
+        return self.times[i0:i1]
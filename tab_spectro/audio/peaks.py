@@ -0,0 +1,73 @@
+import numpy as np
+
+# Spectral peaks of every spectrogram column, computed once per spectrogram: local maxima along
+# frequency (within floor_db of the column max), refined with a parabola through the three dB
+# values around each one. Stored CSR-style (ptr per column), so a lookup only touches the
+# peaks of a few columns whatever the resolution.
+
+def parabolic_peaks(S: np.ndarray, f: np.ndarray, floor_db: float):
+    # S: dB rows x columns -> (column, refined freq, refined dB) of the local maxima
+    c = S[1:-1]
+    is_peak = (c > S[:-2]) & (c >= S[2:]) & (c > S.max(axis=0, keepdims=True) - floor_db)
+    row, col = np.nonzero(is_peak)
+    order = np.lexsort((row, col))  # column-major, rising frequency
+    row, col = row[order] + 1, col[order]
+    a, b, g = S[row - 1, col], S[row, col], S[row + 1, col]
+    den = a - 2.0 * b + g
+    d = np.where(den < 0, 0.5 * (a - g) / np.where(den < 0, den, -1.0), 0.0)
+    df = float(f[1] - f[0])
+    return col, (f[row] + d * df).astype(np.float32), (b - 0.25 * (a - g) * d).astype(np.float32)
+
+class PeakIndex:
+    def __init__(self, f=None, t=None, S_db=None, fmax: float = 5000.0, floor_db: float = 50.0, chunk: int = 512):
+        self.t = np.zeros(0, dtype=np.float32) if t is None else np.asarray(t)
+        n = len(self.t)
+        self.ptr = np.zeros(n + 1, dtype=np.int64)
+        self.freq = np.zeros(0, dtype=np.float32)
+        self.db = np.zeros(0, dtype=np.float32)
+        if S_db is None or n == 0 or len(f) < 3:
+            return
+        rows = max(3, int(np.searchsorted(f, fmax)) + 1)
+        counts = np.zeros(n, dtype=np.int64)
+        freqs, dbs = [], []
+        for i0 in range(0, n, chunk):
+            col, pf, pdb = parabolic_peaks(S_db[:rows, i0:i0 + chunk], f, floor_db)
+            counts[i0:i0 + chunk] = np.bincount(col, minlength=min(chunk, n - i0))
+            freqs.append(pf)
+            dbs.append(pdb)
+        np.cumsum(counts, out=self.ptr[1:])
+        self.freq = np.concatenate(freqs)
+        self.db = np.concatenate(dbs)
+
+    @classmethod
+    def from_arrays(cls, t, ptr, freq, db):
+        # saved index (project file)
+        idx = cls()
+        idx.t = np.array(t)
+        idx.ptr = np.array(ptr, dtype=np.int64)
+        idx.freq = np.array(freq, dtype=np.float32)
+        idx.db = np.array(db, dtype=np.float32)
+        return idx
+
+    def __len__(self):
+        return len(self.t)
+
+    def column(self, k: int):
+        # (freqs, dBs) of column k, rising frequency
+        a, b = self.ptr[k], self.ptr[k + 1]
+        return self.freq[a:b], self.db[a:b]
+
+    def strongest_near(self, t: float, f: float, tol_f: float, cols: int = 1):
+        # refined frequency of the loudest peak within tol_f of f, around the column at t; None if none
+        if len(self.t) == 0:
+            return None
+        k = int(np.clip(np.searchsorted(self.t, t), 0, len(self.t) - 1))
+        if k > 0 and abs(self.t[k - 1] - t) < abs(self.t[k] - t):
+            k -= 1
+        a = self.ptr[max(0, k - cols)]
+        b = self.ptr[min(len(self.t), k + cols + 1)]
+        pf, pdb = self.freq[a:b], self.db[a:b]
+        near = np.flatnonzero(np.abs(pf - f) <= tol_f)
+        if len(near) == 0:
+            return None
+        return float(pf[near[np.argmax(pdb[near])]])
@@ -0,0 +1,62 @@
+from functools import lru_cache
+
+import numpy as np
+from scipy.fft import next_fast_len, irfft, rfft
+
+# YIN fundamental estimator (de Cheveigné & Kawahara), for a single monophonic note.
+# The difference function is computed from one FFT cross-correlation instead of a loop over lags.
+
+@lru_cache(maxsize=8)
+def _yin_plan(n: int, tau_max: int):
+    # integration length, FFT size and lag indices for a given window / max lag
+    W = n - tau_max
+    nfft = next_fast_len(n + W)
+    taus = np.arange(1, tau_max + 1, dtype=np.float64)
+    return W, nfft, taus
+
+def yin(x: np.ndarray, fs: int, fmin: float = 70.0, fmax: float = 1200.0, threshold: float = 0.15):
+    # returns (f0 in Hz or None, confidence in 0..1)
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    tau_min = max(2, int(fs / float(fmax)))
+    tau_max = min(int(np.ceil(fs / float(fmin))), n // 2)
+    if tau_max <= tau_min + 2:
+        return None, 0.0
+    W, nfft, taus = _yin_plan(n, tau_max)
+
+    x = x - np.mean(x)
+    # r[tau] = sum_j x[j] * x[j + tau], j < W
+    r = irfft(rfft(x, nfft) * np.conj(rfft(x[:W], nfft)), nfft)[1:tau_max + 1]
+    cs = np.concatenate(([0.0], np.cumsum(x * x)))
+    e0 = cs[W]
+    if e0 <= 1e-12:
+        return None, 0.0
+    e_tau = cs[W + 1:W + tau_max + 1] - cs[1:tau_max + 1]
+    d = np.maximum(e0 + e_tau - 2.0 * r, 0.0)
+
+    # cumulative mean normalized difference, index i <-> lag i + 1
+    cmnd = d * taus / np.maximum(np.cumsum(d), 1e-12)
+
+    seg = cmnd[tau_min - 1:]
+    below = np.flatnonzero(seg < threshold)
+    if len(below):
+        i = int(below[0])
+        # walk down to the bottom of that dip
+        while i + 1 < len(seg) and seg[i + 1] < seg[i]:
+            i += 1
+    else:
+        i = int(np.argmin(seg))
+    i += tau_min - 1
+
+    # parabolic interpolation around the minimum
+    tau = float(i + 1)
+    if 0 < i < len(cmnd) - 1:
+        a, b, c = cmnd[i - 1], cmnd[i], cmnd[i + 1]
+        den = a - 2.0 * b + c
+        if den > 1e-12:
+            tau += 0.5 * (a - c) / den
+
+    conf = float(np.clip(1.0 - cmnd[i], 0.0, 1.0))
+    if not len(below):
+        return None, conf
+    return float(fs) / float(tau), conf
@@ -14,11 +14,23 @@ class AudioPlayer:
         self.loop_b = None
 
         self._audio = None 
+        self._overlay = None  # optional buffer mixed over the track (same timeline)
 
     def set_audio(self, y: np.ndarray, sr: int, duration: float):
         self._audio = (y, sr, duration)
+        self._overlay = None
         self.playhead = 0.0
 
+    def set_overlay(self, x: np.ndarray | None):
+        with self._lock:
+            self._overlay = x
+
+    def _read(self, y: np.ndarray, start: int, stop: int) -> np.ndarray:
+        ov = self._overlay
+        if ov is None:
+            return y[start:stop]
+        return np.clip(y[start:stop] + ov[start:stop], -1.0, 1.0)
+
     def set_loop(self, enabled: bool, a: float = None, b: float = None):
         self.loop_enabled = bool(enabled)
         self.loop_a = a
@@ -58,7 +70,7 @@ class AudioPlayer:
                         if cur >= loop_end:
                             cur = loop_start
                         take = min(frames - pos, loop_end - cur)
-                        out[pos:pos+take] = y[cur:cur+take]
+                        out[pos:pos+take] = self._read(y, cur, cur+take)
                         pos += take
                         cur += take
                     outdata[:, 0] = out
@@ -69,7 +81,7 @@ class AudioPlayer:
 
                 end = idx + frames
                 if end >= len(y):
-                    chunk = y[idx:]
+                    chunk = self._read(y, idx, len(y))
                     out = np.zeros((frames,), dtype=np.float32)
                     out[:len(chunk)] = chunk
                     outdata[:, 0] = out
@@ -77,7 +89,7 @@ class AudioPlayer:
                     self.is_playing = False
                     raise sd.CallbackStop
 
-                outdata[:, 0] = y[idx:end]
+                outdata[:, 0] = self._read(y, idx, end)
                 self.playhead += frames / sr
 
         sd.stop()
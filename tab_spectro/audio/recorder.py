@@ -0,0 +1,50 @@
+import queue
+import threading
+
+import numpy as np
+import soundfile as sf
+from tab_spectro.audio.spectrogram import SpectrogramStream
+
+# Mic take to disk: the audio callback only queues blocks, a writer thread appends them to the
+# file and feeds the streaming STFT. The queue is bounded, so a stalled disk drops blocks
+# (counted) instead of growing memory.
+
+class AudioRecorder:
+    def __init__(self, path: str, sr: int, nperseg: int, noverlap_ratio: float, max_blocks: int = 512):
+        self.path = path
+        self.sr = int(sr)
+        self.spectro = SpectrogramStream(self.sr, nperseg, noverlap_ratio)
+        self.frames_written = 0
+        self.dropped = 0
+
+        self._file = sf.SoundFile(path, mode="w", samplerate=self.sr, channels=1)
+        self._queue = queue.Queue(maxsize=int(max_blocks))
+        self._thread = threading.Thread(target=self._run, name="recorder", daemon=True)
+        self._thread.start()
+
+    @property
+    def duration(self) -> float:
+        return self.frames_written / float(self.sr)
+
+    def push(self, x: np.ndarray):
+        # called from the audio callback
+        try:
+            self._queue.put_nowait(np.array(x, dtype=np.float32))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            x = self._queue.get()
+            if x is None:
+                return
+            self._file.write(x)
+            self.spectro.feed(x)
+            self.frames_written += len(x)
+
+    def stop(self):
+        # blocks until everything queued is on disk
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        return self.spectro.finish()
@@ -0,0 +1,32 @@
+import numpy as np
+from tab_spectro.audio.synth import _pluck, _envelope, _nylon
+from tab_spectro.guitar.theory import midi_to_freq
+
+# Offline rendering of a note sequence (the crosses) onto the track's timeline.
+# Every note is rendered on its own and added in place, so one new cross only costs one note.
+# A note takes a few ms: whole sequences are rendered in-process, the UI runs this in a thread.
+
+def render_note(midi: int, sr: int, dur: float = 1.2, gain: float = 0.3) -> np.ndarray:
+    x = _pluck(midi_to_freq(midi), sr, dur)
+    x = _envelope(x, sr, attack=0.003, release=0.25)
+    return _nylon(x * float(gain))
+
+def add_note(buf: np.ndarray, x: np.ndarray, t: float, sr: int):
+    i0 = int(round(float(t) * sr))
+    if i0 >= len(buf) or i0 + len(x) <= 0:
+        return
+    j0 = max(0, -i0)
+    i0 = max(0, i0)
+    n = min(len(x) - j0, len(buf) - i0)
+    buf[i0:i0 + n] += x[j0:j0 + n]
+
+def render_sequence(events, sr: int, n_samples: int, note_dur: float = 1.2, gain: float = 0.3) -> np.ndarray:
+    # events: (t, midi) pairs, in any order
+    events = sorted((float(t), int(m)) for t, m in events)
+    out = np.zeros(int(n_samples), dtype=np.float32)
+    if not events:
+        return out
+
+    for t, m in events:
+        add_note(out, render_note(m, sr, note_dur, gain), t, sr)
+    return out
@@ -1,3 +1,5 @@
+import threading
+
 import numpy as np
 from scipy.signal import stft, get_window
 from tab_spectro.utils.settings import DEFAULT_GAMMA
@@ -22,10 +24,116 @@ def compute_spectrogram_full(y: np.ndarray, sr: int, nperseg: int, noverlap_rati
 
     f = f.astype(np.float32)
     t = t.astype(np.float32)
-    S_db = np.clip(S_db, vmin, vmax).astype(np.float32)
+    # only the floor is clipped: the display clips the top anyway, and peak
+    # interpolation needs the real shape of the loudest peaks
+    S_db = np.maximum(S_db, vmin).astype(np.float32)
 
     return f, t, S_db, vmin, vmax
 
+# channel views of a stereo track; "mid" is the mono mix the app shows by default
+CHANNEL_VIEWS = ("mid", "side", "left", "right")
+
+def compute_spectrogram_channels(channels: np.ndarray, sr: int, nperseg: int, noverlap_ratio: float,
+                                 chunk: int = 256):
+    # (samples, >= 2) -> f, t, {view: S_db}, vmin, vmax with the columns of compute_spectrogram_full.
+    # One FFT per channel and column: mid = (L+R)/2 and side = (L-R)/2 are combined from the
+    # complex L/R spectra (the STFT is linear). Channel columns are strided views, never copied
+    # whole; the complex spectra only exist one chunk of columns at a time.
+    nperseg = int(nperseg)
+    noverlap = max(0, min(int(nperseg * float(noverlap_ratio)), nperseg - 1))
+    hop = nperseg - noverlap
+    win = get_window("hann", nperseg, fftbins=True).astype(np.float32)
+    scale = np.float32(1.0 / float(np.sum(win)))  # stft's default "spectrum" scaling
+
+    left, right = channels[:, 0], channels[:, 1]
+    n = 0 if len(left) < nperseg else 1 + (len(left) - nperseg) // hop
+    f = np.fft.rfftfreq(nperseg, d=1.0 / sr).astype(np.float32)
+    t = ((nperseg / 2 + hop * np.arange(n)) / sr).astype(np.float32)
+    views = {v: np.empty((len(f), n), dtype=np.float32) for v in CHANNEL_VIEWS}
+    fl = np.lib.stride_tricks.sliding_window_view(left, nperseg)[::hop]
+    fr = np.lib.stride_tricks.sliding_window_view(right, nperseg)[::hop]
+
+    for i0 in range(0, n, chunk):
+        i1 = min(n, i0 + chunk)
+        zl = np.fft.rfft(fl[i0:i1] * win, axis=1).T * scale
+        zr = np.fft.rfft(fr[i0:i1] * win, axis=1).T * scale
+        for v, z in (("left", zl), ("right", zr), ("mid", (zl + zr) * 0.5), ("side", (zl - zr) * 0.5)):
+            views[v][:, i0:i1] = 20.0 * np.log10(np.abs(z) + 1e-10)
+
+    if n == 0:
+        return f, t, views, -90.0, 0.0
+    # levels of the mix for every view: switching channel keeps the colour scale, a quiet side stays dark
+    vmax = float(np.percentile(views["mid"], 99.8))
+    vmin = vmax - 90.0
+    for S_db in views.values():
+        np.maximum(S_db, vmin, out=S_db)
+    return f, t, views, vmin, vmax
+
+class SpectrogramStream:
+    # Same columns as compute_spectrogram_full, computed as samples come in (recording).
+    # Columns go into a buffer that doubles when full; f/t/S_db views can be read at any time.
+    def __init__(self, sr: int, nperseg: int, noverlap_ratio: float, capacity: int = 256):
+        self.sr = int(sr)
+        self.nperseg = int(nperseg)
+        noverlap = int(self.nperseg * float(noverlap_ratio))
+        self.hop = self.nperseg - max(0, min(noverlap, self.nperseg - 1))
+
+        self._win = get_window("hann", self.nperseg, fftbins=True).astype(np.float32)
+        self._scale = 1.0 / float(np.sum(self._win))  # stft's default "spectrum" scaling
+        self.f = np.fft.rfftfreq(self.nperseg, d=1.0 / self.sr).astype(np.float32)
+
+        self._S = np.empty((len(self.f), int(capacity)), dtype=np.float32)
+        self._t = np.empty(int(capacity), dtype=np.float32)
+        self.n = 0
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._consumed = 0  # absolute sample index of _pending[0]
+        self._lock = threading.Lock()
+        self.vmax = -np.inf  # running display max, refined in finish()
+
+    def feed(self, x: np.ndarray) -> int:
+        # returns the number of new columns
+        buf = np.concatenate((self._pending, np.asarray(x, dtype=np.float32)))
+        k = 0 if len(buf) < self.nperseg else 1 + (len(buf) - self.nperseg) // self.hop
+        if k == 0:
+            self._pending = buf
+            return 0
+
+        frames = np.lib.stride_tricks.sliding_window_view(buf, self.nperseg)[::self.hop][:k]
+        S_db = 20.0 * np.log10(np.abs(np.fft.rfft(frames * self._win, axis=1)).T * self._scale + 1e-10)
+        t = (self._consumed + self.nperseg / 2 + self.hop * np.arange(k)) / self.sr
+
+        with self._lock:
+            if self.n + k > self._S.shape[1]:
+                cap = max(2 * self._S.shape[1], self.n + k)
+                S = np.empty((self._S.shape[0], cap), dtype=np.float32)
+                S[:, :self.n] = self._S[:, :self.n]
+                tt = np.empty(cap, dtype=np.float32)
+                tt[:self.n] = self._t[:self.n]
+                self._S, self._t = S, tt
+            self._S[:, self.n:self.n + k] = S_db
+            self._t[self.n:self.n + k] = t
+            self.n += k
+            self.vmax = max(self.vmax, float(np.percentile(S_db, 99.8)))
+
+        self._pending = buf[k * self.hop:]
+        self._consumed += k * self.hop
+        return k
+
+    def view(self):
+        # f, t, S_db over the columns computed so far (no copy)
+        with self._lock:
+            return self.f, self._t[:self.n], self._S[:, :self.n]
+
+    def finish(self):
+        # final floor with the whole-take percentile, exactly like compute_spectrogram_full
+        f, t, S_db = self.view()
+        if S_db.shape[1] == 0:
+            return f, t, S_db, -90.0, 0.0
+        vmax = float(np.percentile(S_db, 99.8))
+        vmin = vmax - 90.0
+        np.maximum(S_db, vmin, out=S_db)
+        return f, t, S_db, vmin, vmax
+
 def render_region_to_u8(S_db_region: np.ndarray, vmin: float, vmax: float, gamma: float = DEFAULT_GAMMA):
     scaled = (S_db_region - float(vmin)) / (float(vmax) - float(vmin) + 1e-12)
     scaled = np.clip(scaled, 0.0, 1.0)
@@ -1,10 +1,54 @@
 # tab_spectro/audio/synth.py
 import numpy as np
 import sounddevice as sd
+from scipy.linalg import toeplitz
+from scipy.signal import lfilter
 from tab_spectro.guitar.theory import midi_to_freq
 
 #Making our own guitar sounds instead of having mp3 files 
 
+# Below this delay-line length, one period costs less as a small matmul than as an lfilter call
+_KS_MATRIX_MAX_PERIOD = 200
+_KS_MATRIX_BLOCK = 256
+
+def _ks_period_matrix(L: int, c: float, dm: float, br: float, periods: int) -> np.ndarray:
+    # Maps the window z[s-1 : s+L+1] onto the next periods*L output samples.
+    # The low-pass state at s is folded in: br*y + (1-br)*lp is the output z[s+L],
+    # so lp only has to be rebuilt from z[s-1], z[s] and z[s+L].
+    k = np.arange(L)
+    col = ((1.0 - br) * (1.0 - dm)) * dm ** k
+    col[0] += br
+    T = toeplitz(col, np.zeros(L))
+
+    M = np.zeros((L, L + 2), dtype=np.float64)
+    M[:, 1:L + 1] += c * T
+    M[:, 2:L + 2] += c * T
+    g = dm ** (k + 1)
+    M[:, L + 1] += g
+    M[:, 0] -= g * br * c
+    M[:, 1] -= g * br * c
+
+    W = np.zeros((L + 2 + periods * L, L + 2), dtype=np.float64)
+    W[:L + 2] = np.eye(L + 2)
+    for b in range(periods):
+        W[L + 2 + b * L:L + 2 + (b + 1) * L] = M @ W[b * L:b * L + L + 2]
+    return W[L + 2:]
+
+def _ks_excitation(N: int, pick: float) -> np.ndarray:
+    noise = (np.random.rand(N).astype(np.float32) * 2.0 - 1.0)
+
+    k = 5
+    kernel = np.ones(k, dtype=np.float32) / k
+    noise_lp = np.convolve(noise, kernel, mode="same").astype(np.float32)
+
+    #pick effect
+    return ((1.0 - pick) * noise_lp + pick * noise).astype(np.float32)
+
+def _ks_filter(c: float, dm: float, br: float):
+    # decay -> damp (one-pole low-pass) -> brightness mix, folded into one filter:
+    # val = br*y + (1-br)*lp  <=>  val[n] = b0*y[n] + b1*y[n-1] + dm*val[n-1]
+    return [c * (br + (1.0 - br) * (1.0 - dm)), -c * br * dm], [1.0, -dm]
+
 def _karplus_strong(freq: float,
                     sr: int,
                     dur: float,
@@ -16,40 +60,37 @@ def _karplus_strong(freq: float,
     freq = max(20.0, float(freq))
     N = max(2, int(sr / freq))  # taille du buffer
     n_samples = int(sr * dur)
-    noise = (np.random.rand(N).astype(np.float32) * 2.0 - 1.0)
+    exc = _ks_excitation(N, pick)
 
-    k = 5
-    kernel = np.ones(k, dtype=np.float32) / k
-    noise_lp = np.convolve(noise, kernel, mode="same").astype(np.float32)
+    # z = [exc, out]: out[i] reads z[i] and z[i+1], i.e. samples written N and N-1
+    # steps earlier, so a block of L = N-1 samples only depends on previous blocks.
+    z = np.zeros(N + n_samples, dtype=np.float64)
+    z[:N] = exc
 
-    #pick effect
-    exc = ((1.0 - pick) * noise_lp + pick * noise).astype(np.float32)
-
-
-    buf = exc.copy()
-    out = np.zeros(n_samples, dtype=np.float32)
-
-    # low-pass one-pole state
-    lp = 0.0
+    c = 0.5 * float(decay)
     br = float(np.clip(brightness, 0.0, 1.0))
     dm = float(np.clip(damp, 0.0, 1.0))
 
-    for i in range(n_samples):
-        x0 = buf[i % N]
-        x1 = buf[(i + 1) % N]
-        avg = 0.5 * (x0 + x1)
-
-        # decay
-        y = decay * avg
+    ks_b, ks_a = _ks_filter(c, dm, br)
+    zi = np.zeros(1, dtype=np.float64)
 
-        # damp
-        lp = (1.0 - dm) * y + dm * lp
+    L = N - 1
+    if L < _KS_MATRIX_MAX_PERIOD and n_samples > L:
+        # first period: filter state starts from zero
+        z[N:N + L], _ = lfilter(ks_b, ks_a, z[:L] + z[1:L + 1], zi=zi)
 
-        # brightness
-        val = br * y + (1.0 - br) * lp
+        periods = max(1, _KS_MATRIX_BLOCK // L)
+        M = _ks_period_matrix(L, c, dm, br, periods)
+        step = periods * L
+        for s in range(L, n_samples, step):
+            e = min(s + step, n_samples)
+            z[N + s:N + e] = M[:e - s] @ z[s - 1:s + L + 1]
+    else:
+        for s in range(0, n_samples, L):
+            e = min(s + L, n_samples)
+            z[N + s:N + e], zi = lfilter(ks_b, ks_a, z[s:e] + z[s + 1:e + 1], zi=zi)
 
-        buf[i % N] = val
-        out[i] = val
+    out = z[N:N + n_samples]
 
     mx = float(np.max(np.abs(out)) + 1e-9)
     out = out / mx
@@ -64,69 +105,76 @@ def _envelope(x: np.ndarray, sr: int, attack=0.01, release=0.35) -> np.ndarray:
     env[-rN:] *= np.linspace(1, 0, rN, dtype=np.float32)
     return x * env
 
-def synth_chord(midis,
-                sr: int = 44100,
-                dur: float = 1.2,
-                gain: float = 0.24,      
-                pick: float = 0.10,      
-                decay: float = 0.9989,  
-                damp: float = 0.54,
-                brightness: float = 0.24
-) -> tuple[np.ndarray, int]:
-    midis = list(dict.fromkeys([int(m) for m in (midis or []) if m is not None]))
-    if not midis:
-        return np.zeros(int(sr * dur), dtype=np.float32), sr
+def _jitter(pick: float, decay: float, damp: float, brightness: float) -> dict:
+    # a bit of randomness per string so repeated notes don't sound identical
+    return dict(
+        pick=float(np.clip(pick + np.random.uniform(-0.05, 0.05), 0.0, 1.0)),
+        decay=float(np.clip(decay + np.random.uniform(-0.0006, 0.0006), 0.990, 0.9998)),
+        damp=float(np.clip(damp + np.random.uniform(-0.03, 0.03), 0.0, 0.95)),
+        brightness=float(np.clip(brightness + np.random.uniform(-0.05, 0.05), 0.0, 1.0)),
+    )
+
+def _pluck(freq: float,
+           sr: int,
+           dur: float,
+           pick: float = 0.10,
+           decay: float = 0.9989,
+           damp: float = 0.54,
+           brightness: float = 0.24
+) -> np.ndarray:
+    return _karplus_strong(freq, sr, dur, **_jitter(pick, decay, damp, brightness))
 
-    freqs = [(m, midi_to_freq(m)) for m in sorted(midis)]
-    n = int(sr * dur)
+def _mix_strum(voices, sr: int, n: int, gain: float = 0.24) -> np.ndarray:
+    # voices: raw plucks (at least n samples), low string first
     out = np.zeros(n, dtype=np.float32)
 
     # strum max ~10ms
     max_delay = int(sr * 0.010) 
-    delays = np.linspace(0, max_delay, num=len(freqs)).astype(int)
-
-    for (m, f), d in zip(freqs, delays):
-        local_pick = float(np.clip(pick + np.random.uniform(-0.05, 0.05), 0.0, 1.0))
-        local_decay = float(np.clip(decay + np.random.uniform(-0.0006, 0.0006), 0.990, 0.9998))
-        local_damp = float(np.clip(damp + np.random.uniform(-0.03, 0.03), 0.0, 0.95))
-        local_bright = float(np.clip(brightness + np.random.uniform(-0.05, 0.05), 0.0, 1.0))
-
-        s = _karplus_strong(
-            f, sr, dur,
-            pick=local_pick,
-            decay=local_decay,
-            damp=local_damp,
-            brightness=local_bright
-        )
-        s = _envelope(s, sr, attack=0.003, release=0.25)
-
-        if d > 0:
-            s2 = np.zeros_like(s)
-            s2[d:] = s[:-d]
-            s = s2
-
-        out += s
-
-    out /= max(1.0, float(len(freqs)) * 0.85)
+    delays = np.linspace(0, max_delay, num=len(voices)).astype(int)
+
+    for v, d in zip(voices, delays):
+        d = min(int(d), n)
+        s = _envelope(v[:n], sr, attack=0.003, release=0.25)
+        out[d:] += s[:n - d]
+
+    out /= max(1.0, float(len(voices)) * 0.85)
     out *= float(gain)
 
     mx = float(np.max(np.abs(out)) + 1e-9)
     if mx > 0.98:
         out *= (0.98 / mx)
     
+    return _nylon(out)
+
+def _nylon(out: np.ndarray) -> np.ndarray:
     # --- soft low-pass (nylon vibe) ---
     # simple 1-pole filter: y[n] = a*y[n-1] + (1-a)*x[n]
-    a = 0.88 
-    lp = np.zeros_like(out, dtype=np.float32)
-    prev = 0.0
-    for i in range(len(out)):
-        prev = a * prev + (1.0 - a) * float(out[i])
-        lp[i] = prev
+    a = 0.88
+    lp = lfilter([1.0 - a], [1.0, -a], out.astype(np.float64)).astype(np.float32)
 
     air = out - lp
     out = lp + 0.18 * air 
 
-    return out.astype(np.float32), sr
+    return out.astype(np.float32)
+
+def synth_chord(midis,
+                sr: int = 44100,
+                dur: float = 1.2,
+                gain: float = 0.24,      
+                pick: float = 0.10,      
+                decay: float = 0.9989,  
+                damp: float = 0.54,
+                brightness: float = 0.24
+) -> tuple[np.ndarray, int]:
+    midis = list(dict.fromkeys([int(m) for m in (midis or []) if m is not None]))
+    if not midis:
+        return np.zeros(int(sr * dur), dtype=np.float32), sr
+
+    voices = [
+        _pluck(midi_to_freq(m), sr, dur, pick=pick, decay=decay, damp=damp, brightness=brightness)
+        for m in sorted(midis)
+    ]
+    return _mix_strum(voices, sr, int(sr * dur), gain=gain), sr
 
 def play_midis(midis, sr: int = 44100, dur: float = 1.0):
     x, sr = synth_chord(midis, sr=sr, dur=dur)
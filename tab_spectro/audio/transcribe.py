@@ -0,0 +1,165 @@
+import multiprocessing as mp
+import queue
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import ndimage
+from scipy.signal import get_window
+from tab_spectro.audio.chords import harmonic_templates
+from tab_spectro.guitar.theory import midi_to_freq
+
+# Whole-track note events. Per chunk of frames: STFT -> spectral peaks only (vectorised local
+# maxima) -> harmonic grouping as one sparse product with the note templates -> note salience.
+# A note X that is the 2nd..5th harmonic of a lower note L is dropped as a ghost when L sounds
+# (its fundamental is a peak), its series is stronger than X's and its other partials are there
+# too. Without L's fundamental, the fifth of a power chord is not mistaken for a harmonic.
+# Then peak tracking per note row: hysteresis runs over time become (onset, offset) events.
+
+GHOST_RATIO = 0.5
+GHOST_HARMONICS = (2, 3, 4, 5)
+
+@dataclass
+class NoteEvent:
+    onset: float
+    offset: float
+    midi: int
+    strength: float  # 0..1, peak salience relative to the loudest note of the track
+
+def _peak_spectrum(mag: np.ndarray, floor_db: float) -> np.ndarray:
+    # keep local maxima along frequency that are within floor_db of the frame max
+    c = mag[1:-1]
+    is_peak = (c > mag[:-2]) & (c >= mag[2:])
+    is_peak &= c > mag.max(axis=0, keepdims=True) * (10.0 ** (floor_db / 20.0))
+    out = np.zeros_like(mag)
+    out[1:-1][is_peak] = np.sqrt(c[is_peak])
+    return out
+
+def transcribe(y: np.ndarray, sr: int, midi_lo: int = 28, midi_hi: int = 88, nperseg: int = 4096,
+               hop: int = 512, fmax: float = 5000.0, floor_db: float = -45.0, on: float = 0.30,
+               off: float = 0.15, min_dur: float = 0.05, chunk: int = 2048, progress=None):
+    y = np.asarray(y, dtype=np.float32)
+    sr = int(sr)
+    n_frames = 0 if len(y) < nperseg else 1 + (len(y) - nperseg) // hop
+    if n_frames < 3:
+        return []
+
+    win = get_window("hann", nperseg, fftbins=True).astype(np.float32)
+    freqs = np.fft.rfftfreq(nperseg, d=1.0 / sr)
+    n_bins = int(np.searchsorted(freqs, fmax))
+    midis = np.arange(int(midi_lo), int(midi_hi) + 1)
+    T = harmonic_templates(midis, freqs[:n_bins]).tocsr()
+    # bin of each note's fundamental: a note without it is not counted
+    f0_bin = np.clip(np.round(np.array([midi_to_freq(m) for m in midis]) * nperseg / sr).astype(int), 1, n_bins - 2)
+    # for d = 2..5, the note L = f0/d: its full series, the partials of it that f0's own series
+    # lacks, its fundamental bin and whether that bin is above the first ones
+    ghosts = []
+    for d in GHOST_HARMONICS:
+        sub = midis - 12.0 * np.log2(d)
+        b = np.round(np.array([midi_to_freq(m) for m in sub]) * nperseg / sr).astype(int)
+        ghosts.append((harmonic_templates(sub, freqs[:n_bins]).tocsr(),
+                       harmonic_templates(sub, freqs[:n_bins], skip_every=d).tocsr(),
+                       np.clip(b, 1, n_bins - 2), b >= 2))
+
+    frames = np.lib.stride_tricks.sliding_window_view(y, nperseg)[::hop][:n_frames]
+    sal = np.empty((len(midis), n_frames), dtype=np.float32)
+    for i0 in range(0, n_frames, chunk):
+        i1 = min(n_frames, i0 + chunk)
+        mag = np.abs(np.fft.rfft(frames[i0:i1] * win, axis=1))[:, :n_bins].T
+        P = _peak_spectrum(mag, floor_db)
+        s = np.asarray(T @ P)
+        peak_at = lambda b: np.maximum(np.maximum(P[b - 1], P[b]), P[b + 1])
+        fund = peak_at(f0_bin)
+        ghost = np.zeros(s.shape, dtype=bool)
+        for TL, G, lb, valid in ghosts:
+            # X is the d-th harmonic of L only if L itself sounds, with its own fundamental, and
+            # explains more than X does; a fifth or a third above a real note is left alone
+            fl = peak_at(lb)
+            ghost |= (valid[:, None] & (fl > 0.0) & (np.asarray(TL @ P) > s)
+                      & (np.asarray(G @ P) > GHOST_RATIO * s))
+        s[(fund <= 0.0) | ghost] = 0.0
+        # low notes are only a bin or two apart: keep the best of adjacent semitones
+        nb = np.zeros_like(s)
+        nb[1:] = s[:-1]
+        nb[:-1] = np.maximum(nb[:-1], s[1:])
+        s[s < nb] = 0.0
+        sal[:, i0:i1] = s
+        if progress is not None:
+            progress(i1 / n_frames)
+
+    top = float(np.percentile(sal[sal > 0], 99.5)) if np.any(sal > 0) else 0.0
+    if top <= 0.0:
+        return []
+    sal /= top
+    sal = ndimage.median_filter(sal, size=(1, 3))
+    # within a frame, keep notes close to the strongest one (drops weak harmonics' echoes)
+    sal[sal < 0.25 * sal.max(axis=0, keepdims=True)] = 0.0
+
+    # hysteresis: runs above `off` that reach `on` somewhere
+    labels, n = ndimage.label(sal > off, structure=[[0, 0, 0], [1, 1, 1], [0, 0, 0]])
+    if n == 0:
+        return []
+    idx = np.arange(1, n + 1)
+    peak = np.asarray(ndimage.maximum(sal, labels, idx))
+    slices = ndimage.find_objects(labels)
+
+    t_of = lambda k: (k * hop + nperseg / 2) / sr
+    events = []
+    for lab, pk, sl in zip(idx, peak, slices):
+        if pk < on or sl is None:
+            continue
+        row, cols = sl[0].start, sl[1]
+        onset, offset = t_of(cols.start), t_of(cols.stop - 1)
+        if offset - onset < min_dur:
+            continue
+        events.append(NoteEvent(float(onset), float(offset), int(midis[row]), float(min(1.0, pk))))
+    events.sort(key=lambda e: (e.onset, e.midi))
+    return events
+
+def _job(y, sr, q, kwargs):
+    try:
+        events = transcribe(y, sr, progress=lambda f: q.put(("progress", f)), **kwargs)
+        q.put(("done", events))
+    except Exception as e:
+        q.put(("error", str(e)))
+
+class TranscriptionJob:
+    # transcribe() in a separate process; the UI polls messages from a timer
+    def __init__(self, y: np.ndarray, sr: int, **kwargs):
+        # spawn: forking a process that runs Qt and audio threads can deadlock the child
+        ctx = mp.get_context("spawn")
+        self._q = ctx.Queue()
+        self._proc = ctx.Process(target=_job, args=(y, int(sr), self._q, kwargs), daemon=True)
+        self._proc.start()
+        self.progress = 0.0
+        self.events = None
+        self.error = None
+
+    @property
+    def done(self) -> bool:
+        return self.events is not None or self.error is not None
+
+    def poll(self) -> bool:
+        # True once finished (events or error set)
+        alive = self._proc.is_alive()
+        while not self.done:
+            try:
+                # a finished process may still have its last message in the pipe
+                kind, val = self._q.get(timeout=0.5) if not alive else self._q.get_nowait()
+            except queue.Empty:
+                if not alive:
+                    self.error = "transcription process died"
+                break
+            if kind == "progress":
+                self.progress = float(val)
+            elif kind == "done":
+                self.events = val
+            else:
+                self.error = val
+        if self.done:
+            self._proc.join(timeout=0.1)
+        return self.done
+
+    def cancel(self):
+        if self._proc.is_alive():
+            self._proc.terminate()
+        self._proc.join(timeout=1.0)
@@ -0,0 +1,89 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+from tab_spectro.audio.synth import _pluck
+from tab_spectro.guitar.theory import midi_to_freq
+
+# Pre-rendered plucks for the fretboard notes, so playing a chord is only a mix.
+
+class VoiceCache:
+    def __init__(self, sr: int = 44100, dur: float = 1.2, variants: int = 3, max_notes: int = 64, workers: int = 2):
+        self.sr = int(sr)
+        self.dur = float(dur)
+        self.variants = max(1, int(variants))
+        self.max_notes = max(1, int(max_notes))
+
+        self._voices = OrderedDict()  # midi -> list of raw plucks, LRU order
+        self._notes = None  # midis worth keeping, None = any
+        self._pending = {}  # midi -> Future
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="voice-cache")
+
+    def _render(self, midi: int):
+        f = midi_to_freq(midi)
+        return [_pluck(f, self.sr, self.dur) for _ in range(self.variants)]
+
+    def _render_and_store(self, midi: int):
+        voices = self._render(midi)
+        with self._lock:
+            self._pending.pop(midi, None)
+            if self._notes is None or midi in self._notes:
+                self._store(midi, voices)
+        return voices
+
+    def _store(self, midi: int, voices):
+        self._voices[midi] = voices
+        self._voices.move_to_end(midi)
+        while len(self._voices) > self.max_notes:
+            self._voices.popitem(last=False)
+
+    def warm(self, midis):
+        with self._lock:
+            for m in dict.fromkeys(int(m) for m in midis):
+                if m in self._voices or m in self._pending:
+                    continue
+                try:
+                    self._pending[m] = self._pool.submit(self._render_and_store, m)
+                except RuntimeError:  # pool already shut down
+                    return
+
+    def set_notes(self, midis):
+        # e.g. tuning changed: forget what is no longer on the fretboard, render the rest
+        keep = set(int(m) for m in midis)
+        with self._lock:
+            self._notes = keep
+            for m in [m for m in self._voices if m not in keep]:
+                del self._voices[m]
+            for m in [m for m in self._pending if m not in keep]:
+                self._pending.pop(m).cancel()
+        self.warm(midis)
+
+    def peek(self, midi: int):
+        # non-blocking: None if the note is not rendered yet
+        with self._lock:
+            voices = self._voices.get(int(midi))
+            if voices is not None:
+                self._voices.move_to_end(int(midi))
+            return voices
+
+    def voices(self, midi: int):
+        midi = int(midi)
+        with self._lock:
+            voices = self._voices.get(midi)
+            if voices is not None:
+                self._voices.move_to_end(midi)
+                return voices
+            fut = self._pending.get(midi)
+        if fut is not None:
+            try:
+                return fut.result()
+            except CancelledError:
+                pass
+        voices = self._render(midi)
+        with self._lock:
+            self._store(midi, voices)
+        return voices
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,191 @@
+import threading
+from abc import ABC, abstractmethod
+
+import sounddevice as sd
+import numpy as np
+from scipy.signal import lfilter
+from tab_spectro.audio.synth import _ks_excitation, _ks_filter, _jitter
+from tab_spectro.guitar.theory import midi_to_freq
+
+# Real-time polyphonic output: voices are rendered block by block in the stream callback,
+# on their own stream, so they mix over file playback instead of cutting it.
+
+class _Voice(ABC):
+    def __init__(self, sr: int, dur: float, delay: int, gain: float):
+        self.n_total = max(1, int(sr * dur))
+        self.pos = -int(delay)  # < 0 while waiting for the strum offset
+        self.gain = float(gain)
+        self.attack = max(1, int(sr * 0.003))
+        self.release = max(1, min(int(sr * 0.25), self.n_total))
+        self.fade_end = None
+        self.fade_len = 1
+        self.done = False
+
+    def steal(self, n: int):
+        if self.fade_end is None:
+            self.fade_len = max(1, int(n))
+            self.fade_end = max(0, self.pos) + self.fade_len
+
+    def stealing(self) -> bool:
+        return self.fade_end is not None
+
+    @abstractmethod
+    def _source(self, frames: int) -> np.ndarray:
+        # next frames samples of the raw note, before envelope and gain
+        ...
+
+    def render(self, out: np.ndarray):
+        frames = len(out)
+        skip = min(frames, max(0, -self.pos))
+        self.pos += skip
+        m = frames - skip
+        if m <= 0:
+            return
+
+        end = self.n_total if self.fade_end is None else min(self.n_total, self.fade_end)
+        m = min(m, end - self.pos)
+        if m <= 0:
+            self.done = True
+            return
+
+        t = self.pos + np.arange(m, dtype=np.float64)
+        env = np.minimum(1.0, t / self.attack)
+        env *= np.clip((self.n_total - t) / self.release, 0.0, 1.0)
+        if self.fade_end is not None:
+            env *= np.clip((self.fade_end - t) / self.fade_len, 0.0, 1.0)
+
+        out[skip:skip + m] += self.gain * env * self._source(m)
+        self.pos += m
+        if self.pos >= end:
+            self.done = True
+
+class KarplusStrongVoice(_Voice):
+    def __init__(self, midi: int, sr: int, dur: float, delay: int = 0, gain: float = 0.24,
+                 pick: float = 0.10, decay: float = 0.9989, damp: float = 0.54, brightness: float = 0.24):
+        super().__init__(sr, dur, delay, gain)
+        p = _jitter(pick, decay, damp, brightness)
+        N = max(2, int(sr / max(20.0, midi_to_freq(midi))))
+        self._line = _ks_excitation(N, p["pick"]).astype(np.float64)  # last N samples of the string
+        self._b, self._a = _ks_filter(0.5 * p["decay"], float(np.clip(p["damp"], 0.0, 1.0)),
+                                      float(np.clip(p["brightness"], 0.0, 1.0)))
+        self._zi = np.zeros(1, dtype=np.float64)
+        # _karplus_strong scales the whole note to a peak of 1, and that peak is in the first
+        # period (the string only loses energy): render two periods ahead and scale the same way
+        self._head = self._render(min(self.n_total, 2 * (N - 1)))
+        self._scale = 1.0 / (float(np.max(np.abs(self._head))) + 1e-9)
+
+    def _source(self, frames: int) -> np.ndarray:
+        head, self._head = self._head[:frames], self._head[frames:]
+        if len(head) < frames:
+            head = np.concatenate((head, self._render(frames - len(head))))
+        return head * self._scale
+
+    def _render(self, frames: int) -> np.ndarray:
+        # same recursion as _karplus_strong, one delay-line period (N-1 samples) at a time
+        L = len(self._line) - 1
+        out = np.empty(frames, dtype=np.float64)
+        pos = 0
+        while pos < frames:
+            m = min(L, frames - pos)
+            y, self._zi = lfilter(self._b, self._a, self._line[:m] + self._line[1:m + 1], zi=self._zi)
+            self._line = np.concatenate((self._line[m:], y))
+            out[pos:pos + m] = y
+            pos += m
+        return out
+
+class BufferVoice(_Voice):
+    def __init__(self, x: np.ndarray, sr: int, dur: float, delay: int = 0, gain: float = 0.24):
+        super().__init__(sr, min(dur, len(x) / sr), delay, gain)
+        self._x = x
+        self._i = 0
+
+    def _source(self, frames: int) -> np.ndarray:
+        x = self._x[self._i:self._i + frames]
+        self._i += frames
+        return x
+
+class VoiceMixer:
+    def __init__(self, sr: int = 44100, blocksize: int = 256, max_voices: int = 12, cache=None):
+        self.sr = int(sr)
+        self.blocksize = int(blocksize)
+        self.max_voices = max(1, int(max_voices))
+        self.cache = cache  # optional VoiceCache: ready notes play pre-rendered plucks
+        self.steal_time = 0.008
+
+        self._voices = []
+        self._lock = threading.Lock()
+        self._out_stream = None
+        self._lp_zi = np.zeros(1, dtype=np.float64)
+
+    def _callback(self, outdata, frames, time_info, status):
+        mix = np.zeros(frames, dtype=np.float64)
+        with self._lock:
+            voices = list(self._voices)
+        for v in voices:
+            v.render(mix)
+        with self._lock:
+            self._voices = [v for v in self._voices if not v.done]
+
+        # soft low-pass (nylon vibe), same as synth_chord
+        a = 0.88
+        lp, self._lp_zi = lfilter([1.0 - a], [1.0, -a], mix, zi=self._lp_zi)
+        mix = lp + 0.18 * (mix - lp)
+        outdata[:, 0] = np.clip(mix, -0.98, 0.98)
+
+    def start(self):
+        if self._out_stream is not None:
+            return
+        self._out_stream = sd.OutputStream(
+            samplerate=self.sr, channels=1, dtype="float32",
+            callback=self._callback, blocksize=self.blocksize
+        )
+        self._out_stream.start()
+
+    def _add(self, voices):
+        with self._lock:
+            live = [v for v in self._voices if not v.stealing()]
+            # polyphony cap: fade the oldest voices out
+            for v in live[:max(0, len(live) + len(voices) - self.max_voices)]:
+                v.steal(self.sr * self.steal_time)
+            self._voices.extend(voices[-self.max_voices:])
+            # hard limit, in case notes come faster than the fades finish
+            if len(self._voices) > 2 * self.max_voices:
+                self._voices = self._voices[-2 * self.max_voices:]
+
+    def _make_voice(self, midi: int, dur: float, delay: float, gain: float) -> _Voice:
+        delay_n = int(self.sr * max(0.0, delay))
+        variants = self.cache.peek(midi) if self.cache is not None else None
+        if variants:
+            x = variants[np.random.randint(len(variants))]
+            return BufferVoice(x, self.sr, dur, delay=delay_n, gain=gain)
+        return KarplusStrongVoice(int(midi), self.sr, dur, delay=delay_n, gain=gain)
+
+    def note_on(self, midi: int, dur: float = 1.2, delay: float = 0.0, gain: float = 0.24):
+        self.start()
+        self._add([self._make_voice(midi, dur, delay, gain)])
+
+    def play_chord(self, midis, dur: float = 1.0, strum: float = 0.010, gain: float = 0.24):
+        midis = sorted(dict.fromkeys([int(m) for m in (midis or []) if m is not None]))
+        if not midis:
+            return
+        self.start()
+        # same levels and strum spread as synth_chord
+        voice_gain = gain / max(1.0, len(midis) * 0.85)
+        delays = np.linspace(0.0, strum, num=len(midis))
+        self._add([self._make_voice(m, dur, float(d), voice_gain) for m, d in zip(midis, delays)])
+
+    def all_notes_off(self):
+        with self._lock:
+            for v in self._voices:
+                v.steal(self.sr * self.steal_time)
+
+    def stop(self):
+        with self._lock:
+            self._voices = []
+        try:
+            if self._out_stream:
+                self._out_stream.stop()
+                self._out_stream.close()
+        except Exception:
+            pass
+        self._out_stream = None
@@ -0,0 +1,52 @@
+import numpy as np
+
+# Min/max pyramid of a signal for the waveform overview: level 0 holds the min and max of
+# every block of `base` samples (one reshape pass over y), each next level merges `factor`
+# blocks of the previous one. An envelope of n pixels reads the coarsest level that still has
+# a few blocks per pixel, so it costs O(n * factor) whatever the length of the track.
+
+class MinMaxPyramid:
+    def __init__(self, y: np.ndarray, base: int = 64, factor: int = 4):
+        self.base = int(base)
+        self.factor = int(factor)
+        self.n_samples = len(y)
+        self.levels = []  # (mins, maxs) per level, block size base * factor**k
+        if len(y) == 0:
+            return
+        n = len(y) // self.base * self.base
+        blocks = y[:n].reshape(-1, self.base)
+        lo, hi = blocks.min(axis=1), blocks.max(axis=1)
+        if n < len(y):
+            lo = np.append(lo, y[n:].min())
+            hi = np.append(hi, y[n:].max())
+        self.levels.append((lo, hi))
+        while len(lo) > 1:
+            pad = -len(lo) % self.factor
+            # edge padding leaves the last block's min/max unchanged
+            lo = np.pad(lo, (0, pad), mode="edge").reshape(-1, self.factor).min(axis=1)
+            hi = np.pad(hi, (0, pad), mode="edge").reshape(-1, self.factor).max(axis=1)
+            self.levels.append((lo, hi))
+
+    def envelope(self, i0: int, i1: int, n: int):
+        # (mins, maxs) of samples i0..i1 split in n columns
+        n = max(1, int(n))
+        if not self.levels:
+            return np.zeros(n, dtype=np.float32), np.zeros(n, dtype=np.float32)
+        i0 = int(np.clip(i0, 0, self.n_samples - 1))
+        i1 = int(np.clip(i1, i0 + 1, self.n_samples))
+        per_px = (i1 - i0) / n
+        k = 0
+        while k + 1 < len(self.levels) and self.base * self.factor ** (k + 1) <= per_px:
+            k += 1
+        size = self.base * self.factor ** k
+        lo, hi = self.levels[k]
+        edges = np.linspace(i0, i1, n + 1) / size
+        start = np.minimum(edges[:-1].astype(np.intp), len(lo) - 1)
+        # blocks touching the column, at least one (neighbouring columns share it when zoomed in)
+        stop = np.clip(np.ceil(edges[1:]).astype(np.intp), start + 1, len(lo))
+        # reduceat over interleaved (start, stop) pairs: even outputs are the columns. The extra
+        # last block keeps every index inside the array.
+        idx = np.empty(2 * n, dtype=np.intp)
+        idx[0::2], idx[1::2] = start, stop
+        lo, hi = np.append(lo, lo[-1]), np.append(hi, hi[-1])
+        return np.minimum.reduceat(lo, idx)[0::2], np.maximum.reduceat(hi, idx)[0::2]
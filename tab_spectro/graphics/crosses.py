@@ -0,0 +1,81 @@
+import numpy as np
+import pyqtgraph as pg
+from PySide6 import QtCore, QtGui
+
+class CrossesItem(pg.GraphicsObject):
+    # All the crosses as "x" marks of a fixed pixel size (black outline under a white stroke),
+    # plus a ring on the selected one. setData takes the store's arrays as they are (no per-point
+    # records to rebuild); paint draws the visible ones in two drawLines calls.
+    def __init__(self, size: float = 11.0):
+        super().__init__()
+        self._half = float(size) / 2.0
+        self._t = np.zeros(0)
+        self._f = np.zeros(0)
+        self._sel = None
+        self._rect = QtCore.QRectF()
+
+        self._outline = QtGui.QPen(QtGui.QColor(0, 0, 0, 235))
+        self._outline.setWidthF(4.0)
+        self._inner = QtGui.QPen(QtGui.QColor(255, 255, 255, 235))
+        self._inner.setWidthF(2.0)
+        self._ring = QtGui.QPen(QtGui.QColor(255, 220, 0, 235))
+        self._ring.setWidthF(2.0)
+        for pen in (self._outline, self._inner, self._ring):
+            pen.setCosmetic(True)
+
+    def setData(self, t, f):
+        self._t = np.asarray(t, dtype=np.float64)
+        self._f = np.asarray(f, dtype=np.float64)
+        if self._sel is not None and self._sel >= len(self._t):
+            self._sel = None
+        self.prepareGeometryChange()
+        if len(self._t):
+            t0, t1 = float(self._t.min()), float(self._t.max())
+            f0, f1 = float(self._f.min()), float(self._f.max())
+            self._rect = QtCore.QRectF(t0, f0, t1 - t0, f1 - f0)
+        else:
+            self._rect = QtCore.QRectF()
+        self.update()
+
+    def setSelected(self, i):
+        self._sel = None if i is None else int(i)
+        self.update()
+
+    def clear(self):
+        self._sel = None
+        self.setData([], [])
+
+    def dataBounds(self, axis, frac=1.0, orthoRange=None):
+        return None
+
+    def boundingRect(self):
+        if len(self._t) == 0:
+            return QtCore.QRectF()
+        px = self.pixelWidth() or 0.0
+        py = self.pixelHeight() or 0.0
+        pad = 2.0 * self._half
+        return self._rect.adjusted(-pad * px, -pad * py, pad * px, pad * py)
+
+    def paint(self, p, *args):
+        vb = self.getViewBox()
+        if vb is None or len(self._t) == 0:
+            return
+        vr = vb.viewRect()
+        px, py = vb.viewPixelSize()
+        dx, dy = self._half * px, self._half * py
+        vis = np.flatnonzero((self._t >= vr.left() - dx) & (self._t <= vr.right() + dx)
+                             & (self._f >= vr.top() - dy) & (self._f <= vr.bottom() + dy))
+        lines = []
+        for t, f in zip(self._t[vis].tolist(), self._f[vis].tolist()):
+            lines.append(QtCore.QLineF(t - dx, f - dy, t + dx, f + dy))
+            lines.append(QtCore.QLineF(t - dx, f + dy, t + dx, f - dy))
+        if lines:
+            p.setPen(self._outline)
+            p.drawLines(lines)
+            p.setPen(self._inner)
+            p.drawLines(lines)
+        if self._sel is not None:
+            p.setPen(self._ring)
+            p.setBrush(QtCore.Qt.BrushStyle.NoBrush)
+            c = QtCore.QPointF(float(self._t[self._sel]), float(self._f[self._sel]))
+            p.drawEllipse(c, 1.7 * dx, 1.7 * dy)
@@ -0,0 +1,64 @@
+import numpy as np
+import pyqtgraph as pg
+from PySide6 import QtCore, QtGui
+
+class HLinesItem(pg.GraphicsObject):
+    # Many full-width horizontal lines in one item: updating them is one setData + one repaint,
+    # instead of adding/removing an InfiniteLine per line in the scene. Each line has a level in
+    # 0..1 that picks one of `steps` pens from lo_color to hi_color (RGBA), built once here.
+    def __init__(self, width: float = 1.0, lo_color=(255, 255, 255, 110), hi_color=(255, 255, 255, 230),
+                 steps: int = 16):
+        super().__init__()
+        self._width = float(width)
+        self._ys = np.zeros(0, dtype=np.float64)
+        self._levels = np.zeros(0, dtype=np.intp)
+        self._pens = []
+        lo, hi = np.asarray(lo_color, dtype=np.float64), np.asarray(hi_color, dtype=np.float64)
+        for k in np.linspace(0.0, 1.0, max(2, int(steps))):
+            pen = QtGui.QPen(QtGui.QColor(*np.round(lo + k * (hi - lo)).astype(int).tolist()))
+            pen.setWidthF(self._width)
+            pen.setCosmetic(True)
+            pen.setCapStyle(QtCore.Qt.PenCapStyle.FlatCap)
+            self._pens.append(pen)
+
+    def setData(self, ys, levels):
+        # levels: 0..1 per y
+        self._ys = np.asarray(ys, dtype=np.float64)
+        n = len(self._pens) - 1
+        self._levels = np.round(np.clip(np.asarray(levels, dtype=np.float64), 0.0, 1.0) * n).astype(np.intp)
+        self.prepareGeometryChange()
+        self.update()
+
+    def clear(self):
+        self.setData([], [])
+
+    def dataBounds(self, axis, frac=1.0, orthoRange=None):
+        # never drive auto-range
+        return None
+
+    def viewRangeChanged(self):
+        self.prepareGeometryChange()
+
+    def boundingRect(self):
+        vb = self.getViewBox()
+        if vb is None or len(self._ys) == 0:
+            return QtCore.QRectF()
+        vr = vb.viewRect()
+        px = self.pixelHeight() or 0.0
+        pad = px * self._width
+        y0 = float(self._ys.min()) - pad
+        y1 = float(self._ys.max()) + pad
+        return QtCore.QRectF(vr.left(), y0, vr.width(), y1 - y0)
+
+    def paint(self, p, *args):
+        if len(self._ys) == 0:
+            return
+        vb = self.getViewBox()
+        if vb is None:
+            return
+        vr = vb.viewRect()
+        x0, x1 = vr.left(), vr.right()
+        # weakest first, so the strong lines end up on top; one drawLines call per level
+        for k in np.unique(self._levels).tolist():
+            p.setPen(self._pens[k])
+            p.drawLines([QtCore.QLineF(x0, y, x1, y) for y in self._ys[self._levels == k].tolist()])
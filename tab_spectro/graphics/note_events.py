@@ -0,0 +1,98 @@
+import numpy as np
+import pyqtgraph as pg
+from PySide6 import QtCore, QtGui
+
+class NoteEventsItem(pg.GraphicsObject):
+    # Transcribed notes as horizontal bars (onset -> offset at the note frequency), one item
+    # for all of them; opacity follows the strength. The selected bar gets a yellow outline.
+    def __init__(self, width: float = 5.0, color=(255, 60, 200)):
+        super().__init__()
+        self._width = float(width)
+        self._color = QtGui.QColor(*color)
+        self._t0 = np.zeros(0)
+        self._t1 = np.zeros(0)
+        self._f = np.zeros(0)
+        self._alpha = np.zeros(0, dtype=int)
+        self._sel = None
+        self._rect = QtCore.QRectF()
+        self._sel_pen = QtGui.QPen(QtGui.QColor(255, 220, 0, 235))
+        self._sel_pen.setWidthF(self._width + 4.0)
+        self._sel_pen.setCosmetic(True)
+
+    def setData(self, onsets, offsets, freqs, strengths):
+        self._t0 = np.asarray(onsets, dtype=np.float64)
+        self._t1 = np.asarray(offsets, dtype=np.float64)
+        self._f = np.asarray(freqs, dtype=np.float64)
+        self._alpha = np.round(90 + 165 * np.clip(np.asarray(strengths, dtype=np.float64), 0.0, 1.0)).astype(int)
+        if self._sel is not None and self._sel >= len(self._f):
+            self._sel = None
+        self.prepareGeometryChange()
+        if len(self._f):
+            self._rect = QtCore.QRectF(float(self._t0.min()), float(self._f.min()),
+                                       float(self._t1.max() - self._t0.min()), float(self._f.max() - self._f.min()))
+        else:
+            self._rect = QtCore.QRectF()
+        self.update()
+
+    def setSelected(self, i):
+        self._sel = None if i is None else int(i)
+        self.update()
+
+    def clear(self):
+        self._sel = None
+        self.setData([], [], [], [])
+
+    def index_at(self, t: float, f: float, tol_t: float, tol_f: float):
+        # nearest bar under (t, f), None if there is none
+        if len(self._f) == 0:
+            return None
+        dt = np.maximum(np.maximum(self._t0 - t, t - self._t1), 0.0) / max(tol_t, 1e-9)
+        df = np.abs(self._f - f) / max(tol_f, 1e-9)
+        d = np.maximum(dt, df)
+        i = int(np.argmin(d))
+        return i if d[i] <= 1.0 else None
+
+    def end_at(self, t: float, f: float, tol_t: float, tol_f: float):
+        # (index, "onset" | "offset") of the nearest bar end under (t, f), None if there is none
+        if len(self._f) == 0:
+            return None
+        df = np.abs(self._f - f) / max(tol_f, 1e-9)
+        d0 = np.maximum(np.abs(self._t0 - t) / max(tol_t, 1e-9), df)
+        d1 = np.maximum(np.abs(self._t1 - t) / max(tol_t, 1e-9), df)
+        i0, i1 = int(np.argmin(d0)), int(np.argmin(d1))
+        if min(d0[i0], d1[i1]) > 1.0:
+            return None
+        return (i0, "onset") if d0[i0] <= d1[i1] else (i1, "offset")
+
+    def dataBounds(self, axis, frac=1.0, orthoRange=None):
+        return None
+
+    def boundingRect(self):
+        if self._rect.isNull():
+            return QtCore.QRectF()
+        pad = (self.pixelHeight() or 0.0) * (self._width + 4.0)
+        return self._rect.adjusted(0.0, -pad, 0.0, pad)
+
+    def paint(self, p, *args):
+        if len(self._f) == 0:
+            return
+        vb = self.getViewBox()
+        if vb is None:
+            return
+        vr = vb.viewRect()
+        vis = np.flatnonzero((self._t1 >= vr.left()) & (self._t0 <= vr.right())
+                             & (self._f >= vr.top()) & (self._f <= vr.bottom()))
+        pen = QtGui.QPen(self._color)
+        pen.setWidthF(self._width)
+        pen.setCosmetic(True)
+        pen.setCapStyle(QtCore.Qt.PenCapStyle.FlatCap)
+        if self._sel is not None:
+            i = self._sel
+            p.setPen(self._sel_pen)
+            p.drawLine(QtCore.QPointF(self._t0[i], self._f[i]), QtCore.QPointF(self._t1[i], self._f[i]))
+        for i in vis.tolist():
+            c = QtGui.QColor(self._color)
+            c.setAlpha(int(self._alpha[i]))
+            pen.setColor(c)
+            p.setPen(pen)
+            p.drawLine(QtCore.QPointF(self._t0[i], self._f[i]), QtCore.QPointF(self._t1[i], self._f[i]))
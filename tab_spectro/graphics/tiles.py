@@ -0,0 +1,50 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from tab_spectro.audio.spectrogram import render_region_to_u8
+
+# Display images (u8, LUT index) of whole spectrograms, shared by every pane. Each image is
+# converted in blocks of rows x columns the first time a view needs them, so panning over an
+# area already seen, or a second pane on the same analysis, only slices. Images never written
+# are np.empty, i.e. untouched pages: memory follows what has been looked at.
+
+class TileCache:
+    def __init__(self, block_rows: int = 1024, block_cols: int = 256, max_bytes: int = 768 << 20):
+        self.block_rows = int(block_rows)
+        self.block_cols = int(block_cols)
+        self.max_bytes = int(max_bytes)
+        self._entries = OrderedDict()  # key -> (u8 image, done mask per block)
+
+    def clear(self):
+        self._entries.clear()
+
+    def retain(self, keep):
+        # drop the images whose key fails keep(key)
+        for key in [k for k in self._entries if not keep(k)]:
+            del self._entries[key]
+
+    def _entry(self, key, shape):
+        e = self._entries.get(key)
+        if e is None or e[0].shape != shape:
+            nb = (-(-shape[0] // self.block_rows), -(-shape[1] // self.block_cols))
+            e = (np.empty(shape, dtype=np.uint8), np.zeros(nb, dtype=bool))
+            self._entries[key] = e
+            # least recently used images go first (counted as if fully converted)
+            while len(self._entries) > 1 and sum(v[0].nbytes for v in self._entries.values()) > self.max_bytes:
+                self._entries.popitem(last=False)
+        self._entries.move_to_end(key)
+        return e
+
+    def image(self, key, shape, source, rows: slice, cols: slice, vmin: float, vmax: float, gamma: float):
+        # u8 image of the key with rows/cols converted; source(r0, r1, c0, c1) -> dB block
+        img, done = self._entry(key, tuple(shape))
+        br, bc = self.block_rows, self.block_cols
+        rb0, rb1 = rows.start // br, -(-rows.stop // br)
+        cb0, cb1 = cols.start // bc, -(-cols.stop // bc)
+        for i, j in zip(*np.nonzero(~done[rb0:rb1, cb0:cb1])):
+            r0, c0 = (rb0 + i) * br, (cb0 + j) * bc
+            r1, c1 = min(r0 + br, shape[0]), min(c0 + bc, shape[1])
+            img[r0:r1, c0:c1] = render_region_to_u8(source(r0, r1, c0, c1), vmin, vmax, gamma=gamma)
+            done[rb0 + i, cb0 + j] = True
+        return img
@@ -0,0 +1,64 @@
+import numpy as np
+import pyqtgraph as pg
+from PySide6 import QtCore, QtGui
+
+class VLinesItem(pg.GraphicsObject):
+    # Full-height vertical lines at sorted x positions (onsets, beats), one item. Lines flagged
+    # `strong` (bar lines) get a second pen. Only the lines inside the view are drawn
+    # (searchsorted on the sorted xs), in one drawLines call per pen.
+    def __init__(self, color=(255, 255, 255, 70), width: float = 1.0, strong_color=None, strong_width: float = 2.0):
+        super().__init__()
+        self._xs = np.zeros(0, dtype=np.float64)
+        self._strong = np.zeros(0, dtype=bool)
+        self._pen = QtGui.QPen(QtGui.QColor(*color))
+        self._pen.setWidthF(float(width))
+        self._pen.setCosmetic(True)
+        self._strong_pen = QtGui.QPen(QtGui.QColor(*(strong_color or color)))
+        self._strong_pen.setWidthF(float(strong_width))
+        self._strong_pen.setCosmetic(True)
+
+    def setData(self, xs, strong=None):
+        xs = np.asarray(xs, dtype=np.float64)
+        order = np.argsort(xs, kind="stable")
+        self._xs = xs[order]
+        self._strong = np.zeros(len(xs), dtype=bool) if strong is None else np.asarray(strong, dtype=bool)[order]
+        self.prepareGeometryChange()
+        self.update()
+
+    def clear(self):
+        self.setData([])
+
+    def dataBounds(self, axis, frac=1.0, orthoRange=None):
+        return None
+
+    def viewRangeChanged(self):
+        self.prepareGeometryChange()
+
+    def boundingRect(self):
+        vb = self.getViewBox()
+        if vb is None or len(self._xs) == 0:
+            return QtCore.QRectF()
+        vr = vb.viewRect()
+        # cosmetic pens are drawn across the line: pad by the widest half-pen and a pixel
+        pad = vb.viewPixelSize()[0] * (1.0 + 0.5 * max(self._pen.widthF(), self._strong_pen.widthF()))
+        x0, x1 = float(self._xs[0]) - pad, float(self._xs[-1]) + pad
+        return QtCore.QRectF(x0, vr.top(), x1 - x0, vr.height())
+
+    def paint(self, p, *args):
+        vb = self.getViewBox()
+        if vb is None or len(self._xs) == 0:
+            return
+        vr = vb.viewRect()
+        i0, i1 = np.searchsorted(self._xs, [vr.left(), vr.right()])
+        xs, strong = self._xs[i0:i1], self._strong[i0:i1]
+        y0, y1 = vr.top(), vr.bottom()
+        # zoomed far out: plain lines closer than ~3 px are noise, keep the strong ones
+        px = vb.viewPixelSize()[0]
+        dense = len(xs) > 1 and (xs[-1] - xs[0]) / (len(xs) - 1) < 3.0 * px
+        for pen, sel in ((self._pen, ~strong), (self._strong_pen, strong)):
+            if pen is self._pen and dense and strong.any():
+                continue
+            lines = [QtCore.QLineF(x, y0, x, y1) for x in xs[sel].tolist()]
+            if lines:
+                p.setPen(pen)
+                p.drawLines(lines)
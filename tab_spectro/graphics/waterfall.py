@@ -0,0 +1,39 @@
+import numpy as np
+import pyqtgraph as pg
+from PySide6 import QtGui
+
+class WaterfallItem(pg.ImageItem):
+    # Scrolling spectrogram: one column per push, stored twice in a 2x wide ring so the
+    # last n_cols columns are always one contiguous slice (no roll, no recompute).
+    def __init__(self, n_rows: int, n_cols: int, lut: np.ndarray):
+        super().__init__()
+        self.setLookupTable(lut)
+        self.n_rows = int(n_rows)
+        self.n_cols = max(2, int(n_cols))
+        self._buf = np.zeros((self.n_rows, 2 * self.n_cols), dtype=np.uint8)
+        self._i = 0
+        self._dirty = True
+
+    def set_axes(self, seconds: float, fmin: float, fmax: float):
+        # x: -seconds..0 (now at the right edge), y: fmin..fmax
+        tr = QtGui.QTransform()
+        tr.translate(-float(seconds), float(fmin))
+        tr.scale(float(seconds) / self.n_cols, (float(fmax) - float(fmin)) / max(1, self.n_rows))
+        self.setTransform(tr)
+
+    def push(self, column: np.ndarray):
+        self._buf[:, self._i] = column
+        self._buf[:, self._i + self.n_cols] = column
+        self._i = (self._i + 1) % self.n_cols
+        self._dirty = True
+
+    def reset(self):
+        self._buf[:] = 0
+        self._i = 0
+        self._dirty = True
+
+    def refresh(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        self.setImage(self._buf[:, self._i:self._i + self.n_cols], autoLevels=False, levels=(0, 255))
@@ -0,0 +1,99 @@
+import numpy as np
+
+# Which string/fret to play each note on: every note has at most one position per string
+# (FretboardTable.positions). Notes closer than chord_dt form a chord, placed as one state:
+# the candidate shapes are the position combinations on distinct strings whose fretted notes
+# fit in max_span frets. A Viterbi pass over the chords (single notes are chords of one)
+# picks the chain with the least hand movement. Notes that fit in no shape with the rest of
+# their chord (more notes than strings, too wide) are played right after it, as the next chord.
+
+def _span(F: np.ndarray) -> np.ndarray:
+    # fret stretch of each shape; open strings don't count
+    hi = np.where(F > 0, F, -1).max(axis=1)
+    lo = np.where(F > 0, F, np.iinfo(F.dtype).max).min(axis=1)
+    return np.where(hi < 0, 0, hi - lo)
+
+def _chord_shapes(positions, max_span: int):
+    # positions: (strings, frets) per note -> (S, F) arrays (shapes x placed notes), placed indices
+    S = np.zeros((1, 0), dtype=np.int64)
+    F = np.zeros((1, 0), dtype=np.int64)
+    placed = []
+    for j, (s, f) in enumerate(positions):
+        n = len(S)
+        S2 = np.concatenate((np.repeat(S, len(s), axis=0), np.tile(s, n)[:, None]), axis=1)
+        F2 = np.concatenate((np.repeat(F, len(f), axis=0), np.tile(f, n)[:, None]), axis=1)
+        ok = (S2[:, :-1] != S2[:, -1:]).all(axis=1) & (_span(F2) <= max_span)
+        if not ok.any():
+            continue
+        S, F = S2[ok], F2[ok]
+        placed.append(j)
+    return S, F, placed
+
+def _hand(F: np.ndarray) -> np.ndarray:
+    # mean fretted position per shape, NaN when every string is open
+    fretted = F > 0
+    count = fretted.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, (F * fretted).sum(axis=1) / count, np.nan)
+
+def _transition(h0, c0, h1, c1, dt: float):
+    # cost of going from each previous shape (rows) to each new one (columns); the longer
+    # the gap, the cheaper a shift. Open shapes don't need the fretting hand.
+    dh = np.nan_to_num(np.abs(h0[:, None] - h1[None, :]), nan=0.0)
+    dc = np.abs(c0[:, None] - c1[None, :])
+    return dh / (1.0 + dt / 0.4) + 0.3 * dc
+
+def _chords(events, chord_dt: float):
+    # groups of event indices, each note within chord_dt of the previous one
+    groups = []
+    t_prev = None
+    for i, (t, _) in enumerate(events):
+        t = float(t)
+        if t_prev is None or t - t_prev >= chord_dt:
+            groups.append([])
+        groups[-1].append(i)
+        t_prev = t
+    return groups
+
+def solve_fingering(events, table, chord_dt: float = 0.03, max_span: int = 4):
+    # events: (t, midi) pairs in time order, table: FretboardTable
+    # -> one (string, fret above the capo) or None (not playable) per event
+    index = table.positions
+    out = [None] * len(events)
+
+    steps = []  # (event indices, S, F, back pointers)
+    cost = None
+    prev = None
+    todo = [[i for i in g if int(events[i][1]) in index] for g in _chords(events, chord_dt)][::-1]
+    while todo:
+        notes = todo.pop()
+        if not notes:
+            continue
+        S, F, placed = _chord_shapes([index[int(events[i][1])] for i in notes], max_span)
+        if len(placed) < len(notes):
+            todo.append([n for j, n in enumerate(notes) if j not in placed])
+        notes = [notes[j] for j in placed]
+        # prefer the lower positions and compact shapes
+        here = 0.05 * F.sum(axis=1) + 0.5 * _span(F)
+        h1, c1 = _hand(F), S.mean(axis=1)
+        t0, t1 = float(events[notes[0]][0]), float(events[notes[-1]][0])
+        if cost is None:
+            cost = here.astype(np.float64)
+            back = None
+        else:
+            h0, c0, t_last = prev
+            total = cost[:, None] + _transition(h0, c0, h1, c1, max(0.0, t0 - t_last))
+            back = np.argmin(total, axis=0)
+            cost = total[back, np.arange(len(S))] + here
+        steps.append((notes, S, F, back))
+        prev = (h1, c1, t1)
+
+    if not steps:
+        return out
+    k = int(np.argmin(cost))
+    for notes, S, F, back in reversed(steps):
+        for j, i in enumerate(notes):
+            out[i] = (int(S[k, j]), int(F[k, j]))
+        if back is not None:
+            k = int(back[k])
+    return out
@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+from tab_spectro.guitar.theory import midi_to_freq, midi_to_name
+
+# Everything the fretboard needs per (tuning, capo, max_fret), computed once:
+# paint, tooltips, chord preview and fingering only do table reads.
+
+@dataclass(frozen=True)
+class FretboardTable:
+    tuning: tuple  # open strings without capo, top -> bottom
+    capo: int
+    max_fret: int  # frets above the capo
+    midi: np.ndarray  # (strings, max_fret + 1)
+    freqs: np.ndarray
+    names: tuple  # names[string][fret]
+    positions: dict  # midi -> (strings, frets) arrays, lowest fret first
+    midis: tuple  # sorted distinct notes on the board
+
+    @property
+    def n_strings(self) -> int:
+        return len(self.tuning)
+
+@lru_cache(maxsize=32)
+def fretboard_table(tuning: tuple, capo: int = 0, max_fret: int = 15) -> FretboardTable:
+    tuning = tuple(int(m) for m in tuning)
+    capo = int(capo)
+    max_fret = int(max_fret)
+
+    midi = np.array(tuning, dtype=np.int64)[:, None] + capo + np.arange(max_fret + 1)[None, :]
+    freqs = np.array([[midi_to_freq(m) for m in row] for row in midi.tolist()], dtype=np.float64)
+    names = tuple(tuple(midi_to_name(m) for m in row) for row in midi.tolist())
+
+    s_idx, f_idx = np.nonzero(midi >= 0)
+    order = np.lexsort((f_idx, midi.ravel()))  # by midi, then fret
+    flat_m = midi.ravel()[order]
+    flat_s, flat_f = s_idx[order], f_idx[order]
+    bounds = np.flatnonzero(np.diff(flat_m)) + 1
+    positions = {
+        int(ms[0]): (ss, ff)
+        for ms, ss, ff in zip(np.split(flat_m, bounds), np.split(flat_s, bounds), np.split(flat_f, bounds))
+    }
+    return FretboardTable(tuning, capo, max_fret, midi, freqs, names, positions, tuple(sorted(positions)))
@@ -1,8 +1,9 @@
 from PySide6 import QtCore, QtWidgets, QtGui
-from tab_spectro.guitar.theory import midi_to_name
-from tab_spectro.audio.synth import play_midis
+from tab_spectro.audio.voice_cache import VoiceCache
+from tab_spectro.audio.voice_mixer import VoiceMixer
 import math
-from tab_spectro.guitar.theory import midi_to_freq, midi_to_name
+from tab_spectro.guitar.fretboard import fretboard_table
+from tab_spectro.utils.settings import TUNINGS, MAX_CAPO
 
 
 class GuitarGridWidget(QtWidgets.QWidget):
@@ -11,15 +12,25 @@ class GuitarGridWidget(QtWidgets.QWidget):
         self.setMinimumSize(900, 260)
 
         # Standard tuning MIDI, top->bottom: E4 B3 G3 D3 A2 E2
-        self.tuning_midi = [64, 59, 55, 50, 45, 40]
+        self.tuning_name = TUNINGS[0].name
+        self.tuning_midi = list(TUNINGS[0].midis)
+        self.capo = 0
         self.max_fret = 15
+        self.table = fretboard_table(tuple(self.tuning_midi), self.capo, self.max_fret)
 
         self.selected_midis = []
+        self.fingering = set()  # suggested (string, fret) cells, see guitar/fingering.py
         self.midi_to_color = {}
 
         self._show_note_text = True
         self._dark_theme = True
 
+        # static layer (background, frets, strings, note names), see _render_board
+        self._board = None
+        self._title_font = QtGui.QFont("Segoe UI", 12, QtGui.QFont.Weight.DemiBold)
+        self._fret_font = QtGui.QFont("Segoe UI", 9)
+        self._note_font = QtGui.QFont("Segoe UI", 8)
+
         self.setMouseTracking(True)
         self._hover_timer = QtCore.QTimer(self)
         self._hover_timer.setSingleShot(True)
@@ -31,19 +42,11 @@ class GuitarGridWidget(QtWidgets.QWidget):
 
 
     def _cell_at_pos(self, pos: QtCore.QPointF):
-        rect = self.rect()
-        margin = 18
-        title_h = 32
-        inner = QtCore.QRectF(
-            rect.left() + margin,
-            rect.top() + margin + title_h,
-            rect.width() - 2 * margin,
-            rect.height() - 2 * margin - title_h
-        )
+        inner = self._inner_rect()
         if not inner.contains(pos):
             return None
 
-        strings = 6
+        strings = self.table.n_strings
         frets = self.max_fret + 1
 
         cell_w = inner.width() / frets
@@ -84,9 +87,8 @@ class GuitarGridWidget(QtWidgets.QWidget):
         if self._hover_cell is None or self._hover_global_pos is None:
             return
         s, f = self._hover_cell
-        midi = self._midi_at(s, f)
-        name = midi_to_name(midi)
-        hz = midi_to_freq(midi)
+        name = self.table.names[s][f]
+        hz = float(self.table.freqs[s, f])
 
         QtWidgets.QToolTip.showText(
             self._hover_global_pos,
@@ -96,19 +98,41 @@ class GuitarGridWidget(QtWidgets.QWidget):
 
 
     def set_selected_midis(self, midis):
-        self.selected_midis = list(dict.fromkeys(midis or []))
+        midis = list(dict.fromkeys(midis or []))
+        if midis == self.selected_midis:
+            return
+        self.selected_midis = midis
+        self.update()
+
+    def set_fingering(self, positions):
+        cells = {p for p in (positions or []) if p is not None}
+        if cells == self.fingering:
+            return
+        self.fingering = cells
         self.update()
 
     def set_show_note_text(self, on: bool):
         self._show_note_text = bool(on)
-        self.update()
+        self._invalidate_board()
 
     def set_dark_theme(self, on: bool):
         self._dark_theme = bool(on)
-        self.update()
+        self._invalidate_board()
+
+    def set_tuning(self, name: str, midis, capo: int = 0):
+        # frets are counted from the capo; the lookup tables are cached per tuning/capo
+        self.tuning_name = name
+        self.tuning_midi = [int(m) for m in midis]
+        self.capo = max(0, min(int(capo), MAX_CAPO))
+        self.table = fretboard_table(tuple(self.tuning_midi), self.capo, self.max_fret)
+        self.fingering = set()
+        self._invalidate_board()
 
     def _midi_at(self, string_idx: int, fret: int) -> int:
-        return self.tuning_midi[string_idx] + fret
+        return int(self.table.midi[string_idx, fret])
+
+    def cell_midis(self):
+        return list(self.table.midis)
 
     def _color_for_midi(self, m: int) -> QtGui.QColor:
         if m in self.midi_to_color:
@@ -125,8 +149,32 @@ class GuitarGridWidget(QtWidgets.QWidget):
         self.midi_to_color[m] = c
         return c
 
-    def paintEvent(self, e):
-        p = QtGui.QPainter(self)
+    def _inner_rect(self) -> QtCore.QRectF:
+        rect = self.rect()
+        margin = 18
+        title_h = 32
+        return QtCore.QRectF(
+            rect.left() + margin,
+            rect.top() + margin + title_h,
+            rect.width() - 2 * margin,
+            rect.height() - 2 * margin - title_h
+        )
+
+    def _invalidate_board(self):
+        self._board = None
+        self.update()
+
+    def resizeEvent(self, e):
+        self._board = None
+        super().resizeEvent(e)
+
+    def _render_board(self) -> QtGui.QPixmap:
+        # everything but the selected notes: only redrawn on resize / theme / note text change
+        dpr = self.devicePixelRatioF()
+        pm = QtGui.QPixmap(int(math.ceil(self.width() * dpr)), int(math.ceil(self.height() * dpr)))
+        pm.setDevicePixelRatio(dpr)
+
+        p = QtGui.QPainter(pm)
         p.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing, True)
         rect = self.rect()
 
@@ -142,21 +190,16 @@ class GuitarGridWidget(QtWidgets.QWidget):
 
         margin = 18
         title_h = 32
-        inner = QtCore.QRectF(
-            rect.left() + margin,
-            rect.top() + margin + title_h,
-            rect.width() - 2 * margin,
-            rect.height() - 2 * margin - title_h
-        )
+        inner = self._inner_rect()
 
-        title_font = QtGui.QFont("Segoe UI", 12, QtGui.QFont.Weight.DemiBold)
-        p.setFont(title_font)
+        p.setFont(self._title_font)
         p.setPen(QtGui.QColor(245, 245, 245) if self._dark_theme else QtGui.QColor(25, 25, 25))
         p.drawText(QtCore.QRectF(rect.left()+margin, rect.top()+margin, rect.width()-2*margin, title_h),
                    QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter,
-                   "Guitar View — Fretboard (Standard tuning)")
+                   f"Guitar View — Fretboard ({self.tuning_name} tuning"
+                   + (f", capo {self.capo})" if self.capo else ")"))
 
-        strings = 6
+        strings = self.table.n_strings
         frets = self.max_fret + 1
 
         cell_w = inner.width() / frets
@@ -182,48 +225,70 @@ class GuitarGridWidget(QtWidgets.QWidget):
             p.drawLine(QtCore.QPointF(inner.left(), y), QtCore.QPointF(inner.right(), y))
 
         # Fret numbers
-        p.setFont(QtGui.QFont("Segoe UI", 9))
+        p.setFont(self._fret_font)
         p.setPen(QtGui.QColor(235, 235, 235, 200) if self._dark_theme else QtGui.QColor(30, 30, 30, 200))
         for f in range(1, frets):
             x = inner.left() + (f + 0.5) * cell_w
             p.drawText(QtCore.QRectF(x - cell_w/2, inner.bottom() + 4, cell_w, 18),
                        QtCore.Qt.AlignmentFlag.AlignCenter, str(f))
 
-        p.setFont(QtGui.QFont("Segoe UI", 8))
-        selected_set = set(self.selected_midis)
+        # Cells + note names
+        p.setFont(self._note_font)
         p.setBrush(QtCore.Qt.BrushStyle.NoBrush)
-
+        cell_pen = QtGui.QColor(255, 255, 255, 25) if self._dark_theme else QtGui.QColor(0, 0, 0, 18)
+        text_pen = QtGui.QColor(245, 245, 245, 180) if self._dark_theme else QtGui.QColor(25, 25, 25, 170)
         for s in range(strings):
             for f in range(frets):
-                x0 = inner.left() + f * cell_w
-                y0 = inner.top() + s * cell_h
-                cell = QtCore.QRectF(x0, y0, cell_w, cell_h)
-
-                m = self._midi_at(s, f)
-                name = midi_to_name(m)
-
-                p.setPen(QtGui.QColor(255, 255, 255, 25) if self._dark_theme else QtGui.QColor(0, 0, 0, 18))
-                p.setBrush(QtCore.Qt.BrushStyle.NoBrush)
+                cell = QtCore.QRectF(inner.left() + f * cell_w, inner.top() + s * cell_h, cell_w, cell_h)
+                p.setPen(cell_pen)
                 p.drawRect(cell)
-
                 if self._show_note_text:
-                    p.setPen(QtGui.QColor(245, 245, 245, 180) if self._dark_theme else QtGui.QColor(25, 25, 25, 170))
-                    p.drawText(cell, QtCore.Qt.AlignmentFlag.AlignCenter, name)
+                    p.setPen(text_pen)
+                    p.drawText(cell, QtCore.Qt.AlignmentFlag.AlignCenter, self.table.names[s][f])
+
+        p.end()
+        return pm
 
-                if m in selected_set:
-                    center = cell.center()
-                    r = min(cell_w, cell_h) * 0.28
+    def paintEvent(self, e):
+        if self._board is None or self._board.deviceIndependentSize().toSize() != self.size():
+            self._board = self._render_board()
+
+        p = QtGui.QPainter(self)
+        p.drawPixmap(0, 0, self._board)
+        if not self.selected_midis:
+            p.end()
+            return
 
-                    ring = QtGui.QPen(QtGui.QColor(0, 0, 0, 190))
-                    ring.setWidth(3)
-                    p.setPen(ring)
-                    p.setBrush(QtGui.QBrush(self._color_for_midi(m)))
-                    p.drawEllipse(center, r, r)
-                    p.setBrush(QtCore.Qt.BrushStyle.NoBrush)
+        p.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing, True)
+        inner = self._inner_rect()
+        strings = self.table.n_strings
+        frets = self.max_fret + 1
+        cell_w = inner.width() / frets
+        cell_h = inner.height() / strings
+        r = min(cell_w, cell_h) * 0.28
+
+        ring = QtGui.QPen(QtGui.QColor(0, 0, 0, 190))
+        ring.setWidth(3)
+        # suggested position to play the note on
+        finger_ring = QtGui.QPen(QtGui.QColor(255, 255, 255, 235) if self._dark_theme else QtGui.QColor(0, 0, 0, 235))
+        finger_ring.setWidth(4)
+        for m in self.selected_midis:
+            pos = self.table.positions.get(int(m))
+            if pos is None:
+                continue
+            p.setBrush(QtGui.QBrush(self._color_for_midi(m)))
+            for s, f in zip(pos[0].tolist(), pos[1].tolist()):
+                center = QtCore.QPointF(inner.left() + (f + 0.5) * cell_w, inner.top() + (s + 0.5) * cell_h)
+                chosen = (s, f) in self.fingering
+                p.setPen(finger_ring if chosen else ring)
+                rr = r * 1.25 if chosen else r
+                p.drawEllipse(center, rr, rr)
 
         p.end()
 
 class GuitarViewWindow(QtWidgets.QMainWindow):
+    tuningChanged = QtCore.Signal()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Guitar View")
@@ -261,6 +326,17 @@ class GuitarViewWindow(QtWidgets.QMainWindow):
         self.chk_dark.setChecked(True)
         topbar.addWidget(self.chk_dark)
 
+        topbar.addSpacing(12)
+        topbar.addWidget(QtWidgets.QLabel("Tuning"))
+        self.combo_tuning = QtWidgets.QComboBox()
+        self.combo_tuning.addItems([t.name for t in TUNINGS])
+        topbar.addWidget(self.combo_tuning)
+
+        topbar.addWidget(QtWidgets.QLabel("Capo"))
+        self.spin_capo = QtWidgets.QSpinBox()
+        self.spin_capo.setRange(0, MAX_CAPO)
+        topbar.addWidget(self.spin_capo)
+
         topbar.addStretch(1)
 
         self.grid = GuitarGridWidget()
@@ -268,6 +344,19 @@ class GuitarViewWindow(QtWidgets.QMainWindow):
 
         self.chk_text.toggled.connect(self.grid.set_show_note_text)
         self.chk_dark.toggled.connect(self.grid.set_dark_theme)
+        self.combo_tuning.currentTextChanged.connect(self.on_tuning_changed)
+        self.spin_capo.valueChanged.connect(self.on_tuning_changed)
+
+        # render every fretboard note in the background, Play then only mixes
+        self.voice_cache = VoiceCache(sr=44100)
+        self.voice_cache.set_notes(self.grid.cell_midis())
+        self.mixer = VoiceMixer(sr=44100, cache=self.voice_cache)
+
+    def on_tuning_changed(self, *_):
+        t = next((t for t in TUNINGS if t.name == self.combo_tuning.currentText()), TUNINGS[0])
+        self.grid.set_tuning(t.name, t.midis, self.spin_capo.value())
+        self.voice_cache.set_notes(self.grid.cell_midis())
+        self.tuningChanged.emit()
 
     def set_pinned(self, pinned: bool):
         self._pinned = bool(pinned)
@@ -277,6 +366,9 @@ class GuitarViewWindow(QtWidgets.QMainWindow):
     def set_selected_midis(self, midis):
         self.grid.set_selected_midis(midis)
 
+    def set_fingering(self, positions):
+        self.grid.set_fingering(positions)
+
     def play_selected_notes(self):
         midis = list(getattr(self.grid, "selected_midis", []) or [])
         if not midis:
@@ -284,6 +376,6 @@ class GuitarViewWindow(QtWidgets.QMainWindow):
             return
         dur = 0.65 if len(midis) >= 4 else 0.9
         try:
-            play_midis(midis, sr=44100, dur=dur)
+            self.mixer.play_chord(midis, dur=dur)
         except Exception as e:
             QtWidgets.QMessageBox.warning(self, "Audio", f"Can't play notes:\n{e}")
@@ -6,6 +6,10 @@ def build_actions(window):
     a["open"] = QtGui.QAction("Open…", window)
     a["open"].setShortcut(QtGui.QKeySequence.Open)
 
+    a["open_project"] = QtGui.QAction("Open project…", window)
+    a["save_project"] = QtGui.QAction("Save project…", window)
+    a["save_project"].setShortcut(QtGui.QKeySequence.Save)
+
     a["exit"] = QtGui.QAction("Quit", window)
     a["exit"].setShortcut(QtGui.QKeySequence.Quit)
 
@@ -17,36 +21,119 @@ def build_actions(window):
     a["mic"] = QtGui.QAction("Toggle Mic", window)
     a["mic"].setCheckable(True)
 
+    a["record"] = QtGui.QAction("Record take…", window)
+    a["record"].setCheckable(True)
+    a["record"].setToolTip("Record the mic to a WAV/FLAC file and analyse it live")
+
+    a["mic_chords"] = QtGui.QAction("Mic chords → Guitar View", window)
+    a["mic_chords"].setCheckable(True)
+    a["mic_chords"].setToolTip("Show the notes heard by the mic on the fretboard")
+
     a["loop"] = QtGui.QAction("Loop", window)
     a["loop"].setCheckable(True)
 
     a["clear_cross"] = QtGui.QAction("Clear crosses", window)
+    a["delete_cross"] = QtGui.QAction("Delete selected cross", window)
+    a["delete_cross"].setShortcut(QtGui.QKeySequence.Delete)
+    a["delete_cross"].setToolTip("Ctrl+click a cross to select it")
+
+    a["hear_cross"] = QtGui.QAction("Hear crosses", window)
+    a["hear_cross"].setCheckable(True)
+    a["hear_cross"].setToolTip("Play the crosses as guitar notes over the track")
+
+    a["export_cross"] = QtGui.QAction("Export crosses to WAV…", window)
+
+    a["transcribe"] = QtGui.QAction("Transcribe notes", window)
+    a["transcribe"].setToolTip("Find the note events of the whole track (again to cancel)")
+
+    a["events_to_cross"] = QtGui.QAction("Note events → crosses", window)
+    a["clear_events"] = QtGui.QAction("Clear note events", window)
+    a["event_up"] = QtGui.QAction("Selected note event: semitone up", window)
+    a["event_up"].setShortcut("Alt+Up")
+    a["event_up"].setToolTip("Shift+click a note event to select it, Shift+drag its ends to move them")
+    a["event_down"] = QtGui.QAction("Selected note event: semitone down", window)
+    a["event_down"].setShortcut("Alt+Down")
+
+    a["onsets"] = QtGui.QAction("Show onsets", window)
+    a["onsets"].setCheckable(True)
+
+    a["beats"] = QtGui.QAction("Beat grid", window)
+    a["beats"].setCheckable(True)
+    a["beats"].setToolTip("Estimated tempo, beats and bar lines")
+
+    a["chroma"] = QtGui.QAction("Chromagram", window)
+    a["chroma"].setCheckable(True)
+    a["chroma"].setToolTip("Pitch-class panel under the spectrogram")
+
+    a["hpss"] = QtGui.QAction("Harmonic only (HPSS)", window)
+    a["hpss"].setCheckable(True)
+    a["hpss"].setToolTip("Hide drum hits and strum transients, keep the sustained partials")
+
+    a["overview"] = QtGui.QAction("Waveform overview", window)
+    a["overview"].setCheckable(True)
+    a["overview"].setChecked(True)
+    a["overview"].setToolTip("Whole-track waveform strip: click or drag to move the view")
+
+    a["add_pane"] = QtGui.QAction("Add spectrogram pane", window)
+    a["add_pane"].setToolTip("Same track at another quality under the main view, time axis linked")
+
+    a["snap_onsets"] = QtGui.QAction("Snap to onsets", window)
+    a["snap_onsets"].setCheckable(True)
+    a["snap_onsets"].setToolTip("Playhead clicks and crosses jump to the nearest onset")
+
+    a["snap_peaks"] = QtGui.QAction("Snap crosses to peaks", window)
+    a["snap_peaks"].setCheckable(True)
+    a["snap_peaks"].setToolTip("New crosses take the frequency of the loudest spectral peak near the click")
 
     a["guitar"] = QtGui.QAction("Guitar View", window)
 
     return a
 
-def build_menus_and_toolbar(window, actions, dock_controls, dock_notes):
+def build_menus_and_toolbar(window, actions, dock_controls, dock_notes, extra_docks=()):
     m_file = window.menuBar().addMenu("File")
     m_file.addAction(actions["open"])
+    m_file.addAction(actions["export_cross"])
+    m_file.addSeparator()
+    m_file.addAction(actions["open_project"])
+    m_file.addAction(actions["save_project"])
     m_file.addSeparator()
     m_file.addAction(actions["exit"])
 
     m_view = window.menuBar().addMenu("View")
     m_view.addAction(actions["guitar"])
+    m_view.addAction(actions["overview"])
+    m_view.addAction(actions["onsets"])
+    m_view.addAction(actions["beats"])
+    m_view.addAction(actions["chroma"])
+    m_view.addAction(actions["hpss"])
+    m_view.addAction(actions["add_pane"])
     m_view.addSeparator()
     m_view.addAction(dock_controls.toggleViewAction())
     m_view.addAction(dock_notes.toggleViewAction())
+    for dock in extra_docks:
+        m_view.addAction(dock.toggleViewAction())
 
     m_play = window.menuBar().addMenu("Playback")
     m_play.addAction(actions["play"])
     m_play.addAction(actions["pause"])
     m_play.addSeparator()
     m_play.addAction(actions["loop"])
+    m_play.addAction(actions["hear_cross"])
 
     m_tools = window.menuBar().addMenu("Tools")
     m_tools.addAction(actions["mic"])
+    m_tools.addAction(actions["record"])
+    m_tools.addAction(actions["mic_chords"])
     m_tools.addAction(actions["clear_cross"])
+    m_tools.addAction(actions["delete_cross"])
+    m_tools.addAction(actions["snap_onsets"])
+    m_tools.addAction(actions["snap_peaks"])
+    m_tools.addSeparator()
+    m_tools.addAction(actions["transcribe"])
+    m_tools.addAction(actions["events_to_cross"])
+    m_tools.addAction(actions["event_up"])
+    m_tools.addAction(actions["event_down"])
+    m_tools.addAction(actions["clear_events"])
 
     tb = window.addToolBar("Main")
     tb.setMovable(False)
@@ -56,7 +143,9 @@ def build_menus_and_toolbar(window, actions, dock_controls, dock_notes):
     tb.addAction(actions["pause"])
     tb.addSeparator()
     tb.addAction(actions["loop"])
+    tb.addAction(actions["hear_cross"])
     tb.addAction(actions["mic"])
+    tb.addAction(actions["record"])
     tb.addSeparator()
     tb.addAction(actions["guitar"])
     tb.addAction(actions["clear_cross"])
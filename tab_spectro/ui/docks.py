@@ -1,5 +1,7 @@
 from PySide6 import QtCore, QtWidgets
+import pyqtgraph as pg
 from tab_spectro.utils.settings import DEFAULT_HARD_FMIN, DEFAULT_HARD_FMAX, QUALITIES
+from tab_spectro.audio.spectrogram import CHANNEL_VIEWS
 
 def build_controls_dock(window):
     dock = QtWidgets.QDockWidget("Controls", window)
@@ -33,6 +35,12 @@ def build_controls_dock(window):
     combo_quality.setCurrentText("Très fin")
     form.addRow("Quality", combo_quality)
 
+    combo_channel = QtWidgets.QComboBox()
+    for view, label in zip(CHANNEL_VIEWS, ("Mid (L+R)", "Side (L−R)", "Left", "Right")):
+        combo_channel.addItem(label, view)
+    combo_channel.setEnabled(False)  # stereo tracks only
+    form.addRow("Channel", combo_channel)
+
     combo_zoom = QtWidgets.QComboBox()
     combo_zoom.addItems(["Auto", "Horizontal (X)", "Vertical (Y)", "XY (les deux)"])
     combo_zoom.setCurrentText("Auto")
@@ -40,7 +48,7 @@ def build_controls_dock(window):
 
     dock.setWidget(ctrl)
 
-    return dock, spin_win, spin_hfmin, spin_hfmax, combo_quality, combo_zoom
+    return dock, spin_win, spin_hfmin, spin_hfmax, combo_quality, combo_channel, combo_zoom
 
 def build_notes_dock(window):
     dock = QtWidgets.QDockWidget("Notes", window)
@@ -55,3 +63,38 @@ def build_notes_dock(window):
     chat.setPlaceholderText("Right click to add a cross, the frequencies will appear hear.")
     dock.setWidget(chat)
     return dock, chat
+
+def build_waterfall_dock(window):
+    dock = QtWidgets.QDockWidget("Mic waterfall", window)
+    dock.setAllowedAreas(
+        QtCore.Qt.DockWidgetArea.BottomDockWidgetArea |
+        QtCore.Qt.DockWidgetArea.LeftDockWidgetArea |
+        QtCore.Qt.DockWidgetArea.RightDockWidgetArea
+    )
+
+    plot = pg.PlotWidget()
+    plot.setLabel("left", "Frequency (Hz)")
+    plot.setLabel("bottom", "Time (s)")
+    plot.setMenuEnabled(False)
+    plot.setMouseEnabled(x=False, y=True)
+    plot.setMinimumHeight(160)
+    dock.setWidget(plot)
+    return dock, plot
+
+def build_spectrum_dock(window):
+    dock = QtWidgets.QDockWidget("Spectrum at playhead", window)
+    dock.setAllowedAreas(
+        QtCore.Qt.DockWidgetArea.BottomDockWidgetArea |
+        QtCore.Qt.DockWidgetArea.LeftDockWidgetArea |
+        QtCore.Qt.DockWidgetArea.RightDockWidgetArea
+    )
+
+    plot = pg.PlotWidget()
+    plot.setLabel("left", "Level (dB)")
+    plot.setLabel("bottom", "Frequency (Hz)")
+    plot.showGrid(x=True, y=True, alpha=0.2)
+    plot.setMenuEnabled(False)
+    plot.setMouseEnabled(x=True, y=False)
+    plot.setMinimumSize(260, 160)
+    dock.setWidget(plot)
+    return dock, plot
@@ -1,24 +1,49 @@
 import os
-import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import sounddevice as sd
 import pyqtgraph as pg
 from PySide6 import QtCore, QtWidgets, QtGui
 
-from tab_spectro.audio.io import load_audio_file, AudioData
-from tab_spectro.audio.spectrogram import compute_spectrogram_full, render_region_to_u8
+from tab_spectro.audio.io import load_audio_file, save_audio_file, AudioData
+from tab_spectro.audio.spectrogram import compute_spectrogram_full, compute_spectrogram_channels, render_region_to_u8
 from tab_spectro.audio.playback import AudioPlayer
-from tab_spectro.audio.mic import extract_mic_peaks
-from tab_spectro.guitar.theory import freq_to_nearest_note
+from tab_spectro.audio.mic import MicAnalyzer
+from tab_spectro.audio.recorder import AudioRecorder
+from tab_spectro.audio.transcribe import TranscriptionJob, NoteEvent
+from tab_spectro.audio.onsets import spectral_flux_onsets, OnsetIndex
+from tab_spectro.audio.beats import track_beats, BeatGrid
+from tab_spectro.audio.peaks import PeakIndex
+from tab_spectro.audio.chroma import chromagram
+from tab_spectro.audio.hpss import HpssJob
+from tab_spectro.audio.chords import ChordDetector
+from tab_spectro.audio.crosses import CrossStore
+from tab_spectro.audio.waveform import MinMaxPyramid
+from tab_spectro.audio.sequence import render_sequence, render_note, add_note
+from tab_spectro.guitar.theory import freq_to_nearest_note, midi_to_freq, midi_to_name, NOTE_NAMES_SHARP
 from tab_spectro.guitar.guitar_view import GuitarViewWindow
+from tab_spectro.guitar.fingering import solve_fingering
 from tab_spectro.graphics.viewbox import SpectroViewBox
-from tab_spectro.ui.docks import build_controls_dock, build_notes_dock
+from tab_spectro.graphics.hlines import HLinesItem
+from tab_spectro.graphics.waterfall import WaterfallItem
+from tab_spectro.graphics.note_events import NoteEventsItem
+from tab_spectro.graphics.vlines import VLinesItem
+from tab_spectro.graphics.crosses import CrossesItem
+from tab_spectro.graphics.tiles import TileCache
+from tab_spectro.ui.docks import build_controls_dock, build_notes_dock, build_waterfall_dock, build_spectrum_dock
 from tab_spectro.ui.actions import build_actions, build_menus_and_toolbar
+from tab_spectro.ui.panes import SpectroPane
+from tab_spectro.utils.project import (
+    PROJECT_EXT, save_project, load_project, quantise_db, dequantise_db, audio_reference, resolve_audio
+)
 from tab_spectro.utils.settings import (
     QUALITIES, DEFAULT_HARD_FMIN, DEFAULT_HARD_FMAX, DEFAULT_GAMMA,
-    MIC_FMIN, MIC_FMAX, MIC_MAX_LINES, MIC_LINE_WIDTH, MIC_BASE_GREEN,
-    MIC_MAX_GREEN, MIC_ALPHA_MIN, MIC_ALPHA_MAX
+    MIC_SAMPLERATE, MIC_WINDOW, MIC_HOP, MIC_WATERFALL_SECONDS, MIC_FMIN, MIC_FMAX, MIC_MAX_LINES, MIC_LINE_WIDTH, MIC_BASE_GREEN,
+    MIC_MAX_GREEN, MIC_ALPHA_MIN, MIC_ALPHA_MAX, RECORD_FOLLOW_SECONDS,
+    BEATS_PER_BAR, PEAK_INDEX_FMAX, PEAK_FLOOR_DB, PROJECT_SAVE_ANALYSIS, HPSS_FMAX, MAX_PANES, SPECTRUM_LABELS,
+    NOTE_EVENT_MIN_LEN
 )
 
 def make_audacity_lut(n: int = 256) -> np.ndarray:
@@ -52,6 +77,7 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
         self.resize(1750, 980)
 
         self.audio: AudioData | None = None
+        self.audio_path: str | None = None  # file behind self.audio, referenced by projects
 
         self.f = None
         self.t = None
@@ -67,6 +93,15 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
         self.quality_name = "Très fin"
         self.nperseg = 16384
         self.noverlap_ratio = 0.85
+        # channel view of stereo tracks (CHANNEL_VIEWS)
+        self.channel = "mid"
+        # analyses of the current audio used by the main view or a pane:
+        # (nperseg, noverlap_ratio, channel) -> (f, t, S_db, vmin, vmax)
+        self._analyses = {}
+        # display images of those analyses, shared by all panes
+        self.tiles = TileCache()
+        # extra panes under the main view (time-linked, their own quality)
+        self.panes = []
 
         # player
         self.player = AudioPlayer()
@@ -79,7 +114,16 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
         # mic
         self.mic_enabled = False
         self._mic_stream = None
-        self._mic_q = queue.Queue()
+        self._mic_worker = None
+        self._chord_detector = None
+        self._recorder = None
+        self._rec_columns = 0
+        self._mic_chord_prev = []  # last detected notes, a note must show up twice in a row
+        self.mic_sr = MIC_SAMPLERATE
+        self.mic_window = MIC_WINDOW
+        self.mic_hop = MIC_HOP
+        self.mic_waterfall_seconds = MIC_WATERFALL_SECONDS
+        self.waterfall = None
         self.mic_fmin = MIC_FMIN
         self.mic_fmax = MIC_FMAX
         self.mic_max_lines = MIC_MAX_LINES
@@ -88,10 +132,40 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
         self.mic_max_green = MIC_MAX_GREEN
         self.mic_alpha_min = MIC_ALPHA_MIN
         self.mic_alpha_max = MIC_ALPHA_MAX
-        self._mic_lines = []
 
         # crosses
-        self.cross_points = []
+        self.crosses = CrossStore()
+        self._selected_cross = None  # id of the highlighted cross
+        self.cross_audio = None  # crosses rendered as notes on the track timeline
+        # whole-sequence renders run off the UI thread; single added crosses are mixed in directly
+        self._cross_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="crosses")
+        self._cross_future = None
+        self._cross_pending = None  # (audio, export path or None) of _cross_future
+
+        # onsets of the current spectrogram, sorted for snapping
+        self.onsets = OnsetIndex()
+        # spectral peaks of every column (cross snapping)
+        self.peaks = PeakIndex()
+        # pitch classes x columns, only while the chromagram is shown
+        self.chroma = None
+
+        # beat grid: computed off the UI thread, one result per quality of the loaded audio
+        self.beat_grid = None
+        self._beat_cache = {}  # (nperseg, noverlap_ratio, channel) -> BeatGrid
+        self._beat_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="beats")
+        self._beat_future = None
+        self._beat_pending = None  # (audio, key) of _beat_future
+
+        # harmonic part of S_db (display only), separated in a process pool, one per quality
+        self._hpss_cache = {}  # (nperseg, noverlap_ratio, channel) -> (rows, harmonic dB of rows 0..rows-1)
+        self._hpss_job = None
+        self._hpss_pending = None  # (audio, key) of _hpss_job
+
+        # transcription
+        self.note_events = []
+        self._transcribe_job = None
+        self._selected_event = None  # index in note_events
+        self._event_drag = None  # (index, "onset" | "offset") while Shift+dragging a bar end
 
         # Guitar view
         self.guitar_window = None
@@ -100,11 +174,16 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
         self._in_render = False
         self._updating_scroll = False
         self._suspend_render = False
+        self._linking_x = False
 
         self._build_central()
         self._build_ui()
         self._build_timers()
 
+        self.mic_pitch_label = QtWidgets.QLabel("")
+        self.mic_pitch_label.setMinimumWidth(190)
+        self.statusBar().addPermanentWidget(self.mic_pitch_label)
+
         self.statusBar().showMessage("Ready. Open-> File to open a music.")
 
     def _build_central(self):
@@ -125,20 +204,48 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
         self.plot.scene().installEventFilter(self)
 
 
-        grid.addWidget(self.plot, 0, 0, 1, 1)
+        # the main view and the extra panes share the height
+        self.splitter = QtWidgets.QSplitter(QtCore.Qt.Orientation.Vertical)
+        self.splitter.setChildrenCollapsible(False)
+        self.splitter.addWidget(self.plot)
+        grid.addWidget(self.splitter, 1, 0, 1, 1)
+
+        # whole-track waveform above everything: current view, loop and playhead, click to navigate
+        self.overview_plot = pg.PlotWidget()
+        self.overview_plot.setMenuEnabled(False)
+        self.overview_plot.setMouseEnabled(x=False, y=False)
+        self.overview_plot.hideButtons()
+        self.overview_plot.setFixedHeight(70)
+        self.overview_plot.hideAxis("bottom")
+        self.overview_plot.getAxis("left").setTicks([[]])
+        grid.addWidget(self.overview_plot, 0, 0, 1, 1)
+
+        # chromagram under the spectrogram; its x range follows the main view (set on render)
+        self.chroma_plot = pg.PlotWidget()
+        self.chroma_plot.setMenuEnabled(False)
+        self.chroma_plot.setMouseEnabled(x=False, y=False)
+        self.chroma_plot.hideButtons()
+        self.chroma_plot.setFixedHeight(150)
+        self.chroma_plot.setYRange(0, 12, padding=0.0)
+        self.chroma_plot.getAxis("left").setTicks([[(i + 0.5, n) for i, n in enumerate(NOTE_NAMES_SHARP)]])
+        # same axis width on both plots so their time axes line up
+        for p in (self.plot, self.chroma_plot, self.overview_plot):
+            p.getAxis("left").setWidth(72)
+        self.chroma_plot.setVisible(False)
+        grid.addWidget(self.chroma_plot, 2, 0, 1, 1)
 
         self.vscroll = QtWidgets.QScrollBar(QtCore.Qt.Orientation.Vertical)
         self.vscroll.setEnabled(False)
         self.vscroll.setMinimumWidth(18)
-        grid.addWidget(self.vscroll, 0, 1, 1, 1)
+        grid.addWidget(self.vscroll, 1, 1, 1, 1)
 
         self.hscroll = QtWidgets.QScrollBar(QtCore.Qt.Orientation.Horizontal)
         self.hscroll.setEnabled(False)
         self.hscroll.setMinimumHeight(20)
-        grid.addWidget(self.hscroll, 1, 0, 1, 1)
+        grid.addWidget(self.hscroll, 3, 0, 1, 1)
 
         grid.setColumnStretch(0, 1)
-        grid.setRowStretch(0, 1)
+        grid.setRowStretch(1, 1)
 
         self.setCentralWidget(spectroPane)
 
@@ -148,25 +255,51 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
         self.img.setLookupTable(self.lut)
         self.plot.addItem(self.img)
 
+        self.chroma_img = pg.ImageItem()
+        self.chroma_img.setLookupTable(self.lut)
+        self.chroma_plot.addItem(self.chroma_img)
+
+        # min/max per pixel column, drawn as vertical segments
+        self.overview_curve = pg.PlotCurveItem(connect="pairs", pen=pg.mkPen((120, 200, 255), width=1))
+        self.overview_plot.addItem(self.overview_curve)
+        self.overview_loop = pg.LinearRegionItem(movable=False, brush=pg.mkBrush(80, 220, 120, 50),
+                                                 pen=pg.mkPen(80, 220, 120, 160))
+        self.overview_loop.setVisible(False)
+        self.overview_plot.addItem(self.overview_loop)
+        self.overview_view = pg.LinearRegionItem(brush=pg.mkBrush(255, 255, 255, 40), pen=pg.mkPen(255, 255, 255, 180))
+        self.overview_view.setZValue(10)
+        self.overview_plot.addItem(self.overview_view)
+        self.overview_play = pg.InfiniteLine(pos=0, angle=90, movable=False, pen=pg.mkPen(width=1))
+        self.overview_play.setZValue(20)
+        self.overview_plot.addItem(self.overview_play)
+        self.waveform = None  # MinMaxPyramid of the current track
+
         self.play_line = pg.InfiniteLine(pos=0, angle=90, movable=True, pen=pg.mkPen(width=2))
         self.play_line.setZValue(30)
         self.plot.addItem(self.play_line)
 
-        self.cross_outline = pg.ScatterPlotItem(
-            size=11, symbol="x",
-            pen=pg.mkPen(QtGui.QColor(0, 0, 0, 235), width=4),
-            brush=None
-        )
-        self.cross_outline.setZValue(60)
-        self.plot.addItem(self.cross_outline)
+        # all mic peaks in one item, updated in place on every analysis frame
+        self.mic_lines = HLinesItem(width=self.mic_line_width,
+                                    lo_color=(0, self.mic_base_green, 0, self.mic_alpha_min),
+                                    hi_color=(0, self.mic_max_green, 0, self.mic_alpha_max))
+        self.mic_lines.setZValue(40)
+        self.plot.addItem(self.mic_lines)
 
-        self.cross_inner = pg.ScatterPlotItem(
-            size=10, symbol="x",
-            pen=pg.mkPen(QtGui.QColor(255, 255, 255, 235), width=2),
-            brush=None
-        )
-        self.cross_inner.setZValue(61)
-        self.plot.addItem(self.cross_inner)
+        self.onset_lines = VLinesItem()
+        self.onset_lines.setZValue(25)
+        self.plot.addItem(self.onset_lines)
+
+        self.beat_lines = VLinesItem(color=(255, 190, 60, 55), strong_color=(255, 190, 60, 150))
+        self.beat_lines.setZValue(24)
+        self.plot.addItem(self.beat_lines)
+
+        self.events_item = NoteEventsItem()
+        self.events_item.setZValue(45)
+        self.plot.addItem(self.events_item)
+
+        self.cross_item = CrossesItem()
+        self.cross_item.setZValue(60)
+        self.plot.addItem(self.cross_item)
 
         self.hscroll.valueChanged.connect(self.on_hscroll)
         self.vscroll.valueChanged.connect(self.on_vscroll)
@@ -174,33 +307,87 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
         self.plot.scene().sigMouseClicked.connect(self.on_scene_clicked)
         self.plot.scene().sigMouseMoved.connect(self.on_scene_mouse_moved)
         self.vb.sigRangeChanged.connect(self.on_view_range_changed)
+        self.overview_view.sigRegionChanged.connect(self.on_overview_region_changed)
+        self.overview_plot.getViewBox().sigResized.connect(self._refresh_overview)
+        self.overview_plot.scene().sigMouseClicked.connect(self.on_overview_clicked)
+
+        # range changes of linked views arrive one by one: render them all in one frame
+        self._render_timer = QtCore.QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setInterval(0)
+        self._render_timer.timeout.connect(self.render_tile_from_viewbox)
+
+        # the fingering pass covers every cross: solve once after a burst of edits, not per edit
+        self._fingering_timer = QtCore.QTimer(self)
+        self._fingering_timer.setSingleShot(True)
+        self._fingering_timer.setInterval(150)
+        self._fingering_timer.timeout.connect(self._refresh_fingering)
 
     def _build_ui(self):
         # docks
-        self.dock_controls, self.spin_win, self.spin_hfmin, self.spin_hfmax, self.combo_quality, self.combo_zoom = build_controls_dock(self)
+        (self.dock_controls, self.spin_win, self.spin_hfmin, self.spin_hfmax, self.combo_quality, self.combo_channel,
+         self.combo_zoom) = build_controls_dock(self)
         self.addDockWidget(QtCore.Qt.DockWidgetArea.RightDockWidgetArea, self.dock_controls)
 
         self.dock_notes, self.chat = build_notes_dock(self)
         self.addDockWidget(QtCore.Qt.DockWidgetArea.BottomDockWidgetArea, self.dock_notes)
 
+        self.dock_waterfall, self.waterfall_plot = build_waterfall_dock(self)
+        self.addDockWidget(QtCore.Qt.DockWidgetArea.BottomDockWidgetArea, self.dock_waterfall)
+        self.dock_waterfall.hide()
+
+        self.dock_spectrum, self.spectrum_plot = build_spectrum_dock(self)
+        self.addDockWidget(QtCore.Qt.DockWidgetArea.RightDockWidgetArea, self.dock_spectrum)
+        self.dock_spectrum.hide()
+        self.spectrum_curve = self.spectrum_plot.plot(pen=pg.mkPen((120, 200, 255), width=1))
+        self.spectrum_peaks = pg.ScatterPlotItem(size=7, brush=pg.mkBrush(255, 220, 80), pen=None)
+        self.spectrum_plot.addItem(self.spectrum_peaks)
+        self.spectrum_labels = []
+        for _ in range(SPECTRUM_LABELS):
+            label = pg.TextItem(color=(255, 220, 80), anchor=(0.5, 1.1))
+            self.spectrum_plot.addItem(label)
+            self.spectrum_labels.append(label)
+        self._spectrum_col = None  # column shown, redrawn only when the playhead leaves it
+        self.dock_spectrum.visibilityChanged.connect(lambda _: self._update_spectrum(force=True))
+
         # actions + menus + toolbar
         self.actions = build_actions(self)
-        build_menus_and_toolbar(self, self.actions, self.dock_controls, self.dock_notes)
+        build_menus_and_toolbar(self, self.actions, self.dock_controls, self.dock_notes,
+                                extra_docks=(self.dock_waterfall, self.dock_spectrum))
 
         # connect
         self.actions["open"].triggered.connect(self.on_open_file)
+        self.actions["open_project"].triggered.connect(self.on_open_project)
+        self.actions["save_project"].triggered.connect(self.on_save_project)
         self.actions["exit"].triggered.connect(self.close)
         self.actions["play"].triggered.connect(self.toggle_play_pause)
         self.actions["pause"].triggered.connect(self.on_pause)
         self.actions["mic"].triggered.connect(self.on_toggle_mic)
+        self.actions["mic_chords"].toggled.connect(self.on_toggle_mic_chords)
+        self.actions["record"].toggled.connect(self.on_toggle_record)
         self.actions["loop"].triggered.connect(self.on_toggle_loop)
         self.actions["clear_cross"].triggered.connect(self.clear_crosses)
+        self.actions["delete_cross"].triggered.connect(self.delete_selected_cross)
+        self.actions["hear_cross"].triggered.connect(self.on_toggle_hear_crosses)
+        self.actions["export_cross"].triggered.connect(self.on_export_crosses)
         self.actions["guitar"].triggered.connect(self.on_guitar_view)
+        self.actions["transcribe"].triggered.connect(self.on_transcribe)
+        self.actions["onsets"].toggled.connect(self._refresh_onset_lines)
+        self.actions["beats"].toggled.connect(self._update_beats)
+        self.actions["chroma"].toggled.connect(self.on_toggle_chroma)
+        self.actions["hpss"].toggled.connect(self.on_toggle_hpss)
+        self.actions["add_pane"].triggered.connect(self.on_add_pane)
+        self.actions["overview"].toggled.connect(self.overview_plot.setVisible)
+        self.actions["events_to_cross"].triggered.connect(self.on_events_to_crosses)
+        self.actions["clear_events"].triggered.connect(self.clear_note_events)
+        self.actions["event_up"].triggered.connect(lambda: self.nudge_selected_event(1))
+        self.actions["event_down"].triggered.connect(lambda: self.nudge_selected_event(-1))
 
         self.spin_win.valueChanged.connect(self.on_window_changed)
         self.spin_hfmin.valueChanged.connect(self.on_hard_freq_changed)
         self.spin_hfmax.valueChanged.connect(self.on_hard_freq_changed)
         self.combo_quality.currentTextChanged.connect(self.on_quality_changed)
+        self.combo_channel.currentIndexChanged.connect(self.on_channel_changed)
 
     def _build_timers(self):
         self.ui_timer = QtCore.QTimer()
@@ -209,10 +396,14 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
         self.ui_timer.start()
 
         self.mic_timer = QtCore.QTimer()
-        self.mic_timer.setInterval(50)
+        self.mic_timer.setInterval(33)
         self.mic_timer.timeout.connect(self.on_mic_tick)
         self.mic_timer.start()
     
+        self.transcribe_timer = QtCore.QTimer()
+        self.transcribe_timer.setInterval(100)
+        self.transcribe_timer.timeout.connect(self.on_transcribe_tick)
+
     def _time_from_scene(self, scene_pos: QtCore.QPointF) -> float:
         mp = self.vb.mapSceneToView(scene_pos)
         if not self.audio:
@@ -229,6 +420,10 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
         if event.type() == QtCore.QEvent.Type.Wheel:
             return self._handle_wheel_event(event)
 
+        # --- note event ends: Shift+drag ---
+        if obj is self.plot.scene() and self.audio and self.note_events and self._handle_event_drag(event):
+            return True
+
         # --- loop drag: use GraphicsScene mouse events (works on Windows reliably) ---
         if obj is self.plot.scene() and self.audio and self.actions["loop"].isChecked():
             et = event.type()
@@ -266,6 +461,41 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
 
         return super().eventFilter(obj, event)
 
+    def _handle_event_drag(self, event) -> bool:
+        if self._transcribe_job is not None:
+            return False  # the events are about to be replaced
+        et = event.type()
+        if et == QtCore.QEvent.Type.GraphicsSceneMousePress:
+            if (event.button() != QtCore.Qt.MouseButton.LeftButton
+                    or not event.modifiers() & QtCore.Qt.KeyboardModifier.ShiftModifier):
+                return False
+            mp = self.vb.mapSceneToView(event.scenePos())
+            px_t, px_f = self.vb.viewPixelSize()
+            hit = self.events_item.end_at(float(mp.x()), float(mp.y()), 6 * px_t, 6 * px_f)
+            if hit is None:
+                return False  # the click selects the bar (on_scene_clicked)
+            self._event_drag = hit
+            self._select_note_event(hit[0])
+            return True
+        if self._event_drag is None:
+            return False
+        if et == QtCore.QEvent.Type.GraphicsSceneMouseMove:
+            i, end = self._event_drag
+            ev = self.note_events[i]
+            t = self._snap_time(self._time_from_scene(event.scenePos()))
+            # a bar keeps a few ms, the ends never cross
+            if end == "onset":
+                ev.onset = min(t, ev.offset - NOTE_EVENT_MIN_LEN)
+            else:
+                ev.offset = max(t, ev.onset + NOTE_EVENT_MIN_LEN)
+            self._refresh_note_events()
+            self._show_selected_event()
+            return True
+        if et == QtCore.QEvent.Type.GraphicsSceneMouseRelease:
+            self._event_drag = None
+            return True
+        return False
+
 
     def _handle_wheel_event(self, ev: QtGui.QWheelEvent) -> bool:
         if not self.audio:
@@ -361,35 +591,57 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
         self.load_audio(path)
 
     def load_audio(self, path: str):
+        if self._recorder is not None:
+            self.actions["record"].setChecked(False)
+        self._cancel_transcription()
+        self.clear_note_events()
+        self._beat_cache.clear()
+        self._cancel_beats()
+        self._hpss_cache.clear()
+        self._cancel_hpss()
+        self._forget_analyses()
         try:
             self.audio = load_audio_file(path)
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Load error", str(e))
             return
 
+        self.audio_path = path
+
         self.player.stop()
         self.player.set_audio(self.audio.y, self.audio.sr, self.audio.duration)
+        self.cross_audio = None
+        self._cancel_cross_render()
+        self.actions["hear_cross"].setChecked(False)
 
         self.statusBar().showMessage("Computing FULL spectrogram…")
         QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.CursorShape.WaitCursor)
         try:
-            self.f, self.t, self.S_db, self.db_vmin, self.db_vmax = compute_spectrogram_full(
-                self.audio.y, self.audio.sr, self.nperseg, self.noverlap_ratio
-            )
+            self._sync_channel_combo()
+            self._compute_spectrogram()
+            self._spectrogram_changed()
         finally:
             QtWidgets.QApplication.restoreOverrideCursor()
 
+        self._reset_track_view()
+        self.statusBar().showMessage(f"Loaded: {os.path.basename(path)} — {self.audio.duration:.2f}s")
+
+    def _reset_track_view(self, x_range=None, y_range=None):
+        # limits, window spin, scrollbars and overview for the current track; whole track unless given
         self.update_hard_limits()
+        self.waveform = MinMaxPyramid(self.audio.y)
+        self._refresh_overview()
 
         dur = self.audio.duration
         self.spin_win.blockSignals(True)
         self.spin_win.setMaximum(max(0.1, dur))
-        self.spin_win.setValue(dur)
+        self.spin_win.setValue(dur if x_range is None else max(0.1, x_range[1] - x_range[0]))
         self.spin_win.blockSignals(False)
 
         self._suspend_render = True
         try:
-            self.vb.setRange(xRange=(0.0, dur), yRange=(self.hard_fmin, self.hard_fmax), padding=0.0, update=True)
+            self.vb.setRange(xRange=x_range or (0.0, dur), yRange=y_range or (self.hard_fmin, self.hard_fmax),
+                             padding=0.0, update=True)
             self.vb.clamp_view()
         finally:
             self._suspend_render = False
@@ -397,7 +649,186 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
         self.hscroll.setEnabled(True)
         self.vscroll.setEnabled(True)
         self.render_tile_from_viewbox()
-        self.statusBar().showMessage(f"Loaded: {os.path.basename(path)} — {dur:.2f}s")
+
+    # -------- project (session) files --------
+    def on_save_project(self):
+        if not self.audio or not self.audio_path or self._recorder is not None:
+            self.statusBar().showMessage("Nothing to save (open or record a track first)")
+            return
+        base = os.path.splitext(os.path.basename(self.audio_path))[0] + PROJECT_EXT
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Save project", base, f"Project (*{PROJECT_EXT});;All (*.*)"
+        )
+        if not path:
+            return
+        if not os.path.splitext(path)[1]:
+            path += PROJECT_EXT
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.CursorShape.WaitCursor)
+        try:
+            meta, arrays = self._project_state(path)
+            save_project(path, meta, arrays)
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Save error", str(e))
+            return
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+        self.statusBar().showMessage(f"Project saved: {os.path.basename(path)}")
+
+    def _project_state(self, path: str):
+        (xr, yr) = self.vb.viewRange()
+        loop = None
+        if self.loop_region is not None:
+            a, b = self.loop_region.getRegion()
+            loop = [float(min(a, b)), float(max(a, b))]
+        meta = dict(
+            audio_reference(path, self.audio_path),
+            sr=int(self.audio.sr), n_samples=int(len(self.audio.y)),
+            quality=self.quality_name, nperseg=int(self.nperseg), noverlap_ratio=float(self.noverlap_ratio),
+            channel=self.channel,
+            panes=[dict(quality=p.quality.name, log=p.log_freq) for p in self.panes],
+            hard_fmin=float(self.hard_fmin), hard_fmax=float(self.hard_fmax),
+            view=[float(xr[0]), float(xr[1]), float(yr[0]), float(yr[1])],
+            loop=loop, playhead=float(self.player.playhead),
+            cross_next_id=int(self.crosses.next_id),
+            toggles={k: self.actions[k].isChecked() for k in ("onsets", "beats", "chroma", "hpss", "overview", "snap_onsets",
+                                                              "snap_peaks")},
+        )
+        ev = self.note_events
+        arrays = dict(
+            cross_t=self.crosses.t, cross_f=self.crosses.f, cross_midi=self.crosses.midi, cross_id=self.crosses.ids,
+            ev_onset=np.array([e.onset for e in ev], dtype=np.float64),
+            ev_offset=np.array([e.offset for e in ev], dtype=np.float64),
+            ev_midi=np.array([e.midi for e in ev], dtype=np.int32),
+            ev_strength=np.array([e.strength for e in ev], dtype=np.float32),
+        )
+        if PROJECT_SAVE_ANALYSIS and self.S_db is not None:
+            q, lo, scale = quantise_db(self.S_db)
+            meta.update(db_vmin=float(self.db_vmin), db_vmax=float(self.db_vmax), db_lo=lo, db_scale=scale)
+            arrays.update(f=self.f, t=self.t, S_q=q, onsets=self.onsets.times,
+                          peak_ptr=self.peaks.ptr, peak_freq=self.peaks.freq, peak_db=self.peaks.db)
+            grid = self._beat_cache.get(self._analysis_key())
+            if grid is not None:
+                meta["beat"] = dict(bpm=grid.bpm, beats_per_bar=grid.beats_per_bar, downbeat=grid.downbeat)
+                arrays["beats"] = grid.beats
+        return meta, arrays
+
+    def on_open_project(self):
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Open project", "", f"Project (*{PROJECT_EXT});;All (*.*)"
+        )
+        if path:
+            self.open_project(path)
+
+    def open_project(self, path: str):
+        t_start = time.perf_counter()
+        try:
+            meta, arr = load_project(path)
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Project error", str(e))
+            return
+        audio_path = resolve_audio(path, meta)
+        if audio_path is None:
+            QtWidgets.QMessageBox.critical(self, "Project error", f"Audio file not found: {meta.get('audio')}")
+            return
+
+        if self._recorder is not None:
+            self.actions["record"].setChecked(False)
+        self._cancel_transcription()
+        self.clear_note_events()
+        self._beat_cache.clear()
+        self._cancel_beats()
+        self._hpss_cache.clear()
+        self._cancel_hpss()
+        self._forget_analyses()
+        for pane in list(self.panes):
+            self.remove_pane(pane)
+        self.actions["loop"].setChecked(False)
+        try:
+            audio = load_audio_file(audio_path)
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Load error", str(e))
+            return
+        self.audio, self.audio_path = audio, audio_path
+        self.player.stop()
+        self.player.set_audio(audio.y, audio.sr, audio.duration)
+        self.cross_audio = None
+        self._cancel_cross_render()
+        self.actions["hear_cross"].setChecked(False)
+
+        # quality and limits, without their recompute/reset handlers
+        name = meta.get("quality", self.quality_name)
+        q = next((q for q in QUALITIES if q.name == name), None)
+        if q:
+            self.quality_name, self.nperseg, self.noverlap_ratio = q.name, q.nperseg, q.noverlap_ratio
+            self.combo_quality.blockSignals(True)
+            self.combo_quality.setCurrentText(q.name)
+            self.combo_quality.blockSignals(False)
+        self.hard_fmin = float(meta.get("hard_fmin", self.hard_fmin))
+        self.hard_fmax = float(meta.get("hard_fmax", self.hard_fmax))
+        for spin, v in ((self.spin_hfmin, self.hard_fmin), (self.spin_hfmax, self.hard_fmax)):
+            spin.blockSignals(True)
+            spin.setValue(v)
+            spin.blockSignals(False)
+
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.CursorShape.WaitCursor)
+        try:
+            self.channel = meta.get("channel", "mid")
+            self._sync_channel_combo()
+            stored = ("S_q" in arr and meta.get("nperseg") == self.nperseg
+                      and meta.get("channel", "mid") == self.channel
+                      and meta.get("noverlap_ratio") == self.noverlap_ratio
+                      and meta.get("sr") == audio.sr and meta.get("n_samples") == len(audio.y))
+            if stored:
+                self.f, self.t = np.array(arr["f"]), np.array(arr["t"])
+                self.S_db = dequantise_db(arr["S_q"], meta["db_lo"], meta["db_scale"])
+                self.db_vmin, self.db_vmax = meta["db_vmin"], meta["db_vmax"]
+                self._analyses[self._analysis_key()] = (self.f, self.t, self.S_db, self.db_vmin, self.db_vmax)
+                self.onsets = OnsetIndex(arr["onsets"])
+                self._refresh_onset_lines()
+                self.peaks = PeakIndex.from_arrays(self.t, arr["peak_ptr"], arr["peak_freq"], arr["peak_db"])
+                self._update_chroma()
+                if "beats" in arr and meta.get("beat"):
+                    b = meta["beat"]
+                    self._beat_cache[self._analysis_key()] = BeatGrid(
+                        float(b["bpm"]), np.array(arr["beats"]), int(b["beats_per_bar"]), int(b["downbeat"]))
+                self._update_beats()
+                self._update_hpss()
+            else:
+                self.statusBar().showMessage("Computing FULL spectrogram…")
+                self._compute_spectrogram()
+                self._spectrogram_changed()
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+
+        self.crosses.clear()
+        self._selected_cross = None
+        if "cross_t" in arr:
+            self.crosses.extend(arr["cross_t"], arr["cross_f"], arr["cross_midi"], ids=arr["cross_id"])
+        self.crosses.next_id = max(self.crosses.next_id, int(meta.get("cross_next_id", 1)))
+        self._refresh_cross_items()
+        self.chat.appendPlainText(f"Project {os.path.basename(path)}: {len(self.crosses)} crosses.")
+        if "ev_onset" in arr:
+            self.note_events = [NoteEvent(float(a), float(b), int(m), float(st)) for a, b, m, st in zip(
+                arr["ev_onset"].tolist(), arr["ev_offset"].tolist(), arr["ev_midi"].tolist(), arr["ev_strength"].tolist())]
+            self._refresh_note_events()
+        self._update_guitar_view()
+
+        view = meta.get("view")
+        self._reset_track_view((view[0], view[1]) if view else None, (view[2], view[3]) if view else None)
+        if meta.get("loop"):
+            self.actions["loop"].setChecked(True)
+            self._ensure_loop_region(*meta["loop"])
+        self.set_playhead(float(meta.get("playhead", 0.0)))
+        for p in meta.get("panes", []):
+            if any(q.name == p.get("quality") for q in QUALITIES):
+                self.add_pane(p["quality"], bool(p.get("log")))
+        for k, v in meta.get("toggles", {}).items():
+            if k in self.actions:
+                self.actions[k].setChecked(bool(v))
+
+        how = "stored analysis" if stored else "recomputed"
+        self.statusBar().showMessage(f"Project loaded: {os.path.basename(path)} ({how}, "
+                                     f"{time.perf_counter() - t_start:.2f}s)")
 
     # -------- Quality / range / window --------
     def on_quality_changed(self, name: str):
@@ -407,18 +838,78 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
             self.nperseg = q.nperseg
             self.noverlap_ratio = q.noverlap_ratio
 
-        if self.audio:
+        if self.audio and self._recorder is None:
             self.statusBar().showMessage(f"Recomputing spectrogram ({self.quality_name})…")
             QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.CursorShape.WaitCursor)
             try:
-                self.f, self.t, self.S_db, self.db_vmin, self.db_vmax = compute_spectrogram_full(
-                    self.audio.y, self.audio.sr, self.nperseg, self.noverlap_ratio
-                )
+                self._compute_spectrogram()
+                self._spectrogram_changed()
                 self.render_tile_from_viewbox()
             finally:
                 QtWidgets.QApplication.restoreOverrideCursor()
             self.statusBar().showMessage("OK.")
 
+    def _analysis(self, nperseg: int, noverlap_ratio: float):
+        # (f, t, S_db, vmin, vmax) of the current audio and channel, computed once
+        key = (nperseg, noverlap_ratio, self.channel)
+        if key not in self._analyses:
+            a = self.audio
+            if self.channel != "mid" and a.channels is not None:
+                f, t, views, vmin, vmax = compute_spectrogram_channels(a.channels, a.sr, nperseg, noverlap_ratio)
+                for view, S_db in views.items():
+                    self._analyses[(nperseg, noverlap_ratio, view)] = (f, t, S_db, vmin, vmax)
+            else:
+                # the mono mix is the mid view: one FFT pass is enough until another view is asked for
+                self._analyses[key] = compute_spectrogram_full(a.y, a.sr, nperseg, noverlap_ratio)
+        return self._analyses[key]
+
+    def _forget_analyses(self):
+        # the audio changed
+        self._analyses.clear()
+        self.tiles.clear()
+
+    def _prune_analyses(self):
+        # keep the qualities still shown (all channel views of them, they come together)
+        shown = {(self.nperseg, self.noverlap_ratio)}
+        shown.update((p.quality.nperseg, p.quality.noverlap_ratio) for p in self.panes)
+        for key in [k for k in self._analyses if k[:2] not in shown]:
+            del self._analyses[key]
+        self.tiles.retain(lambda k: k[0] in self._analyses)
+
+    def _compute_spectrogram(self):
+        # f/t/S_db of the current audio, quality and channel view
+        self.f, self.t, self.S_db, self.db_vmin, self.db_vmax = self._analysis(self.nperseg, self.noverlap_ratio)
+
+    def _analysis_key(self):
+        return (self.nperseg, self.noverlap_ratio, self.channel)
+
+    def _sync_channel_combo(self):
+        # channel views only for multichannel tracks; mono ones (and takes) show the mix
+        stereo = bool(self.audio) and self.audio.channels is not None
+        if not stereo:
+            self.channel = "mid"
+        self.combo_channel.blockSignals(True)
+        self.combo_channel.setCurrentIndex(max(0, self.combo_channel.findData(self.channel)))
+        self.combo_channel.blockSignals(False)
+        self.combo_channel.setEnabled(stereo)
+
+    def on_channel_changed(self, _index: int):
+        self.channel = self.combo_channel.currentData()
+        if not self.audio or self._recorder is not None or self.S_db is None:
+            return
+        if self._analysis_key() in self._analyses:
+            self._compute_spectrogram()
+        else:
+            self.statusBar().showMessage("Computing channel views…")
+            QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.CursorShape.WaitCursor)
+            try:
+                self._compute_spectrogram()
+            finally:
+                QtWidgets.QApplication.restoreOverrideCursor()
+        self._spectrogram_changed()
+        self.render_tile_from_viewbox()
+        self.statusBar().showMessage(f"Channel: {self.combo_channel.currentText()}")
+
     def on_hard_freq_changed(self):
         fmin = float(self.spin_hfmin.value())
         fmax = float(self.spin_hfmax.value())
@@ -440,6 +931,7 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
             finally:
                 self._suspend_render = False
             self.render_tile_from_viewbox()
+            self._update_spectrum(force=True)
 
     def on_window_changed(self):
         if not self.audio:
@@ -467,6 +959,8 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
         dur = self.audio.duration
         self.vb.set_hard_limits(0.0, dur, self.hard_fmin, self.hard_fmax)
         self.vb.setLimits(xMin=0.0, xMax=dur, yMin=self.hard_fmin, yMax=self.hard_fmax, minYRange=1.0)
+        for pane in self.panes:
+            pane.set_freq_limits(self.hard_fmin, self.hard_fmax)
 
     def configure_scrollbars_from_view(self):
         if not self.audio:
@@ -546,6 +1040,8 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
 
     # -------- render tile --------
     def on_view_range_changed(self, vb, ranges):
+        self._sync_pane_x()
+        self._sync_overview()
         if not self.audio:
             return
         if self._suspend_render:
@@ -556,7 +1052,7 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
                 self._updating_scroll = False
             self.plot.repaint()
             return
-        self.render_tile_from_viewbox()
+        self._render_timer.start()
 
     def render_tile_from_viewbox(self):
         if self._in_render:
@@ -591,30 +1087,235 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
             fi0 = max(0, min(fi0, len(self.f) - 2))
             fi1 = max(fi0 + 2, min(fi1, len(self.f)))
 
-            region_db = self.S_db[fi0:fi1, ti0:ti1]
-            img_u8 = render_region_to_u8(region_db, self.db_vmin, self.db_vmax, gamma=self.gamma)
+            if self._recorder is None:
+                img = self._tile_image(self._analysis_key(), self.S_db, self.db_vmin, self.db_vmax,
+                                       slice(fi0, fi1), slice(ti0, ti1))
+                img_u8 = img[fi0:fi1, ti0:ti1]
+            else:
+                # the take grows every frame: nothing worth caching
+                img_u8 = render_region_to_u8(self.S_db[fi0:fi1, ti0:ti1], self.db_vmin, self.db_vmax, gamma=self.gamma)
             img_u8 = np.flipud(img_u8)
             self.img.setImage(img_u8, autoLevels=False)
 
-            t_slice = self.t[ti0:ti1]
-            f_slice = self.f[fi0:fi1]
-            dt = float((t_slice[-1] - t_slice[0]) / max(1, len(t_slice) - 1))
-            df = float((f_slice[-1] - f_slice[0]) / max(1, len(f_slice) - 1))
-
+            # pixels centred on their column time and bin frequency, so panes of other
+            # resolutions line up
+            dt, df = self._cell_size(self.t, self.f)
             tr = QtGui.QTransform()
-            tr.translate(x0, y1)
+            tr.translate(float(self.t[ti0]) - dt / 2, float(self.f[fi1 - 1]) + df / 2)
             tr.scale(dt, -df)
             self.img.setTransform(tr)
 
+            if self.chroma is not None and self.chroma_plot.isVisible():
+                # same columns and mapping as the spectrogram tile
+                c_u8 = np.clip(self.chroma[:, ti0:ti1] * 255.0, 0, 255).astype(np.uint8)
+                self.chroma_img.setImage(c_u8, autoLevels=False, levels=(0, 255))
+                ctr = QtGui.QTransform()
+                ctr.translate(float(self.t[ti0]) - dt / 2, 0.0)
+                ctr.scale(dt, 1.0)
+                self.chroma_img.setTransform(ctr)
+                self.chroma_plot.setXRange(x0, x1, padding=0.0)
+
             self._updating_scroll = True
             try:
                 self.configure_scrollbars_from_view()
             finally:
                 self._updating_scroll = False
 
+            for pane in self.panes:
+                self._render_pane(pane, x0, x1)
         finally:
             self._in_render = False
 
+    @staticmethod
+    def _cell_size(t: np.ndarray, f: np.ndarray):
+        dt = float(t[1] - t[0]) if len(t) > 1 else 1.0
+        return dt, float(f[1] - f[0])
+
+    def _tile_image(self, key, S_db, vmin: float, vmax: float, rows: slice, cols: slice):
+        # cached display image of an analysis (harmonic rows in HPSS mode), rows x cols converted
+        harm = self._hpss_cache.get(key) if self.actions["hpss"].isChecked() else None
+        if harm is None:
+            def source(r0, r1, c0, c1):
+                return S_db[r0:r1, c0:c1]
+        else:
+            n, H = harm
+
+            def source(r0, r1, c0, c1):
+                # separated rows stop at a few kHz; S_db above them
+                if r1 <= n:
+                    return H[r0:r1, c0:c1]
+                if r0 >= n:
+                    return S_db[r0:r1, c0:c1]
+                return np.vstack((H[r0:n, c0:c1], S_db[n:r1, c0:c1]))
+        return self.tiles.image((key, harm is not None, vmin, vmax, self.gamma), S_db.shape, source,
+                                rows, cols, vmin, vmax, self.gamma)
+
+    # -------- overview --------
+    def _refresh_overview(self, *_):
+        vb = self.overview_plot.getViewBox()
+        if self.waveform is None or not self.audio or self._recorder is not None:
+            self.overview_curve.setData([], [])
+            return
+        # one min/max pair per pixel column of the strip
+        n = max(2, int(vb.width()))
+        mins, maxs = self.waveform.envelope(0, self.waveform.n_samples, n)
+        x = np.repeat((np.arange(n) + 0.5) * (self.audio.duration / n), 2)
+        y = np.empty(2 * n, dtype=np.float32)
+        y[0::2], y[1::2] = mins, maxs
+        self.overview_curve.setData(x, y)
+        peak = max(1e-6, float(np.max(np.abs(y))))
+        vb.setRange(xRange=(0.0, self.audio.duration), yRange=(-peak, peak), padding=0.0)
+        self._sync_overview()
+
+    def _sync_overview(self):
+        if self._linking_x:
+            return
+        xr = self.vb.viewRange()[0]
+        self._linking_x = True
+        try:
+            self.overview_view.setRegion((float(xr[0]), float(xr[1])))
+        finally:
+            self._linking_x = False
+
+    def on_overview_region_changed(self):
+        # dragging the view box (or one of its edges) moves (or zooms) the main view
+        if self._linking_x or not self.audio:
+            return
+        a, b = self.overview_view.getRegion()
+        self._linking_x = True
+        try:
+            self.vb.setXRange(float(min(a, b)), float(max(a, b)), padding=0.0)
+            self.vb.clamp_view()
+        finally:
+            self._linking_x = False
+        self._sync_pane_x()
+
+    def on_overview_clicked(self, event):
+        # click outside the view box: centre the view there
+        if not self.audio or event.button() != QtCore.Qt.MouseButton.LeftButton:
+            return
+        t = float(self.overview_plot.getViewBox().mapSceneToView(event.scenePos()).x())
+        a, b = self.overview_view.getRegion()
+        if a <= t <= b:
+            return
+        xr = self.vb.viewRange()[0]
+        half = 0.5 * float(xr[1] - xr[0])
+        self.vb.setXRange(t - half, t + half, padding=0.0)
+        self.vb.clamp_view()
+
+    def _refresh_overview_loop(self):
+        if self.loop_region is None:
+            self.overview_loop.setVisible(False)
+            return
+        self.overview_loop.setRegion(self.loop_region.getRegion())
+        self.overview_loop.setVisible(True)
+
+    # -------- extra panes --------
+    def on_add_pane(self):
+        if len(self.panes) >= MAX_PANES:
+            self.statusBar().showMessage(f"At most {MAX_PANES} extra panes")
+            return
+        # the other end of the quality list by default: timing vs pitch
+        names = [q.name for q in QUALITIES]
+        name = names[0] if self.quality_name != names[0] else names[-1]
+        self.add_pane(name)
+
+    def add_pane(self, quality_name: str, log_freq: bool = False) -> SpectroPane:
+        pane = SpectroPane(self.lut, quality_name)
+        if log_freq:
+            pane.combo_axis.setCurrentText("Log")
+        pane.set_freq_limits(self.hard_fmin, self.hard_fmax)
+        (xr, yr) = self.vb.viewRange()
+        pane.vb.setXRange(float(xr[0]), float(xr[1]), padding=0.0)
+        pane.set_freq_range(float(yr[0]), float(yr[1]))
+        pane.settingsChanged.connect(self.on_pane_settings_changed)
+        pane.closeRequested.connect(self.remove_pane)
+        pane.vb.sigXRangeChanged.connect(self._on_pane_x_changed)
+        pane.vb.sigYRangeChanged.connect(lambda *_: self._render_timer.start())
+        self.panes.append(pane)
+        self.splitter.addWidget(pane)
+        self.on_pane_settings_changed(pane)
+        return pane
+
+    def _on_pane_x_changed(self, vb, xr):
+        # time axes linked by value (pyqtgraph's own links align views by screen position)
+        if self._linking_x:
+            return
+        self._linking_x = True
+        try:
+            self.vb.setXRange(float(xr[0]), float(xr[1]), padding=0.0)
+            self.vb.clamp_view()
+        finally:
+            self._linking_x = False
+        self._sync_overview()
+
+    def _sync_pane_x(self):
+        if self._linking_x or not self.panes:
+            return
+        self._linking_x = True
+        try:
+            xr = self.vb.viewRange()[0]
+            for pane in self.panes:
+                pane.vb.setXRange(float(xr[0]), float(xr[1]), padding=0.0)
+        finally:
+            self._linking_x = False
+
+    def remove_pane(self, pane: SpectroPane):
+        self.panes.remove(pane)
+        pane.setParent(None)
+        pane.deleteLater()
+        self._prune_analyses()
+
+    def on_pane_settings_changed(self, pane: SpectroPane):
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.CursorShape.WaitCursor)
+        try:
+            self._prepare_panes()
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+        self._render_timer.start()
+
+    def _prepare_panes(self):
+        # analyses the panes need (shared with the main view and between panes)
+        if self.audio and self._recorder is None and self.S_db is not None:
+            for pane in self.panes:
+                q = pane.quality
+                self._analysis(q.nperseg, q.noverlap_ratio)
+        self._prune_analyses()
+
+    def _render_pane(self, pane: SpectroPane, x0: float, x1: float):
+        q = pane.quality
+        key = (q.nperseg, q.noverlap_ratio, self.channel)
+        if self._recorder is not None or key not in self._analyses:
+            pane.img.clear()
+            return
+        f, t, S_db, vmin, vmax = self._analyses[key]
+        ti0 = max(0, min(int(np.searchsorted(t, x0, side="left")), len(t) - 2))
+        ti1 = max(ti0 + 2, min(int(np.searchsorted(t, x1, side="right")), len(t)))
+        dt, df = self._cell_size(t, f)
+        f0, f1 = pane.freq_range()
+        f0 = max(self.hard_fmin, min(f0, self.hard_fmax))
+        f1 = max(f0 + 1.0, min(f1, self.hard_fmax))
+
+        tr = QtGui.QTransform()
+        if pane.log_freq:
+            # one image row per screen pixel, each showing its nearest bin: O(pixels) per frame
+            y0, y1 = np.log2(max(f0, 1.0)), np.log2(f1)
+            h = max(2, int(pane.vb.height()))
+            idx = np.clip(np.rint(2.0 ** np.linspace(y1, y0, h) / df).astype(np.intp), 0, len(f) - 1)
+            img = self._tile_image(key, S_db, vmin, vmax, slice(int(idx[-1]), int(idx[0]) + 1), slice(ti0, ti1))
+            img_u8 = img[idx, ti0:ti1]
+            tr.translate(float(t[ti0]) - dt / 2, y1)
+            tr.scale(dt, -(y1 - y0) / h)
+        else:
+            fi0 = max(0, min(int(np.searchsorted(f, f0, side="left")), len(f) - 2))
+            fi1 = max(fi0 + 2, min(int(np.searchsorted(f, f1, side="right")), len(f)))
+            img = self._tile_image(key, S_db, vmin, vmax, slice(fi0, fi1), slice(ti0, ti1))
+            img_u8 = np.flipud(img[fi0:fi1, ti0:ti1])
+            tr.translate(float(t[ti0]) - dt / 2, float(f[fi1 - 1]) + df / 2)
+            tr.scale(dt, -df)
+        pane.img.setImage(img_u8, autoLevels=False)
+        pane.img.setTransform(tr)
+
     # -------- clicks / crosses --------
     def on_scene_clicked(self, event):
         if not self.audio:
@@ -641,9 +1342,18 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
                     self._loop_anchor_t = float(self.play_line.value())
                     return
 
-            self.set_playhead(t_clicked)
+            if event.modifiers() & QtCore.Qt.KeyboardModifier.ControlModifier:
+                self.select_cross_at(t_clicked, f_clicked)
+                return
+            if event.modifiers() & QtCore.Qt.KeyboardModifier.ShiftModifier and self.note_events:
+                self.select_note_event_at(t_clicked, f_clicked)
+                return
+            self.set_playhead(self._snap_time(t_clicked))
         elif event.button() == QtCore.Qt.MouseButton.RightButton:
-            self.add_cross(t_clicked, f_clicked)
+            if event.modifiers() & QtCore.Qt.KeyboardModifier.ShiftModifier:
+                self.remove_note_event_at(t_clicked, f_clicked)
+                return
+            self.add_cross(self._snap_time(t_clicked), self._snap_freq(t_clicked, f_clicked))
 
     def on_scene_mouse_moved(self, pos):
         if not (self.audio and self.actions["loop"].isChecked() and self._loop_dragging):
@@ -660,55 +1370,467 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
         dur = self.audio.duration
         t = max(0.0, min(t, dur))
         f = max(self.hard_fmin, min(f, self.hard_fmax))
-        self.cross_points.append((t, f))
+        _, _, mi = freq_to_nearest_note(f)
+        cid = self.crosses.add(t, f, mi)
         self._refresh_cross_items()
-        self._log_crosses()
+        self.chat.appendPlainText(self._cross_log_line(cid, t, f))
         self._update_guitar_view()
+        if self._cross_future is not None:
+            self._request_cross_audio()  # the pending render predates this cross
+        elif self.cross_audio is not None:
+            add_note(self.cross_audio, render_note(mi, self.audio.sr), t, self.audio.sr)
 
     def clear_crosses(self):
-        self.cross_points = []
+        self.crosses.clear()
+        self._selected_cross = None
         self._refresh_cross_items()
         self.chat.appendPlainText("Crosses erased.\n")
         self._update_guitar_view()
+        self._cancel_cross_render()
+        if self.cross_audio is not None:
+            self.cross_audio[:] = 0.0
+
+    def select_cross_at(self, t: float, f: float):
+        px_t, px_f = self.vb.viewPixelSize()
+        i = self.crosses.nearest(t, f, 8 * px_t, 8 * px_f)
+        self._selected_cross = None if i is None else int(self.crosses.ids[i])
+        self._refresh_selected_cross()
+        if i is not None:
+            note, _, _ = freq_to_nearest_note(float(self.crosses.f[i]))
+            self.statusBar().showMessage(f"Cross {self._selected_cross}: {note} at {self.crosses.t[i]:.3f}s — Del removes it")
+
+    def delete_selected_cross(self):
+        i = None if self._selected_cross is None else self.crosses.index_of(self._selected_cross)
+        if i is None:
+            return
+        self.crosses.remove(i)
+        self.chat.appendPlainText(f"Cross {self._selected_cross} removed.")
+        self._selected_cross = None
+        self._refresh_cross_items()
+        self._update_guitar_view()
+        if self.actions["hear_cross"].isChecked():
+            # notes have random plucks: render again rather than subtract
+            self._request_cross_audio()
 
     def _refresh_cross_items(self):
-        if not self.cross_points:
-            self.cross_outline.setData([], [])
-            self.cross_inner.setData([], [])
-            return
-        xs = [p[0] for p in self.cross_points]
-        ys = [p[1] for p in self.cross_points]
-        self.cross_outline.setData(xs, ys)
-        self.cross_inner.setData(xs, ys)
-
-    def _log_crosses(self):
-        lines = []
-        for i, (t, f) in enumerate(self.cross_points, start=1):
-            note, target, _ = freq_to_nearest_note(f)
-            lines.append(f"{i}) t={t:.3f}s | f={f:.2f} Hz -> {note} (≈{target:.2f} Hz)")
-        self.chat.appendPlainText("\n".join(lines) + "\n")
+        # the item reads the store's arrays directly
+        self.cross_item.setData(self.crosses.t, self.crosses.f)
+        self._refresh_selected_cross()
+
+    def _refresh_selected_cross(self):
+        i = None if self._selected_cross is None else self.crosses.index_of(self._selected_cross)
+        self.cross_item.setSelected(i)
+
+    @staticmethod
+    def _cross_log_line(cid: int, t: float, f: float) -> str:
+        note, target, _ = freq_to_nearest_note(f)
+        return f"{cid}) t={t:.3f}s | f={f:.2f} Hz -> {note} (≈{target:.2f} Hz)"
 
     def _selected_midis_from_crosses(self):
-        out = []
-        for _, f in self.cross_points:
-            _, _, mi = freq_to_nearest_note(f)
-            out.append(mi)
-        return list(dict.fromkeys(out))
+        return list(dict.fromkeys(self.crosses.midi.tolist()))
+
+    def _cross_events(self):
+        return self.crosses.events()
+
+    def _request_cross_audio(self, export_path: str | None = None):
+        # render the whole sequence in the worker thread; a newer request replaces a pending one
+        if self._cross_pending is not None and export_path is None:
+            export_path = self._cross_pending[1]
+        self._cancel_cross_render()
+        self._cross_future = self._cross_pool.submit(
+            render_sequence, self._cross_events(), self.audio.sr, len(self.audio.y))
+        self._cross_pending = (self.audio, export_path)
+        self.statusBar().showMessage(f"Rendering {len(self.crosses)} crosses…")
+
+    def _cancel_cross_render(self):
+        # a render that already started runs to its end, its result is dropped
+        if self._cross_future is not None:
+            self._cross_future.cancel()
+        self._cross_future = self._cross_pending = None
+
+    def _poll_cross_audio(self):
+        fut = self._cross_future
+        if fut is None or not fut.done():
+            return
+        audio, export_path = self._cross_pending
+        self._cross_future = self._cross_pending = None
+        if fut.cancelled() or audio is not self.audio:
+            return
+        try:
+            x = fut.result()
+        except Exception as e:
+            self.statusBar().showMessage(f"Cross rendering error: {e}")
+            return
+        if self.actions["hear_cross"].isChecked():
+            self.cross_audio = x
+            self.player.set_overlay(x)
+            self.statusBar().showMessage("Crosses mixed over the track")
+        if export_path:
+            self._export_cross_audio(export_path, x)
+
+    def on_toggle_hear_crosses(self, checked: bool):
+        if not checked or not self.audio:
+            self.cross_audio = None
+            self.player.set_overlay(None)
+            self.actions["hear_cross"].setChecked(False)
+            if self._cross_pending is not None and not self._cross_pending[1]:
+                self._cancel_cross_render()
+            return
+        self._request_cross_audio()
+
+    def on_export_crosses(self):
+        if not self.audio:
+            return
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export crosses", "crosses.wav", "Audio (*.wav *.flac);;All (*.*)"
+        )
+        if not path:
+            return
+        if self.cross_audio is not None and self._cross_future is None:
+            self._export_cross_audio(path, self.cross_audio)
+        else:
+            self._request_cross_audio(export_path=path)
+
+    def _export_cross_audio(self, path: str, x: np.ndarray):
+        try:
+            save_audio_file(path, x, self.audio.sr)
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Export error", str(e))
+            return
+        self.statusBar().showMessage(f"Exported: {os.path.basename(path)}")
+
+    # -------- analyses of the current spectrogram --------
+    def _spectrogram_changed(self):
+        # new f/t/S_db (load, quality, recording): everything derived from it
+        self._update_onsets()
+        self.peaks = PeakIndex(self.f, self.t, self.S_db, PEAK_INDEX_FMAX, PEAK_FLOOR_DB)
+        self._update_chroma()
+        self._update_beats()
+        self._update_hpss()
+        self._prepare_panes()
+        self._update_spectrum(force=True)
+
+    def _update_chroma(self):
+        if self.actions["chroma"].isChecked() and self.S_db is not None and self._recorder is None:
+            self.chroma = chromagram(self.f, self.S_db)
+        else:
+            self.chroma = None
+            self.chroma_img.clear()
+
+    def on_toggle_chroma(self, checked: bool):
+        self.chroma_plot.setVisible(checked)
+        if checked and self.chroma is None:
+            QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.CursorShape.WaitCursor)
+            try:
+                self._update_chroma()
+            finally:
+                QtWidgets.QApplication.restoreOverrideCursor()
+        elif not checked:
+            self._update_chroma()
+        self.render_tile_from_viewbox()
+
+    def _snap_freq(self, t: float, f: float, px_tol: float = 10.0) -> float:
+        if not self.actions["snap_peaks"].isChecked():
+            return f
+        tol = px_tol * float(self.vb.viewPixelSize()[1])
+        snapped = self.peaks.strongest_near(t, f, tol)
+        return f if snapped is None else snapped
+
+    # -------- spectrum at the playhead --------
+    def _update_spectrum(self, force: bool = False):
+        # the S_db column nearest the playhead, labelled from the peak index: no FFT here
+        if not self.dock_spectrum.isVisible() or self.S_db is None or self.t is None or len(self.t) == 0:
+            if force:
+                self._spectrum_col = None
+                self.spectrum_curve.setData([], [])
+                self.spectrum_peaks.setData([], [])
+                for label in self.spectrum_labels:
+                    label.setVisible(False)
+            return
+        t = float(self.player.playhead)
+        k = int(np.clip(np.searchsorted(self.t, t), 0, len(self.t) - 1))
+        if k > 0 and abs(self.t[k - 1] - t) < abs(self.t[k] - t):
+            k -= 1
+        if k == self._spectrum_col and not force:
+            return
+        self._spectrum_col = k
+
+        r0 = int(np.searchsorted(self.f, self.hard_fmin))
+        r1 = int(np.searchsorted(self.f, self.hard_fmax, side="right"))
+        col = self.S_db[r0:r1, k]
+        self.spectrum_curve.setData(self.f[r0:r1], col)
+        if force:
+            self.spectrum_plot.setXRange(self.hard_fmin, self.hard_fmax, padding=0.0)
+        # room above the loudest peak for its label
+        top = max(float(self.db_vmax), float(col.max()) if len(col) else float(self.db_vmax))
+        self.spectrum_plot.setYRange(self.db_vmin, top + 25.0, padding=0.0)
+
+        pf, pdb = self.peaks.column(k) if k < len(self.peaks) else (np.zeros(0), np.zeros(0))
+        keep = (pf >= self.hard_fmin) & (pf <= self.hard_fmax)
+        pf, pdb = pf[keep], pdb[keep]
+        if len(pf) > SPECTRUM_LABELS:
+            top = np.argpartition(pdb, -SPECTRUM_LABELS)[-SPECTRUM_LABELS:]
+            pf, pdb = pf[top], pdb[top]
+        self.spectrum_peaks.setData(pf, pdb)
+        for i, label in enumerate(self.spectrum_labels):
+            if i < len(pf):
+                name, _, _ = freq_to_nearest_note(float(pf[i]))
+                label.setText(f"{name}\n{pf[i]:.1f}")
+                label.setPos(float(pf[i]), float(pdb[i]))
+                label.setVisible(True)
+            else:
+                label.setVisible(False)
+
+    # -------- onsets --------
+    def _update_onsets(self):
+        self.onsets = OnsetIndex(spectral_flux_onsets(self.f, self.t, self.S_db))
+        self._refresh_onset_lines()
+
+    def _refresh_onset_lines(self, *_):
+        if self.actions["onsets"].isChecked():
+            self.onset_lines.setData(self.onsets.times)
+        else:
+            self.onset_lines.clear()
+
+    def _snap_time(self, t: float, px_tol: float = 12.0) -> float:
+        if not self.actions["snap_onsets"].isChecked():
+            return t
+        tol = px_tol * float(self.vb.viewPixelSize()[0])
+        snapped = self.onsets.nearest(t, max_dist=tol)
+        return t if snapped is None else snapped
+
+    # -------- beat grid --------
+    def _update_beats(self, *_):
+        if not self.actions["beats"].isChecked() or self.S_db is None or self._recorder is not None:
+            self.beat_grid = None
+            self.beat_lines.clear()
+            return
+        key = self._analysis_key()
+        grid = self._beat_cache.get(key)
+        if grid is not None:
+            self._show_beats(grid)
+            return
+        self.beat_grid = None
+        self.beat_lines.clear()
+        if self._beat_future is not None:
+            if self._beat_pending[0] is self.audio and self._beat_pending[1] == key:
+                return
+            self._cancel_beats()
+        self._beat_future = self._beat_pool.submit(track_beats, self.f, self.t, self.S_db, BEATS_PER_BAR)
+        self._beat_pending = (self.audio, key)
+        self.statusBar().showMessage("Tracking beats…")
+
+    def _cancel_beats(self):
+        # a stale job that already started runs to its end, its result is dropped
+        if self._beat_future is not None:
+            self._beat_future.cancel()
+        self._beat_future = self._beat_pending = None
+
+    def _poll_beats(self):
+        fut = self._beat_future
+        if fut is None or not fut.done():
+            return
+        audio, key = self._beat_pending
+        self._beat_future = self._beat_pending = None
+        if fut.cancelled() or audio is not self.audio:
+            return
+        try:
+            grid = fut.result()
+        except Exception as e:
+            self.statusBar().showMessage(f"Beat tracking error: {e}")
+            return
+        self._beat_cache[key] = grid
+        if key == self._analysis_key() and self.actions["beats"].isChecked():
+            self._show_beats(grid)
+
+    def _show_beats(self, grid):
+        self.beat_grid = grid
+        bars = np.zeros(len(grid.beats), dtype=bool)
+        bars[grid.downbeat::grid.beats_per_bar] = True
+        self.beat_lines.setData(grid.beats, strong=bars)
+        if grid.bpm > 0:
+            self.statusBar().showMessage(f"≈ {grid.bpm:.1f} bpm — {len(grid.beats)} beats, "
+                                         f"{int(bars.sum())} bars of {grid.beats_per_bar}")
+        else:
+            self.statusBar().showMessage("No tempo found")
+
+    # -------- harmonic / percussive --------
+    def on_toggle_hpss(self, checked: bool):
+        self._update_hpss()
+        self.render_tile_from_viewbox()
+
+    def _update_hpss(self):
+        if not self.actions["hpss"].isChecked() or self.S_db is None or self._recorder is not None:
+            return
+        key = self._analysis_key()
+        if key in self._hpss_cache:
+            return
+        if self._hpss_job is not None:
+            if self._hpss_pending[0] is self.audio and self._hpss_pending[1] == key:
+                return
+            self._cancel_hpss()
+        # the job keeps its own copy of the rows it needs
+        self._hpss_job = HpssJob(self.f, self.t, self.S_db, self.db_vmin, HPSS_FMAX)
+        self._hpss_pending = (self.audio, key)
+        self.statusBar().showMessage("Separating harmonics…")
+
+    def _cancel_hpss(self):
+        if self._hpss_job is not None:
+            self._hpss_job.cancel()
+        self._hpss_job = self._hpss_pending = None
+
+    def _poll_hpss(self):
+        job = self._hpss_job
+        if job is None:
+            return
+        if not job.poll():
+            self.statusBar().showMessage(f"Separating harmonics… {job.progress * 100:.0f}%")
+            return
+        audio, key = self._hpss_pending
+        self._hpss_job = self._hpss_pending = None
+        if audio is not self.audio:
+            return
+        if job.error:
+            self.statusBar().showMessage(f"HPSS error: {job.error}")
+            return
+        self._hpss_cache[key] = (job.rows, job.result)
+        self.statusBar().showMessage("Harmonic part ready")
+        if key == self._analysis_key() and self.actions["hpss"].isChecked():
+            self.render_tile_from_viewbox()
+
+    # -------- transcription --------
+    def on_transcribe(self):
+        if self._transcribe_job is not None:
+            self._cancel_transcription()
+            self.statusBar().showMessage("Transcription cancelled")
+            return
+        if not self.audio or len(self.audio.y) == 0:
+            return
+        self._transcribe_job = TranscriptionJob(self.audio.y, self.audio.sr)
+        self._drop_event_edit()  # the result replaces the list the indices point into
+        self.transcribe_timer.start()
+        self.statusBar().showMessage("Transcribing… 0%")
+
+    def _cancel_transcription(self):
+        self.transcribe_timer.stop()
+        if self._transcribe_job is not None:
+            self._transcribe_job.cancel()
+            self._transcribe_job = None
+
+    def on_transcribe_tick(self):
+        job = self._transcribe_job
+        if job is None:
+            self.transcribe_timer.stop()
+            return
+        if not job.poll():
+            self.statusBar().showMessage(f"Transcribing… {job.progress * 100:.0f}%")
+            return
+        self.transcribe_timer.stop()
+        self._transcribe_job = None
+        if job.error:
+            self.statusBar().showMessage(f"Transcription error: {job.error}")
+            return
+        self.note_events = job.events
+        self._drop_event_edit()
+        self._refresh_note_events()
+        self.statusBar().showMessage(f"{len(self.note_events)} note events — Shift+click selects one, Shift+right click removes one")
+
+    def _refresh_note_events(self):
+        ev = self.note_events
+        self.events_item.setData([e.onset for e in ev], [e.offset for e in ev],
+                                 [midi_to_freq(e.midi) for e in ev], [e.strength for e in ev])
+
+    def remove_note_event_at(self, t: float, f: float):
+        # tolerance: a few pixels around the bar
+        px_t = self.vb.viewPixelSize()[0]
+        px_f = self.vb.viewPixelSize()[1]
+        i = self.events_item.index_at(t, f, 4 * px_t, 6 * px_f)
+        if i is None:
+            return
+        del self.note_events[i]
+        sel = self._selected_event
+        self._select_note_event(None if sel is None or sel == i else sel - (sel > i))
+        self._refresh_note_events()
+
+    def select_note_event_at(self, t: float, f: float):
+        px_t, px_f = self.vb.viewPixelSize()
+        self._select_note_event(self.events_item.index_at(t, f, 4 * px_t, 6 * px_f))
+        self._show_selected_event()
+
+    def _select_note_event(self, i):
+        self._selected_event = i
+        self.events_item.setSelected(i)
+
+    def _drop_event_edit(self):
+        self._event_drag = None
+        self._select_note_event(None)
+
+    def _show_selected_event(self):
+        if self._selected_event is None:
+            return
+        ev = self.note_events[self._selected_event]
+        self.statusBar().showMessage(
+            f"Note event {midi_to_name(ev.midi)}: {ev.onset:.3f}–{ev.offset:.3f}s"
+            " — Shift+drag an end to move it, Alt+Up/Down changes the pitch")
+
+    def nudge_selected_event(self, semitones: int):
+        if self._selected_event is None or self._transcribe_job is not None:
+            return
+        ev = self.note_events[self._selected_event]
+        ev.midi = int(np.clip(ev.midi + semitones, 0, 127))
+        self._refresh_note_events()
+        self._show_selected_event()
+
+    def clear_note_events(self):
+        self.note_events = []
+        self._drop_event_edit()
+        self.events_item.clear()
+
+    def on_events_to_crosses(self):
+        if not self.note_events or not self.audio:
+            return
+        # one cross per event at its onset (inside the frequency limits); crosses stay editable/playable as usual
+        ev = [(e.onset, midi_to_freq(e.midi), e.midi) for e in self.note_events]
+        ev = [x for x in ev if self.hard_fmin <= x[1] <= self.hard_fmax]
+        added = len(ev)
+        if not ev:
+            self.statusBar().showMessage("No event inside the frequency limits")
+            return
+        ts, fs, ms = (np.array(c) for c in zip(*ev))
+        ids = self.crosses.extend(ts, fs, ms)
+        self._refresh_cross_items()
+        self.chat.appendPlainText("\n".join(self._cross_log_line(c, t, f) for c, t, f in zip(ids, ts, fs)))
+        self._update_guitar_view()
+        if self.actions["hear_cross"].isChecked():
+            self._request_cross_audio()
+        self.statusBar().showMessage(f"{added} events added as crosses")
 
     # -------- guitar view --------
     def on_guitar_view(self):
         if self.guitar_window is None:
             self.guitar_window = GuitarViewWindow()
             self.guitar_window.resize(1200, 420)
+            self.guitar_window.tuningChanged.connect(self.on_guitar_tuning_changed)
         self.guitar_window.show()
         self.guitar_window.raise_()
         self.guitar_window.activateWindow()
         self._update_guitar_view()
 
+    def on_guitar_tuning_changed(self):
+        self._attach_chord_detector()
+        self._update_guitar_view()
+
     def _update_guitar_view(self):
         if self.guitar_window is None:
             return
         self.guitar_window.set_selected_midis(self._selected_midis_from_crosses())
+        self._fingering_timer.start()
+
+    def _refresh_fingering(self):
+        if self.guitar_window is None:
+            return
+        events = sorted(self._cross_events())
+        self.guitar_window.set_fingering(solve_fingering(events, self.guitar_window.grid.table))
 
     # -------- loop --------
     def _ensure_loop_region(self, a: float, b: float):
@@ -726,6 +1848,7 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
 
         # sync player
         self.player.set_loop(True, a, b)
+        self._refresh_overview_loop()
 
     def on_loop_region_changed(self):
         if self.loop_region is None:
@@ -733,6 +1856,7 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
         a, b = self.loop_region.getRegion()
         a, b = float(min(a, b)), float(max(a, b))
         self.player.set_loop(True, a, b)
+        self._refresh_overview_loop()
 
     def remove_loop_region(self):
         if self.loop_region is not None:
@@ -742,6 +1866,7 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
                 pass
         self.loop_region = None
         self.player.set_loop(False, None, None)
+        self._refresh_overview_loop()
 
     def on_toggle_loop(self, checked: bool):
         if not checked:
@@ -760,7 +1885,7 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
             self.on_play()
 
     def on_play(self):
-        if not self.audio:
+        if not self.audio or self._recorder is not None:
             return
         try:
             self.player.play()
@@ -797,29 +1922,44 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
         self.mic_enabled = True
         self.actions["mic"].setChecked(True)
 
+        # analysis runs on its own thread, fed through a ring buffer: no block is dropped
+        self._mic_worker = MicAnalyzer(
+            self.mic_sr, self.mic_window, self.mic_hop,
+            self.mic_fmin, self.mic_fmax, self.mic_max_lines
+        )
+        self._mic_worker.start()
+        worker = self._mic_worker
+        self._attach_chord_detector()
+        self._setup_waterfall(worker)
+
         def mic_callback(indata, frames, time_info, status):
-            x = indata[:, 0].copy()
-            try:
-                self._mic_q.put_nowait(x)
-            except queue.Full:
-                pass
+            worker.push(indata[:, 0])
+            rec = self._recorder
+            if rec is not None:
+                rec.push(indata[:, 0])
 
         try:
             self._mic_stream = sd.InputStream(
-                channels=1, dtype="float32", samplerate=44100,
-                blocksize=4096, callback=mic_callback
+                channels=1, dtype="float32", samplerate=self.mic_sr,
+                blocksize=min(self.mic_hop, self.mic_window), callback=mic_callback
             )
             self._mic_stream.start()
             self.statusBar().showMessage("Mic ON")
         except Exception as e:
             self.mic_enabled = False
             self.actions["mic"].setChecked(False)
+            self._mic_worker.stop()
+            self._mic_worker = None
             self.statusBar().showMessage(f"Mic error: {e}")
 
     def stop_mic(self):
+        if self._recorder is not None:
+            self.actions["record"].setChecked(False)  # finishes the take
         self.mic_enabled = False
         self.actions["mic"].setChecked(False)
+        self._uncheck_mic_chords()  # chord detection only runs on the mic
         self._clear_mic_lines()
+        self.mic_pitch_label.setText("")
         try:
             if self._mic_stream:
                 self._mic_stream.stop()
@@ -827,68 +1967,276 @@ class TabSpectroMainWindow(QtWidgets.QMainWindow):
         except Exception:
             pass
         self._mic_stream = None
+        if self._mic_worker is not None:
+            self._mic_worker.stop()
+            self._mic_worker = None
         self.statusBar().showMessage("Mic OFF")
 
     def _clear_mic_lines(self):
-        for line in self._mic_lines:
-            try:
-                self.plot.removeItem(line)
-            except Exception:
-                pass
-        self._mic_lines = []
+        self.mic_lines.clear()
 
     def _draw_mic_lines(self, freqs, amps):
-        self._clear_mic_lines()
         if not freqs or not self.audio:
+            self._clear_mic_lines()
             return
 
+        f = np.array(freqs, dtype=np.float64)
         a = np.array(amps, dtype=np.float32)
         amax = float(np.max(a)) if len(a) else 1.0
         if amax <= 1e-12:
             amax = 1.0
         an = (a / amax).clip(0.0, 1.0)
 
-        for f0, strength in zip(freqs, an.tolist()):
-            if f0 < self.hard_fmin or f0 > self.hard_fmax:
-                continue
-            g = int(round(self.mic_base_green + strength * (self.mic_max_green - self.mic_base_green)))
-            alpha = int(round(self.mic_alpha_min + strength * (self.mic_alpha_max - self.mic_alpha_min)))
-            pen = pg.mkPen(QtGui.QColor(0, g, 0, alpha), width=self.mic_line_width)
-            line = pg.InfiniteLine(pos=float(f0), angle=0, movable=False, pen=pen)
-            line.setZValue(40)
-            self.plot.addItem(line)
-            self._mic_lines.append(line)
+        keep = (f >= self.hard_fmin) & (f <= self.hard_fmax)
+        # green and opacity follow the relative amplitude (palette built by the item)
+        self.mic_lines.setData(f[keep], an[keep])
+
+    def _setup_waterfall(self, worker: MicAnalyzer):
+        rows = len(worker.band_freqs)
+        cols = int(self.mic_waterfall_seconds * worker.fs / worker.hop)
+        if self.waterfall is None or self.waterfall.n_rows != rows or self.waterfall.n_cols != cols:
+            if self.waterfall is not None:
+                self.waterfall_plot.removeItem(self.waterfall)
+            self.waterfall = WaterfallItem(rows, cols, self.lut)
+            self.waterfall_plot.addItem(self.waterfall)
+        else:
+            self.waterfall.reset()
+        fmin, fmax = float(worker.band_freqs[0]), float(worker.band_freqs[-1])
+        self.waterfall.set_axes(self.mic_waterfall_seconds, fmin, fmax)
+        self.waterfall_plot.setRange(xRange=(-self.mic_waterfall_seconds, 0.0), yRange=(fmin, fmax), padding=0.0)
+        self.dock_waterfall.show()
 
     def on_mic_tick(self):
+        if not self.mic_enabled or self._mic_worker is None:
+            return
+        self._update_recording_view()
+        frames = self._mic_worker.drain()
+        if not frames:
+            return
+        # one new column per analysis hop, the image itself is only re-uploaded once per tick
+        spectra = [fr for fr in frames if fr.has_spectrum]
+        if self.waterfall is not None and spectra:
+            for fr in spectra:
+                self.waterfall.push(fr.column)
+            if self.dock_waterfall.isVisible():
+                self.waterfall.refresh()
+        if spectra:
+            self._draw_mic_lines(spectra[-1].freqs, spectra[-1].amps)
+        self._show_mic_pitch(frames[-1].f0, frames[-1].confidence)
+        self._show_mic_chord([fr.midis for fr in spectra if fr.midis is not None])
+
+    def on_toggle_mic_chords(self, checked: bool):
+        if checked:
+            self.on_guitar_view()
+            if not self.mic_enabled:
+                self.start_mic()
+            if not self.mic_enabled:
+                self._uncheck_mic_chords()  # no input device: start_mic said why
+                return
+            self._attach_chord_detector()
+        elif self._mic_worker is not None:
+            self._mic_worker.chord_detector = None
+        self._mic_chord_prev = []
+
+    def _uncheck_mic_chords(self):
+        self.actions["mic_chords"].blockSignals(True)
+        self.actions["mic_chords"].setChecked(False)
+        self.actions["mic_chords"].blockSignals(False)
+        self._mic_chord_prev = []
+
+    def _attach_chord_detector(self):
+        worker = self._mic_worker
+        if worker is None or self.guitar_window is None or not self.actions["mic_chords"].isChecked():
+            return
+        midis = self.guitar_window.grid.cell_midis()
+        det = self._chord_detector
+        # templates only depend on the fretboard notes and the analysis bins
+        if det is None or det.midis.tolist() != midis or not np.array_equal(det.freqs, worker.band_freqs):
+            det = ChordDetector(midis, worker.band_freqs)
+            self._chord_detector = det
+        worker.chord_detector = det
+
+    def _show_mic_chord(self, detections):
+        if not detections or self.guitar_window is None or not self.guitar_window.isVisible():
+            return
+        for midis in detections:
+            if not midis:
+                continue  # silence keeps the last chord on screen
+            stable = sorted(set(midis) & set(self._mic_chord_prev))
+            self._mic_chord_prev = midis
+            if stable and stable != list(self.guitar_window.grid.selected_midis):
+                self.guitar_window.set_selected_midis(stable)
+                grid = self.guitar_window.grid
+                self.guitar_window.set_fingering(
+                    solve_fingering([(0.0, m) for m in stable], grid.table))
+
+    def _show_mic_pitch(self, f0, conf: float):
+        if f0 is None:
+            self.mic_pitch_label.setText("Pitch: —")
+            return
+        note, target, _ = freq_to_nearest_note(f0)
+        cents = 1200.0 * np.log2(f0 / target)
+        self.mic_pitch_label.setText(f"Pitch: {note}  {f0:.1f} Hz  {cents:+.0f}¢  ({conf * 100:.0f}%)")
+
+    # -------- recording --------
+    def on_toggle_record(self, checked: bool):
+        if checked:
+            self.start_recording()
+        else:
+            self.stop_recording()
+
+    def _uncheck_record(self):
+        self.actions["record"].blockSignals(True)
+        self.actions["record"].setChecked(False)
+        self.actions["record"].blockSignals(False)
+
+    def start_recording(self):
+        if self._recorder is not None:
+            return
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Record take", "take.wav", "WAV (*.wav);;FLAC (*.flac)"
+        )
+        if not path:
+            self._uncheck_record()
+            return
+        if os.path.splitext(path)[1].lower() not in (".wav", ".flac"):
+            path += ".wav"
+
+        # the mic first: without an input device no take file is created, the track stays
+        started_mic = not self.mic_enabled
+        if started_mic:
+            self.start_mic()
         if not self.mic_enabled:
+            self._uncheck_record()
             return
-        latest = None
-        while True:
-            try:
-                latest = self._mic_q.get_nowait()
-            except queue.Empty:
-                break
-        if latest is None:
+
+        self.player.stop()
+        try:
+            rec = AudioRecorder(path, self.mic_sr, self.nperseg, self.noverlap_ratio)
+        except Exception as e:
+            if started_mic:
+                self.stop_mic()
+            self._uncheck_record()
+            QtWidgets.QMessageBox.critical(self, "Record error", str(e))
             return
 
-        freqs, amps = extract_mic_peaks(latest, fs=44100, fmin=self.mic_fmin, fmax=self.mic_fmax, max_lines=self.mic_max_lines)
-        self._draw_mic_lines(freqs, amps)
+        # the take becomes the current track, its spectrogram grows while recording
+        self.audio = AudioData(y=np.zeros(0, dtype=np.float32), sr=self.mic_sr, duration=0.0)
+        self.audio_path = None
+        self.f, self.t, self.S_db = None, None, None
+        self._forget_analyses()
+        self.waveform = None
+        self._refresh_overview()
+        self._sync_channel_combo()
+        self.cross_audio = None
+        self._cancel_cross_render()
+        self.actions["hear_cross"].setChecked(False)
+        self._rec_columns = 0
+        self._recorder = rec
+        self._spectrogram_changed()
+        self.statusBar().showMessage(f"Recording → {os.path.basename(path)}")
+
+    def _update_recording_view(self):
+        rec = self._recorder
+        if rec is None:
+            return
+        f, t, S_db = rec.spectro.view()
+        if len(t) < 2 or len(t) == self._rec_columns:
+            return
+        first = self._rec_columns == 0
+        self._rec_columns = len(t)
+
+        self.f, self.t, self.S_db = f, t, S_db
+        self.db_vmax = rec.spectro.vmax
+        self.db_vmin = self.db_vmax - 90.0
+        self.audio.duration = rec.duration
+        self.update_hard_limits()
+
+        # follow the end of the take
+        dur = self.audio.duration
+        x0 = max(0.0, dur - RECORD_FOLLOW_SECONDS)
+        self._suspend_render = True
+        try:
+            if first:
+                self.vb.setRange(xRange=(x0, dur), yRange=(self.hard_fmin, self.hard_fmax), padding=0.0, update=True)
+            else:
+                self.vb.setRange(xRange=(x0, dur), padding=0.0, update=True)
+            self.vb.clamp_view()
+        finally:
+            self._suspend_render = False
+        self.render_tile_from_viewbox()
+
+    def stop_recording(self):
+        rec = self._recorder
+        if rec is None:
+            return
+        self._recorder = None
+
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.CursorShape.WaitCursor)
+        try:
+            f, t, S_db, vmin, vmax = rec.stop()
+            # the samples come back from the file; the spectrogram is already complete
+            audio = load_audio_file(rec.path)
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Record error", str(e))
+            return
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+
+        self.audio = audio
+        self.audio_path = rec.path
+        self._beat_cache.clear()
+        self._cancel_beats()
+        self._hpss_cache.clear()
+        self._cancel_hpss()
+        self._forget_analyses()
+        self.player.set_audio(audio.y, audio.sr, audio.duration)
+        if len(t) < 2:
+            self.S_db = None
+            self.statusBar().showMessage("Take too short to analyse")
+            return
+        self.f, self.t, self.S_db, self.db_vmin, self.db_vmax = f, t, S_db, vmin, vmax
+        self._sync_channel_combo()
+        # the take's own analysis: panes and quality switches find it like a computed one
+        self._analyses[self._analysis_key()] = (f, t, S_db, vmin, vmax)
+        self._spectrogram_changed()
+        self._reset_track_view()
+        dur = audio.duration
+
+        msg = f"Recorded: {os.path.basename(rec.path)} — {dur:.2f}s"
+        if rec.dropped:
+            msg += f" ({rec.dropped} blocks dropped)"
+        self.statusBar().showMessage(msg)
 
     # -------- ui tick --------
     def on_ui_tick(self):
+        self._poll_beats()
+        self._poll_hpss()
+        self._poll_cross_audio()
         if not self.audio:
             return
         self.play_line.blockSignals(True)
         self.play_line.setValue(self.player.playhead)
         self.play_line.blockSignals(False)
+        for pane in self.panes:
+            pane.play_line.setValue(self.player.playhead)
+        self.overview_play.setValue(self.player.playhead)
+        self._update_spectrum()
 
     def closeEvent(self, event):
         try:
             self.stop_mic()
         except Exception:
             pass
+        self._cancel_transcription()
+        self._beat_pool.shutdown(wait=False, cancel_futures=True)
+        self._cross_pool.shutdown(wait=False, cancel_futures=True)
+        self._cancel_hpss()
         try:
             self.player.stop()
         except Exception:
             pass
+        if self.guitar_window is not None:
+            self.guitar_window.mixer.stop()
+            self.guitar_window.voice_cache.shutdown()
         event.accept()
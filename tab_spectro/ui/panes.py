@@ -0,0 +1,108 @@
+import numpy as np
+import pyqtgraph as pg
+from PySide6 import QtCore, QtWidgets
+
+from tab_spectro.graphics.viewbox import SpectroViewBox
+from tab_spectro.utils.settings import QUALITIES
+
+# Extra spectrogram panes under the main one: same track and channel, their own quality and
+# frequency axis, time axis linked to the main view. The main window renders them (from the
+# shared analysis and tile caches), the pane only holds the widgets and its settings.
+
+class FreqAxis(pg.AxisItem):
+    # in log mode y is log2(Hz): octave ticks, labelled in Hz
+    log = False
+
+    def tickStrings(self, values, scale, spacing):
+        if not self.log:
+            return super().tickStrings(values, scale, spacing)
+        return [f"{2.0 ** v:.0f}" for v in values]
+
+class SpectroPane(QtWidgets.QWidget):
+    settingsChanged = QtCore.Signal(object)
+    closeRequested = QtCore.Signal(object)
+
+    def __init__(self, lut, quality_name: str, parent=None):
+        super().__init__(parent)
+        lay = QtWidgets.QVBoxLayout(self)
+        lay.setContentsMargins(0, 0, 0, 0)
+        lay.setSpacing(2)
+
+        bar = QtWidgets.QHBoxLayout()
+        self.combo_quality = QtWidgets.QComboBox()
+        self.combo_quality.addItems([q.name for q in QUALITIES])
+        self.combo_quality.setCurrentText(quality_name)
+        self.combo_axis = QtWidgets.QComboBox()
+        self.combo_axis.addItems(["Linear", "Log"])
+        btn_close = QtWidgets.QToolButton()
+        btn_close.setText("✕")
+        btn_close.setAutoRaise(True)
+        bar.addWidget(QtWidgets.QLabel("Quality"))
+        bar.addWidget(self.combo_quality)
+        bar.addWidget(QtWidgets.QLabel("Frequency axis"))
+        bar.addWidget(self.combo_axis)
+        bar.addStretch(1)
+        bar.addWidget(btn_close)
+        lay.addLayout(bar)
+
+        self.vb = SpectroViewBox()
+        self.axis = FreqAxis("left")
+        self.plot = pg.PlotWidget(viewBox=self.vb, axisItems={"left": self.axis})
+        self.plot.setMenuEnabled(False)
+        self.plot.hideButtons()
+        self.plot.showGrid(x=True, y=True, alpha=0.2)
+        self.axis.setWidth(72)
+        self.plot.setLabel("left", "Frequency (Hz)")
+        lay.addWidget(self.plot, 1)
+
+        self.img = pg.ImageItem()
+        self.img.setLookupTable(lut)
+        self.plot.addItem(self.img)
+        self.play_line = pg.InfiniteLine(pos=0, angle=90, movable=False, pen=pg.mkPen(width=2))
+        self.play_line.setZValue(30)
+        self.plot.addItem(self.play_line)
+
+        self._limits = None  # (fmin, fmax) in Hz
+        self.combo_quality.currentTextChanged.connect(lambda _: self.settingsChanged.emit(self))
+        self.combo_axis.currentTextChanged.connect(self._on_axis_changed)
+        btn_close.clicked.connect(lambda: self.closeRequested.emit(self))
+
+    @property
+    def quality(self):
+        name = self.combo_quality.currentText()
+        return next(q for q in QUALITIES if q.name == name)
+
+    @property
+    def log_freq(self) -> bool:
+        return self.combo_axis.currentText() == "Log"
+
+    def _on_axis_changed(self, _):
+        # the y range and limits are kept in Hz across the switch
+        f0, f1 = self.freq_range()
+        lim = self._limits
+        self.axis.log = self.log_freq
+        self.axis.enableAutoSIPrefix(not self.log_freq)
+        if lim is not None:
+            self.set_freq_limits(*lim)
+        self.set_freq_range(f0, f1)
+        self.settingsChanged.emit(self)
+
+    def _to_y(self, f0: float, f1: float):
+        if self.log_freq:
+            return float(np.log2(max(f0, 1.0))), float(np.log2(max(f1, 2.0)))
+        return f0, f1
+
+    def freq_range(self):
+        # axis.log: the mode the view range is in (still the old one while switching)
+        (y0, y1) = self.vb.viewRange()[1]
+        if self.axis.log:
+            return 2.0 ** y0, 2.0 ** y1
+        return y0, y1
+
+    def set_freq_range(self, f0: float, f1: float):
+        self.vb.setRange(yRange=self._to_y(f0, f1), padding=0.0)
+
+    def set_freq_limits(self, fmin: float, fmax: float):
+        self._limits = (fmin, fmax)
+        y0, y1 = self._to_y(fmin, fmax)
+        self.vb.setLimits(yMin=y0, yMax=y1)
@@ -0,0 +1,88 @@
+import json
+import os
+import struct
+import zipfile
+
+import numpy as np
+
+# Session file: an uncompressed npz (zip of .npy members) with a JSON "meta" member for the
+# scalar state. Members are stored, not deflated, so on load every array is a np.memmap
+# straight into the file: opening a session reads headers only, pages come in when used.
+# The spectrogram is kept as uint16 dB steps (half the size of float32, ~0.002 dB resolution).
+
+PROJECT_VERSION = 1
+PROJECT_EXT = ".tabproj"
+
+def quantise_db(S_db: np.ndarray):
+    lo = float(S_db.min())
+    hi = float(S_db.max())
+    scale = max(hi - lo, 1e-6) / 65535.0
+    q = np.empty(S_db.shape, dtype=np.uint16)
+    np.rint((S_db - lo) / scale, out=q, casting="unsafe")
+    return q, lo, scale
+
+def dequantise_db(q: np.ndarray, lo: float, scale: float) -> np.ndarray:
+    S_db = np.empty(q.shape, dtype=np.float32)
+    np.multiply(q, np.float32(scale), out=S_db)
+    S_db += np.float32(lo)
+    return S_db
+
+def save_project(path: str, meta: dict, arrays: dict):
+    # written next to the target then renamed, so a failed save keeps the old session
+    members = {k: np.ascontiguousarray(v) for k, v in arrays.items() if v is not None}
+    members["meta"] = np.frombuffer(json.dumps(dict(meta, version=PROJECT_VERSION)).encode("utf-8"), dtype=np.uint8)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as fh:
+        np.savez(fh, **members)
+    os.replace(tmp, path)
+
+def _mapped_members(path: str) -> dict:
+    out = {}
+    with zipfile.ZipFile(path) as z, open(path, "rb") as fh:
+        for info in z.infolist():
+            if not info.filename.endswith(".npy"):
+                continue
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{info.filename}: compressed member, not a project file")
+            # local file header: 30 bytes, then name and extra field
+            fh.seek(info.header_offset + 26)
+            n_name, n_extra = struct.unpack("<HH", fh.read(4))
+            fh.seek(info.header_offset + 30 + n_name + n_extra)
+            major, _ = np.lib.format.read_magic(fh)
+            read_header = np.lib.format.read_array_header_1_0 if major == 1 else np.lib.format.read_array_header_2_0
+            shape, fortran, dtype = read_header(fh)
+            name = info.filename[:-4]
+            if int(np.prod(shape)) == 0:
+                out[name] = np.zeros(shape, dtype=dtype)
+            else:
+                out[name] = np.memmap(path, dtype=dtype, mode="r", offset=fh.tell(), shape=shape,
+                                      order="F" if fortran else "C")
+    return out
+
+def load_project(path: str):
+    # -> (meta dict, {name: read-only array})
+    arrays = _mapped_members(path)
+    if "meta" not in arrays:
+        raise ValueError("not a project file (no meta)")
+    meta = json.loads(bytes(arrays.pop("meta")).decode("utf-8"))
+    if int(meta.get("version", 0)) > PROJECT_VERSION:
+        raise ValueError(f"project version {meta['version']} is newer than this program")
+    return meta, arrays
+
+def audio_reference(project_path: str, audio_path: str) -> dict:
+    # relative path first (project and audio moved together), absolute as fallback
+    audio_path = os.path.abspath(audio_path)
+    try:
+        rel = os.path.relpath(audio_path, os.path.dirname(os.path.abspath(project_path)))
+    except ValueError:  # other drive
+        rel = None
+    return {"audio": audio_path, "audio_rel": rel}
+
+def resolve_audio(project_path: str, meta: dict):
+    base = os.path.dirname(os.path.abspath(project_path))
+    for p in (meta.get("audio_rel"), meta.get("audio")):
+        if p:
+            p = p if os.path.isabs(p) else os.path.join(base, p)
+            if os.path.exists(p):
+                return p
+    return None
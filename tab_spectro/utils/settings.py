@@ -13,11 +13,39 @@ QUALITIES = [
     SpectroQuality("Ultra", 32768, 0.90),
 ]
 
+@dataclass
+class GuitarTuning:
+    name: str
+    midis: tuple  # open strings, top (highest) -> bottom
+
+TUNINGS = [
+    GuitarTuning("Standard", (64, 59, 55, 50, 45, 40)),
+    GuitarTuning("Drop D", (64, 59, 55, 50, 45, 38)),
+    GuitarTuning("DADGAD", (62, 57, 55, 50, 45, 38)),
+    GuitarTuning("Open G", (62, 59, 55, 50, 43, 38)),
+    GuitarTuning("7-string", (64, 59, 55, 50, 45, 40, 35)),
+    GuitarTuning("Bass", (43, 38, 33, 28)),
+    GuitarTuning("Bass 5", (43, 38, 33, 28, 23)),
+]
+
+MAX_CAPO = 9
+
 DEFAULT_HARD_FMIN = 70.0
 DEFAULT_HARD_FMAX = 600.0
 
 DEFAULT_GAMMA = 1.6
 
+MIC_SAMPLERATE = 44100
+MIC_WINDOW = 4096
+MIC_HOP = 1024
+MIC_DB_MIN = -90.0
+MIC_DB_MAX = -10.0
+MIC_WATERFALL_SECONDS = 8.0
+MIC_PITCH_WINDOW = 2048
+MIC_PITCH_HOP = 512
+MIC_PITCH_FMAX = 1400.0
+MIC_PITCH_THRESHOLD = 0.15
+RECORD_FOLLOW_SECONDS = 10.0
 MIC_FMIN = 70.0
 MIC_FMAX = 2500.0
 MIC_MAX_LINES = 24
@@ -26,3 +54,14 @@ MIC_BASE_GREEN = 90
 MIC_MAX_GREEN = 210
 MIC_ALPHA_MIN = 110
 MIC_ALPHA_MAX = 230
+
+BEATS_PER_BAR = 4
+PEAK_INDEX_FMAX = 5000.0
+PEAK_FLOOR_DB = 50.0
+HPSS_FMAX = 5000.0  # harmonic/percussive separation up to here, raw spectrogram above
+
+SPECTRUM_LABELS = 6  # strongest peaks named in the playhead spectrum
+MAX_PANES = 3  # extra spectrogram panes under the main view
+NOTE_EVENT_MIN_LEN = 0.02  # s, shortest note event when dragging its ends
+
+PROJECT_SAVE_ANALYSIS = True  # spectrogram + analyses in the project file (bigger, instant reopen)
@@ -0,0 +1,55 @@
+import itertools
+
+import pytest
+
+from tab_spectro.guitar.fingering import solve_fingering
+from tab_spectro.guitar.fretboard import fretboard_table
+
+STANDARD = fretboard_table((40, 45, 50, 55, 59, 64), 0, 15)
+
+def _shapes(table, midis, max_span=4):
+    # every (string, fret) combination of the chord on distinct strings within the stretch
+    for combo in itertools.product(*[list(zip(*table.positions[m])) for m in midis]):
+        strings = [s for s, _ in combo]
+        fretted = [f for _, f in combo if f > 0]
+        if len(set(strings)) == len(strings) and (not fretted or max(fretted) - min(fretted) <= max_span):
+            yield combo
+
+def _check_chord(table, midis, out):
+    assert all(int(table.midi[s, f]) == m for (s, f), m in zip(out, midis))
+    assert len({s for s, _ in out}) == len(out)
+    fretted = [f for _, f in out if f > 0]
+    assert not fretted or max(fretted) - min(fretted) <= 4
+
+def test_triad_on_distinct_strings():
+    out = solve_fingering([(0.0, 46), (0.0, 50), (0.0, 53)], STANDARD)
+    _check_chord(STANDARD, [46, 50, 53], out)
+
+@pytest.mark.parametrize("root", range(40, 70))
+@pytest.mark.parametrize("third", [3, 4])
+def test_playable_triads(root, third):
+    midis = [root, root + third, root + 7]
+    if next(_shapes(STANDARD, midis), None) is None:
+        pytest.skip("no shape on distinct strings within the stretch")
+    # also strummed: a few ms between the strings
+    for dt in (0.0, 0.008):
+        out = solve_fingering([(k * dt, m) for k, m in enumerate(midis)], STANDARD)
+        _check_chord(STANDARD, midis, out)
+
+def test_chord_in_sequence():
+    # single notes around a chord keep it on distinct strings
+    events = [(0.0, 45), (0.5, 57), (1.0, 48), (1.0, 52), (1.0, 55), (1.0, 60), (1.5, 64)]
+    out = solve_fingering(events, STANDARD)
+    _check_chord(STANDARD, [48, 52, 55, 60], out[2:6])
+    assert all(int(STANDARD.midi[s, f]) == m for (s, f), (_, m) in zip(out, events))
+
+def test_too_many_notes_split():
+    # seven notes on six strings: the extra one is played as the next chord, nothing dropped
+    midis = [40, 45, 50, 55, 59, 64, 69]
+    out = solve_fingering([(0.0, m) for m in midis], STANDARD)
+    assert None not in out
+    assert all(int(STANDARD.midi[s, f]) == m for (s, f), m in zip(out, midis))
+
+def test_unplayable_note():
+    out = solve_fingering([(0.0, 20), (0.5, 45)], STANDARD)
+    assert out[0] is None and out[1] is not None
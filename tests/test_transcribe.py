@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from tab_spectro.audio.synth import synth_chord
+from tab_spectro.audio.transcribe import transcribe
+
+SR = 22050
+
+def _notes(midis, dur=2.0, min_len=0.5):
+    # notes transcribed from a synth_chord strum, with their total duration
+    np.random.seed(0)
+    x, sr = synth_chord(midis, sr=SR, dur=dur)
+    total = {}
+    for e in transcribe(x, sr):
+        total[e.midi] = total.get(e.midi, 0.0) + e.offset - e.onset
+    return {m for m, d in total.items() if d >= min_len}, total
+
+@pytest.mark.parametrize("midis", [[40], [45], [52], [57]])
+def test_single_note_has_no_harmonic_ghosts(midis):
+    found, total = _notes(midis)
+    assert found == set(midis)
+    # not even briefly: the 3rd..5th harmonics are not notes
+    assert set(total) == set(midis)
+
+@pytest.mark.parametrize("midis", [[45, 52], [40, 47], [50, 57]])
+def test_power_chord_keeps_the_fifth(midis):
+    found, _ = _notes(midis)
+    assert found == set(midis)
+
+@pytest.mark.parametrize("midis", [[48, 52, 55], [45, 48, 52]])
+def test_triad(midis):
+    found, _ = _notes(midis)
+    assert found == set(midis)
+
+def test_sines_a_fifth_apart():
+    t = np.arange(2 * SR) / SR
+    y = (0.5 * np.sin(2 * np.pi * 220.0 * t) + 0.5 * np.sin(2 * np.pi * 329.63 * t)).astype(np.float32)
+    assert {e.midi for e in transcribe(y, SR)} == {57, 64}
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from tab_spectro.audio.synth import _pluck
+from tab_spectro.audio.voice_mixer import BufferVoice, KarplusStrongVoice
+from tab_spectro.guitar.theory import midi_to_freq
+
+# A note played through the mixer must sound like the same note from synth_chord or the
+# voice cache (_pluck): same string, same level.
+
+SR = 22050
+
+def _stream(voice, n, block=256):
+    out = np.zeros(n)
+    for i0 in range(0, n, block):
+        voice.render(out[i0:i0 + block])
+    return out
+
+@pytest.mark.parametrize("midi", [40, 45, 57, 64, 76, 88])
+def test_streamed_voice_matches_pluck(midi):
+    dur = 1.0
+    np.random.seed(7)
+    ref = _pluck(midi_to_freq(midi), SR, dur)
+    np.random.seed(7)
+    voice = KarplusStrongVoice(midi, SR, dur)
+    raw = np.concatenate([voice._source(256) for _ in range(-(-len(ref) // 256))])[:len(ref)]
+    assert float(np.max(np.abs(raw - ref))) < 1e-5
+
+@pytest.mark.parametrize("midi", [40, 57, 76])
+def test_same_level_as_cached_voice(midi):
+    dur = 1.0
+    np.random.seed(3)
+    cached = BufferVoice(_pluck(midi_to_freq(midi), SR, 1.2), SR, dur, gain=0.24)
+    np.random.seed(3)
+    live = KarplusStrongVoice(midi, SR, dur, gain=0.24)
+    n = int(SR * dur)
+    a, b = _stream(cached, n), _stream(live, n)
+    assert float(np.max(np.abs(a - b))) < 1e-5